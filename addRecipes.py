@@ -1,434 +1,26 @@
-import json
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
-import shutil   # Add this import at the top of your script
-
-# --------------------- helpers ---------------------
-def to_int(val, default=0):
-	try:
-		return int(str(val).strip())
-	except Exception:
-		return default
-
-# Accepts comma decimals and fractions like 1/2, 2 1/2, and unicode ½, ¼, ¾, etc.
-def parse_amount(val):
-	s = str(val).strip()
-	if not s:
-		return ""
-
-	FRACTIONS = {
-		"½": 0.5,
-		"¼": 0.25,
-		"¾": 0.75,
-		"⅓": 1/3,
-		"⅔": 2/3,
-		"⅕": 0.2,
-		"⅖": 0.4,
-		"⅗": 0.6,
-		"⅘": 0.8,
-		"⅙": 1/6,
-		"⅚": 5/6,
-		"⅛": 0.125,
-		"⅜": 0.375,
-		"⅝": 0.625,
-		"⅞": 0.875,
-	}
-	if s in FRACTIONS:
-		return FRACTIONS[s]
-
-	# Mixed number like "2 1/2"
-	if " " in s and "/" in s:
-		parts = s.split()
-		if len(parts) == 2 and "/" in parts[1]:
-			whole, frac = parts
-			try:
-				w = int(whole)
-				n, d = frac.split("/", 1)
-				n = int(n.strip())
-				d = int(d.strip()) or 1
-				return w + (n / d)
-			except Exception:
-				pass
-
-	# Simple fraction like "1/2"
-	if "/" in s and " " not in s:
-		try:
-			n, d = s.split("/", 1)
-			n = int(n.strip())
-			d = int(d.strip()) or 1
-			return n / d
-		except Exception:
-			pass
-
-	# Decimal with comma or point
-	s2 = s.replace(",", ".")
-	try:
-		f = float(s2)
-		return int(f) if f.is_integer() else f
-	except Exception:
-		return s  # keep original text if not parseable
-
-
-def clamp(n, lo=0, hi=5):
-	try:
-		n = int(n)
-	except Exception:
-		return lo
-	return max(lo, min(hi, n))
-
-# Convert difficulty to English label for HTML
-ENGLISH_DIFF = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
-
-
-# Defining the categories' badge colors
-CATEGORIE_BADGE = {
-    "pork": "bg-meat",
-    "chicken": "bg-meat", 
-    "beef": "bg-meat",
-    "fish": "bg-primary",
-    "seafood": "bg-primary",
-
-    "vegan": "bg-vegetarian",
-    "vegetarian": "bg-vegetarian",
-    "vegetables": "bg-success",
-    "salad": "bg-success",
-
-    "noodles": "bg-grain",
-	"pasta": "bg-grain",
-    "rice": "bg-grain",
-    "potato": "bg-grain",
-    "breads": "bg-bakedDishes",
-    "sandwiches": "bg-bakedDishes",
-	"bakedDishes": "bg-bakedDishes",
-    "egg": "bg-egg",
-
-    "streetfood": "bg-streetfood",
-    "basics": "bg-secondary",
-	"component": "bg-secondary",
-    "drinks": "bg-secondary",
-    "appetizer": "bg-appetizer",
-    "fingerfood": "bg-fingerfood",
-
-    "cake": "bg-dessert",
-    "pastry": "bg-dessert",
-	"biscuit": "bg-dessert",
-    "otherDesserts": "bg-dessert", 
-    "dessert": "bg-dessert",
-    "snacks": "bg-snacks",
-
-    "sauce": "bg-sauce",
-    "dressing": "bg-sauce",
-    "stew": "bg-stew",
-    "curry": "bg-curry",
-    "soup": "bg-soup",
-
-    # Countries
-    "America": "bg-country",
-	"Austria": "bg-country",
-	"Bosnia": "bg-country",
-    "Great Britain": "bg-country", 
-    "China": "bg-country",
-    "Mongolia": "bg-country",
-	"Portugal": "bg-country",
-    "Germany": "bg-country",
-    "France": "bg-country", 
-    "Greece": "bg-country",
-    "India": "bg-country",
-    "Italy": "bg-country",
-    "Japan": "bg-country",
-	"Hungary": "bg-country",
-	"Lebanon": "bg-country",
-    "Korea": "bg-country",
-    "Mexico": "bg-country", 
-    "Spain": "bg-country",
-    "Thailand": "bg-country",
-    "Turkey": "bg-country",
-    "Vietnam": "bg-country"
-}
-
-
-def get_category_badge(category: str) -> str:
-	"""Returns badge-color based on the category-string"""
-	return CATEGORIE_BADGE.get(category, "bg-secondary")
-
-# Star string for HTML (default 5 stars if value missing)
-def stars(n):
-	n = clamp(n if n is not None else 5, 0, 5)
-	return ("★ " * n + "☆ " * (5 - n)).strip()
-
-# Minute text helpers
-def minutes_text_full(n):
-	n = to_int(n, 0)
-	return f"{n} minutes" if n != 1 else "1 minute"
-
-def minutes_text_short(n):
-	n = to_int(n, 0)
-	return f"{n} min." if n != 1 else "1 min."
-
-
-# Allowed recipe folders (selectable)
-RECIPE_FOLDERS = [
-	"appetizers",
-	"beef",
-	"breadAndBakedDishes",
-	"cakesAndPastries",
-	"chicken",
-	"dressings-dips-sauces",
-	"drinks",
-	"egg",
-	"fish",
-	"component",
-	"noodle",
-	"otherDesserts",
-	"pork",
-	"potatoe",
-	"rice",
-	"sandwiches",
-	"snacks",
-	"soups",
-	"streetfood",
-	"vegetables",
-]
-
-# --------------------- HTML generation ---------------------
-
-def generate_html(data: dict, instructions: list[str]) -> str:
-	title = data.get("title", "Recipe")
-	categories = data.get("categories", [])
-	active = to_int(data.get("activeTime", 0))
-	passive = to_int(data.get("passiveTime", 0))
-	total = to_int(data.get("totalTime", active + passive))
-	difficulty = ENGLISH_DIFF.get(str(data.get("difficulty", "easy")).lower(), "Easy")
-	originality = clamp(data.get("originality", 5), 0, 5)
-	taste = clamp(data.get("taste", 5), 0, 5)
-	image = data.get("image", "") or "../../img/img_food/placeholder.jpg"
-	source_raw = str(data.get("source", "")).strip()
-	source_text = tk_html_escape(source_raw) if source_raw else "–"
-	source_href = "#"
-	if source_raw.lower().startswith(("http://", "https://")):
-		source_href = tk_attr_escape(source_raw)
-
-	cat_badges = "".join(
-		[
-			f'<a href="../../recipeFilter.html#{tk_html_escape(c)}" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover"><span class="badge text-{get_category_badge(c)}">{tk_html_escape(c)}</span></a>'
-			for c in categories
-		]
-	)
-
-	ingredients_li = []
-	for ing in data.get("ingredients", []):
-		name = tk_html_escape(ing.get("name", "")).strip()
-		link = str(ing.get("link", "")).strip()
-		has_amount = ("amount" in ing) and str(ing.get("amount", "")).strip() != ""
-		unit = tk_html_escape(ing.get("unit", "")) if has_amount else ""
-
-		if link:
-			name_html = f'<a href="{tk_attr_escape(link)}" class="ingredient flex-fill">{name}</a>'
-		else:
-			name_html = f'<span class="ingredient flex-fill">{name}</span>'
-
-		if not has_amount:
-			li = (
-				'''<li class="list-group-item d-flex align-items-center gap-2">'''
-				f'''   {name_html}'''
-				'''</li>
-				'''
-			)
-		else:
-			amount_val = ing.get("amount", "")
-			amount_attr = f'data-basis="{tk_attr_escape(amount_val)}"' if amount_val != "" else ''
-			unit_attr = f'data-basis="{tk_attr_escape(unit)}"' if unit != "" else ''
-			amount_disp = f"{amount_val}" if amount_val != "" else ""
-			unit_span = f'<span class="unit" {unit_attr}>{unit}</span>' if unit != "" else ""
-			li = (
-				'''<li class="list-group-item d-flex align-items-center gap-2">'''
-				f'''   <span class="amount" {amount_attr}>{tk_html_escape(amount_disp)}</span>'''
-				f'''{unit_span}'''
-				f'''   {name_html}'''
-				'''</li>
-				'''
-			)
-		ingredients_li.append(li)
-
-	ingredients_html = "".join(ingredients_li)
-
-	instr_li = []
-	for step in instructions:
-		step = tk_html_escape(step)
-		if step:
-			instr_li.append(
-				f'''<li class="list-group-item">{step}</li>
-							'''
-			)
-	instructions_html = "".join(instr_li)
-
-	html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<title>RecsWeb - {tk_html_escape(title)}</title>
-<link rel="icon" type="image/x-icon" href="https://ik.imagekit.io/o9fejv2tr/RecsWeb%20Icons/logo.png?updatedAt=1756760270932"> 
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width, initial-scale=1">
-<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
-<link rel="stylesheet" href="../../styles.css">
-<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css">
-<link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/lipis/flag-icons@7.3.2/css/flag-icons.min.css"/>
-<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;800&display=swap" rel="stylesheet">
-</head>
-<body class="d-flex flex-column min-vh-100">
-
-<div id="site-navbar"></div>
-
-<main class="flex-grow-1">
-<section class="overview-section py-4">
-<div class="container">
-	<h1 class="mb-3">{tk_html_escape(title)}</h1>
-
-	<div class="row g-4 align-items-center">
-	<div class="col-12 col-md-auto">
-		<img src="{tk_attr_escape(image)}"
-			class="img-thumbnail overview-img"
-			alt="image not found">
-	</div>
-
-	<div class="col">
-		<div class="d-flex flex-wrap gap-2 mb-3">
-		{cat_badges}
-		</div>
-
-		<div class="row row-cols-2 row-cols-sm-3 row-cols-md-4 g-3 mb-3">
-		<div class="col">
-			<div class="p-3 border rounded-3 bg-body">
-			<div class="small text-uppercase text-muted fw-semibold">Total Time</div>
-			<div class="fs-5">
-				<span class="text-warning">{minutes_text_full(total)}</span>
-			</div>
-			</div>
-		</div>
-		<div class="col">
-			<div class="p-3 border rounded-3 bg-body">
-			<div class="small text-uppercase text-muted fw-semibold">Difficulty</div>
-			<div class="fs-5">
-				<span class="text-warning">{difficulty}</span>
-			</div>
-			</div>
-		</div>
-		<div class="col">
-			<div class="p-3 border rounded-3 bg-body">
-			<div class="small text-uppercase text-muted fw-semibold">Originality</div>
-			<div class="fs-5">
-				<span class="text-warning">{stars(originality)}</span>
-			</div>
-			</div>
-		</div>
-		<div class="col">
-			<div class="p-3 border rounded-3 bg-body">
-			<div class="small text-uppercase text-muted fw-semibold">Taste</div>
-			<div class="fs-5">
-				<span class="text-warning">{stars(taste)}</span>
-			</div>
-			</div>
-		</div>
-		</div>
-
-		<div class="small text">
-		Source: <a href="{source_href}" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover">{source_text}</a>
-		</div>
-	</div>
-	</div>
-</div>
-</section>
-
-<section class="ingredients-section">
-<div class="overview-div">
-	<div class="container my-4">
-	<div class="border rounded-3 p-3 shadow-sm bg-white">
-		<div class="row row-cols-1 row-cols-md-3 text-center time-grid">
-
-		<div class="col my-3 time-item">
-			<div class="small text-uppercase text-muted mb-1">Active Time</div>
-			<div class="d-flex justify-content-center align-items-center gap-2">
-			<i class="fa-regular fa-clock"></i><span>{minutes_text_short(active)}</span>
-			</div>
-		</div>
-
-		<div class="col my-3 time-item">
-			<div class="small text-uppercase text-muted mb-1">Passive Time</div>
-			<div class="d-flex justify-content-center align-items-center gap-2">
-			<i class="fa-regular fa-clock"></i><span>{minutes_text_short(passive)}</span>
-			</div>
-		</div>
-
-		<div class="col my-3 time-item">
-			<div class="small text-uppercase text-muted mb-1">Total Time</div>
-			<div class="d-flex justify-content-center align-items-center gap-2">
-			<i class="fa-regular fa-clock"></i><span>{minutes_text_short(total)}</span>
-			</div>
-		</div>
-
-		</div>
-	</div>
-	</div>
-</div>
-
-<div class="ingredient-div">
-	<div class="container my-4">
-		<div class="row">
-			<div class="col-md-5">
-				<div class="border rounded-3 p-3 shadow-sm bg-white">
-					<h2 class="h4 mb-3 fw-bold">Ingredients</h2>
-					<ul class="list-group list-group-flush" id="ingredients">
-						{ingredients_html}
-					</ul>
-				</div>
-			</div>
-
-			<div class="col-md-7">
-				<div class="border rounded-3 p-3 shadow-sm bg-light h-100">
-					<h2 class="h4 mb-3 fw-bold">Instructions</h2>
-					<ol class="list-group list-group-numbered">
-						{instructions_html}
-					</ol>
-				</div>
-			</div>
-		</div>
-	</div>
-</div>
-</section>
-</main>
-
-<div id="site-footer"></div>
-<script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
-<script src="../../assets/constants.js"></script>
-<script src="../../assets/scripts.js"></script>
-</body>
-
-</html>"""
-	return html
-
-
-def tk_html_escape(text: str) -> str:
-	return (
-		str(text)
-		.replace("&", "&amp;")
-		.replace("<", "&lt;")
-		.replace(">", "&gt;")
-		.replace('"', "&quot;")
-		.replace("'", "&#39;")
-	)
-
-
-def tk_attr_escape(text: str) -> str:
-	# more strict for attribute values
-	return tk_html_escape(text)
 
+from atomicFile import write_json_atomic, write_text_atomic
+from recipeBackup import backup_recipes
+from recipeCore import RECIPE_FOLDERS, clamp, parse_amount, to_int
+from recipeIngredients import load_ingredient_labels
+from recipePublish import compress_file, publish_instructions
+from recipeStore import open_store
+from recipeTemplate import render_page
+from toolWindow import close_own_store, run_standalone, suggestion_box
 
 # --------------------- UI ---------------------
 
-class RecipeApp(tk.Tk):
-	def __init__(self):
-		super().__init__()
+class RecipeApp(tk.Toplevel):
+	def __init__(self, master, store=None):
+		super().__init__(master)
+		# the launcher's already loaded store, if opened from main.py
+		self.store = store
+		close_own_store(self, store)
+		# ingredient names for the autocompletion of the name fields
+		self.ingredient_labels = load_ingredient_labels(Path("recipes.json"), self.store)
 		self.title("Recipe JSON + HTML Generator")
 		self.geometry("1024x780")
 
@@ -632,7 +224,7 @@ class RecipeApp(tk.Tk):
 		unit_e.insert(0, "")
 		unit_e.pack(side=tk.LEFT, padx=(0, 6))
 		
-		name_e = ttk.Entry(row, width=26)
+		name_e = suggestion_box(row, self.ingredient_labels, 26)
 		name_e.insert(0, "")
 		name_e.pack(side=tk.LEFT, padx=(0, 6))
 
@@ -768,44 +360,20 @@ class RecipeApp(tk.Tk):
 		# Save single-entry JSON for convenience (same as before)
 		json_out = [entry]
 		single_json_path = Path("generated_recipe.json")
-		with single_json_path.open("w", encoding="utf-8") as f:
-			json.dump(json_out, f, ensure_ascii=False, indent=2)
+		write_json_atomic(single_json_path, json_out, indent=2)
 
-		# Merge with existing recipes.json and overwrite it
+		# Append to the recipes.json journal (compacted into recipes.json periodically)
 		base_json_path = Path("recipes.json")
-		merged = []
-		if base_json_path.exists():
-			# Create a backup before modifying
-			backup_path = base_json_path.with_suffix(".json.bak")
-			shutil.copy2(base_json_path, backup_path)
-
-			try:
-				with base_json_path.open("r", encoding="utf-8") as f:
-					loaded = json.load(f)
-					if isinstance(loaded, list):
-						# migrate fields: reproducibility -> originality; make file relative
-						for it in loaded:
-							if isinstance(it, dict):
-								if "reproducibility" in it and "originality" not in it:
-									it["originality"] = it.pop("reproducibility")
-								# make file path relative if it starts with '/'
-								if isinstance(it.get("file"), str) and it["file"].startswith("/"):
-									it["file"] = it["file"][1:]
-						merged = loaded
-			except Exception:
-				merged = []
-
-		merged.append(entry)
-		# Write back to recipes.json (overwriting it)
-		with base_json_path.open("w", encoding="utf-8") as f:
-			json.dump(merged, f, ensure_ascii=False, indent=2)
+		store = self.store = open_store(base_json_path, self.store)
+		backup_recipes(base_json_path, [file_rel], f"hinzugefügt: {title}", store=store)
+		store.add(entry)
 
 		# Save HTML
-		html = generate_html(entry, instructions)
+		html = render_page(entry, instructions)
 		try:
-			html_path.parent.mkdir(parents=True, exist_ok=True)
-			with html_path.open("w", encoding="utf-8") as f:
-				f.write(html)
+			write_text_atomic(html_path, html)
+			compress_file(html_path)
+			publish_instructions(base_json_path.parent, file_rel, instructions)
 		except Exception as e:
 			messagebox.showerror("Error Saving", f"Could not save HTML: {e}")
 			return
@@ -814,7 +382,7 @@ class RecipeApp(tk.Tk):
 			"Success",
 			(
 				f"Single-entry JSON: {single_json_path.resolve()}\n"
-				f"Merged JSON: {base_json_path.resolve()} (backup created as {base_json_path}.bak)\n"
+				f"Merged JSON: {base_json_path.resolve()} (changes in: {store.location.name})\n"
 				f"HTML saved as: {html_path.resolve()}\n"
 				f"JSON 'file' path: {file_rel}"
 			),
@@ -822,5 +390,4 @@ class RecipeApp(tk.Tk):
 
 
 if __name__ == "__main__":
-	app = RecipeApp()
-	app.mainloop()
+	run_standalone(RecipeApp)
@@ -103,4 +103,22 @@ const SITE_BASE = window.location.pathname.startsWith('/RecsWeb/')
 
 const siteUrl = (path = '') => {
   return `${SITE_BASE}${String(path).replace(/^\/+/, '')}`;
-};
\ No newline at end of file
+};
+
+// Published data (written by recipePublish.py whenever recipes.json is written).
+// Files carry a content hash in their name; data/manifest.json maps these names to them.
+const DATA_MANIFEST = 'data/manifest.json';
+const DATA_RECIPES = 'recipes.json';
+const DATA_SUMMARY = 'summary.json';
+const DATA_SEARCH_INDEX = 'search-index.json';
+const DATA_FACETS = 'facets.json';
+
+// same as category_slug() in recipePublish.py
+const categorySlug = (category = '') =>
+  String(category).trim().toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '') || 'uncategorized';
+
+const categoryShardName = (category = '') => `categories/${categorySlug(category)}.json`;
+
+// same as instructions_path() in recipePublish.py
+const instructionsPath = (file = '') =>
+  `data/instructions/${String(file).replace(/^\/+/, '').replace(/\.html?$/i, '')}.json`;
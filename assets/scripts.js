@@ -8,6 +8,294 @@ const on = (el, ev, fn, opts) => el && el.addEventListener(ev, fn, opts);
 // defensives console-Wrapper
 const warn = (...args) => console.warn('[scripts.js]', ...args);
 
+// =====================================================
+// Veröffentlichte Daten (data/manifest.json -> Dateien mit Hash im Namen)
+// Nur das Manifest wird jedes Mal geprüft, die Dateien selbst ändern sich nie
+// =====================================================
+let dataManifestPromise = null;
+
+const loadDataManifest = () => {
+  if (!dataManifestPromise) {
+    dataManifestPromise = fetch(siteUrl(DATA_MANIFEST), { cache: 'no-cache' })
+      .then(res => {
+        if (!res.ok) throw new Error(`${DATA_MANIFEST} konnte nicht geladen werden. Status: ${res.status}`);
+        return res.json();
+      })
+      .then(manifest => (manifest && manifest.files) || {})
+      .catch(err => {
+        dataManifestPromise = null;
+        throw err;
+      });
+  }
+  return dataManifestPromise;
+};
+
+// Rezeptlisten kommen gepackt an: { packed, fields, ingredientFields, rows }
+// (siehe pack_records() in recipePublish.py); null-Werte fehlen im Original
+const unpackRecords = (data) => {
+  if (!data || Array.isArray(data) || !Array.isArray(data.rows)) return data;
+
+  const toRecord = (values, names) => {
+    const record = {};
+    names.forEach((name, i) => {
+      if (values[i] !== null && values[i] !== undefined) record[name] = values[i];
+    });
+    return record;
+  };
+
+  const ingredientFields = data.ingredientFields || [];
+  return data.rows.map(values => {
+    const record = toRecord(values, data.fields);
+    if (Array.isArray(record.ingredients)) {
+      record.ingredients = record.ingredients.map(ing => (Array.isArray(ing) ? toRecord(ing, ingredientFields) : ing));
+    }
+    return record;
+  });
+};
+
+// null, wenn der Name nicht veröffentlicht ist (z. B. Kategorie ohne Rezepte)
+const fetchData = async (name) => {
+  const files = await loadDataManifest();
+  if (!files[name]) return null;
+
+  const url = siteUrl(`data/${files[name]}`);
+  const res = await fetch(url, { cache: 'force-cache' });
+  if (!res.ok) throw new Error(`${url} konnte nicht geladen werden. Status: ${res.status}`);
+  return unpackRecords(await res.json());
+};
+
+// =====================================================
+// Suchindex (search-index.json, erzeugt von recipePublish.py)
+// Doc-IDs sind Positionen in summary.json bzw. recipes.json
+// =====================================================
+const normalizeSearchText = (text = '') =>
+  String(text ?? '')
+    .toLowerCase()
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .trim();
+
+const tokenizeSearchText = (text = '') => normalizeSearchText(text).match(/[\p{L}\p{N}]+/gu) || [];
+
+let searchIndexPromise = null;
+
+const loadSearchIndex = () => {
+  if (!searchIndexPromise) {
+    searchIndexPromise = fetchData(DATA_SEARCH_INDEX)
+      .then(index => {
+        if (!index) throw new Error(`${DATA_SEARCH_INDEX} ist nicht veröffentlicht`);
+        return index;
+      })
+      .catch(err => {
+        searchIndexPromise = null;
+        throw err;
+      });
+  }
+  return searchIndexPromise;
+};
+
+const intersectPostings = (a, b) => {
+  const out = [];
+  let i = 0;
+  let j = 0;
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      out.push(a[i]);
+      i++;
+      j++;
+    } else if (a[i] < b[j]) {
+      i++;
+    } else {
+      j++;
+    }
+  }
+  return out;
+};
+
+const unionPostings = (lists) => {
+  if (lists.length === 1) return lists[0];
+  const seen = new Set();
+  for (const list of lists) {
+    for (const doc of list) seen.add(doc);
+  }
+  return Array.from(seen).sort((a, b) => a - b);
+};
+
+// all docs of keys containing the (already normalised) needle
+const postingsContaining = (postings, needle) => {
+  const lists = [];
+  for (const key in postings) {
+    if (key.includes(needle)) lists.push(postings[key]);
+  }
+  return lists.length ? unionPostings(lists) : [];
+};
+
+const allDocs = (index) => Array.from({ length: index.count }, (_, i) => i);
+
+// same result as titles.filter(t => normalizeText(t).includes(query))
+const searchIndexTitles = (index, query) => {
+  const needle = normalizeSearchText(query);
+  if (!needle) return allDocs(index);
+
+  let docs = null;
+  for (const token of tokenizeSearchText(needle)) {
+    const found = postingsContaining(index.titleTokens, token);
+    docs = docs === null ? found : intersectPostings(docs, found);
+    if (!docs.length) return [];
+  }
+
+  return (docs ?? allDocs(index)).filter(doc => index.titles[doc].includes(needle));
+};
+
+// at least one of the categories
+const searchIndexCategories = (index, categories) =>
+  categories.length ? unionPostings(categories.map(c => index.categories[c] || [])) : [];
+
+// =====================================================
+// Zutaten: gleiche Regeln wie recipeIngredients.py
+// =====================================================
+const INGREDIENT_IRREGULAR = { leaves: 'leaf', leave: 'leaf' };
+
+const singularIngredientWord = (word) => {
+  if (INGREDIENT_IRREGULAR[word]) return INGREDIENT_IRREGULAR[word];
+  if (word.length <= 3) return word;
+  if (word.endsWith('ies')) return word.slice(0, -3) + 'y';
+  if (['oes', 'ches', 'shes', 'sses', 'xes'].some(end => word.endsWith(end))) return word.slice(0, -2);
+  if (word.endsWith('s') && !['ss', 'us', 'is'].some(end => word.endsWith(end))) return word.slice(0, -1);
+  return word;
+};
+
+// the word and its singular forms ("cookies": cookies, cooky, cookie); same as word_forms()
+const ingredientWordForms = (word) => {
+  const forms = new Set([word, singularIngredientWord(word)]);
+  if (word.length > 3 && word.endsWith('ies')) forms.add(word.slice(0, -1));
+  return [...forms];
+};
+
+// "Tomatoes (peeled, for the sauce)" -> ["tomatoes"]; same as ingredient_words()
+const ingredientWords = (name = '') => {
+  // notes in parentheses, innermost first; an unclosed "(" starts one too
+  let text = normalizeSearchText(name);
+  let stripped;
+  while ((stripped = text.replace(/\([^()]*\)/g, ' ')) !== text) text = stripped;
+  text = text.split('(')[0].replace(/\s(?:for|when)\s.*$/, '');
+  return text.match(/[\p{L}\p{N}]+/gu) || [];
+};
+
+// every word of the term starts a word of the ingredient name, in any of their forms
+// (both ingredientWords(); same as ingredient_matches())
+const ingredientMatches = (termWords, nameWords) => {
+  const names = nameWords.flatMap(ingredientWordForms);
+  return termWords.every(t => ingredientWordForms(t).some(form => names.some(n => n.startsWith(form))));
+};
+
+// name ids of all index words starting with prefix (ingredientWords is sorted)
+const ingredientNamesWithPrefix = (index, prefix) => {
+  const words = index.ingredientWords;
+  let lo = 0;
+  let hi = words.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (words[mid][0] < prefix) lo = mid + 1;
+    else hi = mid;
+  }
+  const ids = new Set();
+  for (let i = lo; i < words.length && words[i][0].startsWith(prefix); i++) {
+    for (const id of words[i][1]) ids.add(id);
+  }
+  return ids;
+};
+
+// every term must match at least one ingredient of the recipe
+const searchIndexIngredients = (index, terms) => {
+  let docs = null;
+  for (const term of terms) {
+    const words = ingredientWords(term);
+    if (!words.length) continue;
+
+    let names = null;
+    for (const word of words) {
+      const found = new Set(ingredientWordForms(word).flatMap(form => [...ingredientNamesWithPrefix(index, form)]));
+      names = names === null ? found : new Set([...names].filter(id => found.has(id)));
+      if (!names.size) return [];
+    }
+
+    const found = unionPostings([...names].map(id => index.ingredients[id]));
+    docs = docs === null ? found : intersectPostings(docs, found);
+    if (!docs.length) return [];
+  }
+  return docs ?? allDocs(index);
+};
+
+// =====================================================
+// Facetten (facets.json, erzeugt von recipePublish.py)
+// Ein Bitset pro Kategorie, Land, Schwierigkeit und Status,
+// Bit i = Doc i wie im Suchindex
+// =====================================================
+let facetsPromise = null;
+
+const decodeBits = (base64) => Uint8Array.from(atob(base64), ch => ch.charCodeAt(0));
+
+const loadFacets = () => {
+  if (!facetsPromise) {
+    facetsPromise = fetchData(DATA_FACETS)
+      .then(data => {
+        if (!data) throw new Error(`${DATA_FACETS} ist nicht veröffentlicht`);
+        const groups = {};
+        for (const [group, values] of Object.entries(data.facets || {})) {
+          groups[group] = {};
+          for (const [value, item] of Object.entries(values)) {
+            groups[group][value] = { count: item.count, bits: decodeBits(item.bits) };
+          }
+        }
+        return { count: data.count, groups };
+      })
+      .catch(err => {
+        facetsPromise = null;
+        throw err;
+      });
+  }
+  return facetsPromise;
+};
+
+// Docs mit einem der Werte (in einer der Gruppen); null = keine Einschränkung
+const facetBits = (facets, groups, values) => {
+  if (!values.length) return null;
+  const out = new Uint8Array((facets.count + 7) >> 3);
+  for (const group of groups) {
+    for (const value of values) {
+      const item = facets.groups[group]?.[value];
+      if (!item) continue;
+      for (let i = 0; i < out.length; i++) out[i] |= item.bits[i];
+    }
+  }
+  return out;
+};
+
+const andBits = (a, b) => {
+  if (a === null) return b;
+  if (b === null) return a;
+  return a.map((byte, i) => byte & b[i]);
+};
+
+const BIT_COUNTS = Uint8Array.from({ length: 256 }, (_, n) => {
+  let count = 0;
+  for (; n; n &= n - 1) count++;
+  return count;
+});
+
+const countBits = (bits) => bits.reduce((n, byte) => n + BIT_COUNTS[byte], 0);
+
+const bitsDocs = (bits) => {
+  const docs = [];
+  bits.forEach((byte, i) => {
+    for (let bit = 0; byte; bit++, byte >>= 1) {
+      if (byte & 1) docs.push(i * 8 + bit);
+    }
+  });
+  return docs;
+};
+
 // =====================================================
 // Start, wenn DOM bereit ist
 // =====================================================
@@ -94,7 +382,6 @@ async function initRecipeSearch() {
     return;
   }
 
-  const RECIPES_JSON = siteUrl('recipes.json');
   const SEARCH_PAGE = siteUrl('search.html');
   const FALLBACK_IMG = 'https://ik.imagekit.io/o9fejv2tr/RecsWeb%20Icons/image_not_found.png?updatedAt=1756760226935';
 
@@ -144,18 +431,21 @@ async function initRecipeSearch() {
   };
 
   try {
-    const response = await fetch(RECIPES_JSON);
-    if (!response.ok) {
-      throw new Error(`recipes.json konnte nicht geladen werden. Status: ${response.status}`);
-    }
-
-    recipes = await response.json();
+    recipes = await fetchData(DATA_SUMMARY);
     if (!Array.isArray(recipes)) recipes = [];
   } catch (error) {
     console.error('Fehler beim Laden der Rezepte für die Suche:', error);
     return;
   }
 
+  let index = null;
+  try {
+    index = await loadSearchIndex();
+    if (index.count !== recipes.length) index = null;
+  } catch (error) {
+    warn('Suchindex nicht verfügbar, durchsuche alle Titel:', error);
+  }
+
   input.addEventListener('input', () => {
     const query = input.value.trim();
     const normalizedQuery = normalizeText(query);
@@ -165,9 +455,11 @@ async function initRecipeSearch() {
       return;
     }
 
-    const matches = recipes
-      .filter(recipe => normalizeText(recipe?.title || '').includes(normalizedQuery))
-      .slice(0, 8);
+    const matches = index
+      ? searchIndexTitles(index, query).slice(0, 8).map(doc => recipes[doc])
+      : recipes
+        .filter(recipe => normalizeText(recipe?.title || '').includes(normalizedQuery))
+        .slice(0, 8);
 
     showSuggestions(matches);
   });
@@ -434,7 +726,6 @@ async function initRecipeSections() {
   const sections = Array.from(document.querySelectorAll('section[data-category], section[data-categorie]'));
   if (!sections.length) return;
 
-  const RECIPES_JSON_URL = siteUrl('recipes.json');
   const FALLBACK_IMG = 'https://ik.imagekit.io/o9fejv2tr/RecsWeb%20Icons/image_not_found.png?updatedAt=1756760226935';
 
   const toKey = (s) => (s || '').toString().trim().toLowerCase();
@@ -635,22 +926,29 @@ async function initRecipeSections() {
     startAutoSlide();
   };
 
-  let recipes = [];
+  // Each section only needs its own category shard; sections without a category use the summary
+  const loadList = async (wanted) => {
+    const data = await fetchData(wanted ? categoryShardName(wanted) : DATA_SUMMARY);
+    return Array.isArray(data) ? data : [];
+  };
+
+  const wantedKeys = sections.map(section => toKey(section.dataset.category || section.dataset.categorie || ''));
+  const lists = new Map();
   try {
-    const res = await fetch(RECIPES_JSON_URL, { cache: 'no-cache' });
-    recipes = await res.json();
-    if (!Array.isArray(recipes)) recipes = [];
+    const unique = [...new Set(wantedKeys)];
+    const loaded = await Promise.all(unique.map(loadList));
+    unique.forEach((wanted, i) => lists.set(wanted, loaded[i]));
   } catch (err) {
-    console.error('Failed to load recipes.json:', err);
+    console.error('Failed to load recipe data:', err);
     return;
   }
 
-  for (const section of sections) {
-    const wanted = toKey(section.dataset.category || section.dataset.categorie || '');
+  sections.forEach((section, i) => {
+    const wanted = wantedKeys[i];
     const track = getTrack(section);
-    if (!track) continue;
+    if (!track) return;
 
-    const list = recipes
+    const list = lists.get(wanted)
       .filter(r => recipeMatches(r, wanted))
       .sort((a, b) => (a.title || '').localeCompare(b.title || '', 'de'));
 
@@ -668,5 +966,5 @@ async function initRecipeSections() {
     }
 
     enableControls(section);
-  }
+  });
 }
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+# --------------------- helpers ---------------------
+
+def default_mode() -> int:
+    # what open(path, "w") would have created
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def fsync_dir(path: Path):
+    # makes the rename itself durable; not possible on Windows
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# --------------------- writing ---------------------
+
+def write_atomic(path: Path, data: bytes, sync: bool = True):
+    """Replaces path with data in one step (temp file, fsync, os.replace).
+
+    Readers, e.g. the dev server, see either the old or the new file, never
+    a half written one, and a crash leaves the old file in place. sync=False
+    skips the fsyncs, for callers writing many files and syncing once after.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = default_mode()
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if sync:
+        fsync_dir(path.parent)
+
+
+def write_text_atomic(path: Path, text: str):
+    write_atomic(path, text.encode("utf-8"))
+
+
+def write_json_atomic(path: Path, obj, **kwargs):
+    """json.dump to path via write_atomic; kwargs go to json.dumps (ensure_ascii=False by default)."""
+    kwargs.setdefault("ensure_ascii", False)
+    write_text_atomic(path, json.dumps(obj, **kwargs))
@@ -1,46 +1,17 @@
-import json
 import re
-import shutil
 from html import unescape
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+from recipeBackup import backup_recipes
+from recipeCore import derive_rel_file
+from recipePublish import remove_file, remove_instructions
+from recipeStore import ConflictError, entry_version, open_store
+from toolWindow import close_own_store, run_standalone
 
-# --------------------- helpers ---------------------
-
-def normalize_rel_path(path: str) -> str:
-    return str(path).replace("\\", "/").lstrip("./")
-
-
-def backup_file(path: Path):
-    if path.exists():
-        bak = path.with_suffix(path.suffix + ".bak")
-        shutil.copy2(path, bak)
-
-
-def load_json_list(json_path: Path) -> list:
-    if not json_path.exists():
-        return []
-    try:
-        with json_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data if isinstance(data, list) else []
-    except Exception:
-        return []
-
-
-def derive_rel_file(project_root: Path, html_path: Path) -> str:
-    try:
-        rel = html_path.resolve().relative_to(project_root.resolve())
-        return normalize_rel_path(rel.as_posix())
-    except Exception:
-        parts = list(html_path.parts)
-        if "recipes" in parts:
-            idx = parts.index("recipes")
-            return normalize_rel_path(Path(*parts[idx:]).as_posix())
-        return normalize_rel_path(html_path.name)
 
+# --------------------- helpers ---------------------
 
 def extract_title_from_html(html_path: Path) -> str:
     try:
@@ -65,30 +36,14 @@ def extract_title_from_html(html_path: Path) -> str:
     return raw
 
 
-def find_matching_json_entry(entries: list, rel_file: str, title: str):
-    rel_file_norm = normalize_rel_path(rel_file)
-    title_norm = str(title).strip()
-
-    for i, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            continue
-        if normalize_rel_path(entry.get("file", "")) == rel_file_norm:
-            return i, entry
-
-    for i, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            continue
-        if str(entry.get("title", "")).strip() == title_norm and title_norm:
-            return i, entry
-
-    return None, None
-
-
 # --------------------- UI ---------------------
 
-class DeleteRecipeApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
+class DeleteRecipeApp(tk.Toplevel):
+    def __init__(self, master, store=None):
+        super().__init__(master)
+        # the launcher's already loaded store, if opened from main.py
+        self.store = store
+        close_own_store(self, store)
         self.title("Delete Recipe")
         self.geometry("900x420")
 
@@ -208,8 +163,8 @@ class DeleteRecipeApp(tk.Tk):
         self.title_info.set(self.recipe_title or "–")
         self.file_info.set(self.rel_file or "–")
 
-        entries = load_json_list(self.json_path)
-        idx, entry = find_matching_json_entry(entries, self.rel_file, self.recipe_title)
+        store = self.store = open_store(self.json_path, self.store)
+        idx, entry = store.find(self.rel_file, self.recipe_title)
 
         self.match_index = idx
         self.match_entry = entry
@@ -250,15 +205,15 @@ class DeleteRecipeApp(tk.Tk):
             f"Es werden gelöscht:\n"
             f"- die HTML-Datei\n"
             f"- der JSON-Eintrag\n\n"
-            f"Vorher werden .bak-Sicherungen erstellt."
+            f"Vorher wird eine Sicherung angelegt (python recipeCli.py backups / restore)."
         )
 
         if not confirm:
             return
 
         try:
-            entries = load_json_list(self.json_path)
-            idx, entry = find_matching_json_entry(entries, self.rel_file, self.recipe_title)
+            store = self.store = open_store(self.json_path, self.store)
+            idx, entry = store.find(self.rel_file, self.recipe_title)
 
             if entry is None or idx is None:
                 messagebox.showerror(
@@ -267,16 +222,25 @@ class DeleteRecipeApp(tk.Tk):
                 )
                 return
 
-            backup_file(self.html_path)
-            backup_file(self.json_path)
-
-            if self.html_path.exists():
-                self.html_path.unlink()
+            backup_recipes(self.json_path, [self.rel_file], f"gelöscht: {title}", store=store)
 
-            entries.pop(idx)
+            # JSON zuerst: schlägt fehl, wenn das Rezept seit dem Laden woanders geändert wurde
+            try:
+                store.delete(
+                    entry.get("file", self.rel_file),
+                    entry.get("title", ""),
+                    expected_version=entry_version(self.match_entry),
+                )
+            except ConflictError as e:
+                messagebox.showerror(
+                    "Konflikt",
+                    f"{e}.\n\nBitte die HTML-Datei neu auswählen und das Löschen erneut bestätigen."
+                )
+                return
 
-            with self.json_path.open("w", encoding="utf-8") as f:
-                json.dump(entries, f, ensure_ascii=False, indent=2)
+            if self.html_path.exists():
+                remove_file(self.html_path)
+            remove_instructions(self.json_path.parent, self.rel_file)
 
             self.status_info.set("Rezept gelöscht")
             self.match_info.set("Eintrag entfernt")
@@ -307,5 +271,4 @@ class DeleteRecipeApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    app = DeleteRecipeApp()
-    app.mainloop()
\ No newline at end of file
+    run_standalone(DeleteRecipeApp)
\ No newline at end of file
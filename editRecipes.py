@@ -1,154 +1,28 @@
-import json
-import shutil
 from html import unescape
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    raise SystemExit("Bitte zuerst installieren: pip install beautifulsoup4")
+from atomicFile import write_text_atomic
+from recipeBackup import backup_recipes
+from recipeCore import RECIPE_FOLDERS, clamp, derive_rel_file, normalize_rel_path, parse_amount, to_int
+from recipeParser import (
+    INTERNAL_DIFF,
+    UnknownMarkup,
+    count_stars,
+    merge_recipe_data,
+    parse_minutes_from_text,
+    parse_recipe_html,
+)
+from recipeIngredients import load_ingredient_labels
+from recipePublish import compress_file, publish_instructions, remove_file, remove_instructions
+from recipeStore import ConflictError, entry_version, open_store
+from recipeTemplate import render_page
+from toolWindow import close_own_store, run_standalone, suggestion_box
 
 
 # --------------------- helpers ---------------------
 
-def to_int(val, default=0):
-    try:
-        return int(str(val).strip())
-    except Exception:
-        return default
-
-
-def clamp(n, lo=0, hi=5):
-    try:
-        n = int(n)
-    except Exception:
-        return lo
-    return max(lo, min(hi, n))
-
-
-def parse_amount(val):
-    s = str(val).strip()
-    if not s:
-        return ""
-
-    FRACTIONS = {
-        "½": 0.5,
-        "¼": 0.25,
-        "¾": 0.75,
-        "⅓": 1 / 3,
-        "⅔": 2 / 3,
-        "⅕": 0.2,
-        "⅖": 0.4,
-        "⅗": 0.6,
-        "⅘": 0.8,
-        "⅙": 1 / 6,
-        "⅚": 5 / 6,
-        "⅛": 0.125,
-        "⅜": 0.375,
-        "⅝": 0.625,
-        "⅞": 0.875,
-    }
-    if s in FRACTIONS:
-        return FRACTIONS[s]
-
-    if " " in s and "/" in s:
-        parts = s.split()
-        if len(parts) == 2 and "/" in parts[1]:
-            whole, frac = parts
-            try:
-                w = int(whole)
-                n, d = frac.split("/", 1)
-                n = int(n.strip())
-                d = int(d.strip()) or 1
-                return w + (n / d)
-            except Exception:
-                pass
-
-    if "/" in s and " " not in s:
-        try:
-            n, d = s.split("/", 1)
-            n = int(n.strip())
-            d = int(d.strip()) or 1
-            return n / d
-        except Exception:
-            pass
-
-    s2 = s.replace(",", ".")
-    try:
-        f = float(s2)
-        return int(f) if f.is_integer() else f
-    except Exception:
-        return s
-
-
-def stars(n):
-    n = clamp(n if n is not None else 5, 0, 5)
-    return ("★ " * n + "☆ " * (5 - n)).strip()
-
-
-def count_stars(text):
-    return str(text).count("★")
-
-
-def minutes_text_full(n):
-    n = to_int(n, 0)
-    return f"{n} minutes" if n != 1 else "1 minute"
-
-
-def minutes_text_short(n):
-    n = to_int(n, 0)
-    return f"{n} min." if n != 1 else "1 min."
-
-
-def parse_minutes_from_text(text):
-    text = str(text).strip()
-    digits = ""
-    for ch in text:
-        if ch.isdigit():
-            digits += ch
-        elif digits:
-            break
-    return to_int(digits, 0)
-
-
-def tk_html_escape(text: str) -> str:
-    return (
-        str(text)
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
-    )
-
-
-def tk_attr_escape(text: str) -> str:
-    return tk_html_escape(text)
-
-
-def backup_file(path: Path):
-    if path.exists():
-        bak = path.with_suffix(path.suffix + ".bak")
-        shutil.copy2(path, bak)
-
-
-def normalize_rel_path(path: str) -> str:
-    return str(path).replace("\\", "/").lstrip("./")
-
-
-def derive_rel_file(project_root: Path, html_path: Path) -> str:
-    try:
-        return normalize_rel_path(html_path.resolve().relative_to(project_root.resolve()).as_posix())
-    except Exception:
-        parts = list(html_path.parts)
-        if "recipes" in parts:
-            idx = parts.index("recipes")
-            return normalize_rel_path(Path(*parts[idx:]).as_posix())
-        return normalize_rel_path(html_path.name)
-
-
 def split_file_to_folder_filename(rel_file: str):
     rel = Path(rel_file)
     folder = rel.parent.name if rel.parent.name else "basics"
@@ -156,99 +30,6 @@ def split_file_to_folder_filename(rel_file: str):
     return folder, filename
 
 
-# Convert difficulty to English label for HTML
-ENGLISH_DIFF = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
-INTERNAL_DIFF = {"easy": "easy", "medium": "medium", "hard": "hard"}
-
-# badge colors
-CATEGORIE_BADGE = {
-    "pork": "bg-meat",
-    "chicken": "bg-meat",
-    "beef": "bg-meat",
-    "fish": "bg-primary",
-    "seafood": "bg-primary",
-    "vegan": "bg-vegetarian",
-    "vegetarian": "bg-vegetarian",
-    "vegetables": "bg-success",
-    "salad": "bg-success",
-    "noodles": "bg-grain",
-    "pasta": "bg-grain",
-    "rice": "bg-grain",
-    "potato": "bg-grain",
-    "breads": "bg-bakedDishes",
-    "sandwiches": "bg-bakedDishes",
-    "bakedDishes": "bg-bakedDishes",
-    "egg": "bg-egg",
-    "streetfood": "bg-streetfood",
-    "basics": "bg-secondary",
-    "component": "bg-secondary",
-    "drinks": "bg-secondary",
-    "appetizer": "bg-appetizer",
-    "fingerfood": "bg-fingerfood",
-    "cake": "bg-dessert",
-    "pastry": "bg-dessert",
-    "biscuit": "bg-dessert",
-    "otherDesserts": "bg-dessert",
-    "dessert": "bg-dessert",
-    "snacks": "bg-snacks",
-    "sauce": "bg-sauce",
-    "dressing": "bg-sauce",
-    "stew": "bg-stew",
-    "curry": "bg-curry",
-    "soup": "bg-soup",
-    "America": "bg-country",
-    "Austria": "bg-country",
-    "Bosnia": "bg-country",
-    "Great Britain": "bg-country",
-    "China": "bg-country",
-    "Mongolia": "bg-country",
-    "Portugal": "bg-country",
-    "Germany": "bg-country",
-    "France": "bg-country",
-    "Greece": "bg-country",
-    "India": "bg-country",
-    "Italy": "bg-country",
-    "Japan": "bg-country",
-    "Hungary": "bg-country",
-    "Lebanon": "bg-country",
-    "Korea": "bg-country",
-    "Mexico": "bg-country",
-    "Spain": "bg-country",
-    "Thailand": "bg-country",
-    "Turkey": "bg-country",
-    "Vietnam": "bg-country",
-}
-
-
-def get_category_badge(category: str) -> str:
-    return CATEGORIE_BADGE.get(category, "bg-secondary")
-
-
-RECIPE_FOLDERS = [
-    "appetizers",
-    "basics",
-    "beef",
-    "breadAndBakedDishes",
-    "cakesAndPastries",
-    "chicken",
-    "dressings-dips-sauces",
-    "drinks",
-    "egg",
-    "fish",
-    "component",
-    "noodle",
-    "otherDesserts",
-    "pork",
-    "potatoe",
-    "rice",
-    "sandwiches",
-    "snacks",
-    "soups",
-    "streetfood",
-    "vegetables",
-]
-
-
 # --------------------- HTML parsing ---------------------
 
 def get_card_value(scope, label_text: str) -> str:
@@ -266,6 +47,21 @@ def get_card_value(scope, label_text: str) -> str:
 
 def parse_html_recipe(html_path: Path) -> tuple[dict, list[str]]:
     html = html_path.read_text(encoding="utf-8")
+    try:
+        return parse_recipe_html(html)
+    except UnknownMarkup:
+        # hand-written or older pages: let BeautifulSoup deal with them
+        return parse_html_recipe_soup(html)
+
+
+def parse_html_recipe_soup(html: str) -> tuple[dict, list[str]]:
+    # imported here: bs4 takes longer to load than the rest of the editor and
+    # only pages the fast parser does not understand need it
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        raise RuntimeError("Unbekanntes Seitenformat. Bitte zuerst installieren: pip install beautifulsoup4")
+
     soup = BeautifulSoup(html, "html.parser")
 
     overview = soup.select_one("section.overview-section") or soup
@@ -375,314 +171,39 @@ def parse_html_recipe(html_path: Path) -> tuple[dict, list[str]]:
 
 # --------------------- JSON handling ---------------------
 
-def load_json_list(json_path: Path) -> list:
-    if not json_path.exists():
-        return []
+def save_json_entry(json_path: Path, entry: dict, rel_file: str = "", title: str = "", expected_version=None, store=None):
+    # rel_file/title identify the entry as it was loaded (the file may have been renamed);
+    # expected_version is the entry_version() it had then (ConflictError if it changed since)
+    opened = open_store(json_path, store)
     try:
-        with json_path.open("r", encoding="utf-8") as f:
-            loaded = json.load(f)
-            return loaded if isinstance(loaded, list) else []
-    except Exception:
-        return []
-
-
-def find_matching_json_entry(entries: list, rel_file: str, title: str):
-    rel_file_norm = normalize_rel_path(rel_file)
-    title_norm = str(title).strip()
-
-    for i, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            continue
-        if normalize_rel_path(entry.get("file", "")) == rel_file_norm:
-            return i, entry
-
-    for i, entry in enumerate(entries):
-        if not isinstance(entry, dict):
-            continue
-        if str(entry.get("title", "")).strip() == title_norm:
-            return i, entry
-
-    return None, None
-
-
-def merge_recipe_data(html_data: dict, json_entry: dict | None, rel_file: str) -> dict:
-    base = {
-        "title": "Recipe",
-        "categories": [],
-        "activeTime": 0,
-        "passiveTime": 0,
-        "totalTime": 0,
-        "servings": 2,
-        "difficulty": "easy",
-        "originality": 5,
-        "taste": 5,
-        "status": "",
-        "source": "",
-        "ingredients": [],
-        "image": "",
-        "file": rel_file,
-    }
-
-    if json_entry:
-        for k, v in json_entry.items():
-            base[k] = v
-
-    for k, v in html_data.items():
-        if k == "ingredients":
-            base[k] = v
-        elif v not in ("", [], None):
-            base[k] = v
-
-    base["file"] = rel_file
-
-    if not base.get("totalTime"):
-        base["totalTime"] = to_int(base.get("activeTime", 0)) + to_int(base.get("passiveTime", 0))
-
-    return base
-
-
-def save_json_entry(json_path: Path, entry: dict):
-    entries = load_json_list(json_path)
-    idx, _existing = find_matching_json_entry(entries, entry.get("file", ""), entry.get("title", ""))
-
-    if idx is None:
-        entries.append(entry)
-    else:
-        entries[idx] = entry
-
-    backup_file(json_path)
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(entries, f, ensure_ascii=False, indent=2)
-
-
-# --------------------- HTML generation ---------------------
-
-def render_ingredient_name(ing: dict) -> str:
-    name = tk_html_escape(ing.get("name", "")).strip()
-    link = str(ing.get("link", "")).strip()
-
-    if link:
-        return f'<a href="{tk_attr_escape(link)}" class="ingredient flex-fill">{name}</a>'
-
-    return f'<span class="ingredient flex-fill">{name}</span>'
-
-
-def generate_html(data: dict, instructions: list[str]) -> str:
-    title = data.get("title", "Recipe")
-    categories = data.get("categories", [])
-    active = to_int(data.get("activeTime", 0))
-    passive = to_int(data.get("passiveTime", 0))
-    total = to_int(data.get("totalTime", active + passive))
-    difficulty = ENGLISH_DIFF.get(str(data.get("difficulty", "easy")).lower(), "Easy")
-    originality = clamp(data.get("originality", 5), 0, 5)
-    taste = clamp(data.get("taste", 5), 0, 5)
-    image = data.get("image", "") or "../../img/img_food/placeholder.jpg"
-    source_raw = str(data.get("source", "")).strip()
-    source_text = tk_html_escape(source_raw) if source_raw else "–"
-    source_href = "#"
-    if source_raw.lower().startswith(("http://", "https://")):
-        source_href = tk_attr_escape(source_raw)
-
-    cat_badges = "".join(
-        [
-            f'<a href="../../recipeFilter.html#{tk_html_escape(c)}" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover"><span class="badge text-{get_category_badge(c)}">{tk_html_escape(c)}</span></a>'
-            for c in categories
-        ]
-    )
-
-    ingredients_li = []
-    for ing in data.get("ingredients", []):
-        has_amount = ("amount" in ing) and str(ing.get("amount", "")).strip() != ""
-        amount_val = ing.get("amount", "")
-        unit_val = ing.get("unit", "")
-        amount_disp = f"{amount_val}" if amount_val != "" else ""
-        name_html = render_ingredient_name(ing)
-
-        if not has_amount:
-            li = (
-                '<li class="list-group-item d-flex align-items-center gap-2">'
-                f'{name_html}'
-                '</li>\n'
-            )
-        else:
-            amount_attr = f'data-basis="{tk_attr_escape(amount_val)}"' if amount_val != "" else ""
-            unit_attr = f'data-basis="{tk_attr_escape(unit_val)}"' if unit_val != "" else ""
-            unit_span = f'<span class="unit" {unit_attr}>{tk_html_escape(unit_val)}</span>' if unit_val != "" else ""
-            li = (
-                '<li class="list-group-item d-flex align-items-center gap-2">'
-                f'<span class="amount" {amount_attr}>{tk_html_escape(amount_disp)}</span>'
-                f'{unit_span}'
-                f'{name_html}'
-                '</li>\n'
-            )
-        ingredients_li.append(li)
-
-    ingredients_html = "".join(ingredients_li)
-
-    instr_li = []
-    for step in instructions:
-        step = tk_html_escape(step)
-        if step:
-            instr_li.append(f'<li class="list-group-item">{step}</li>\n')
-    instructions_html = "".join(instr_li)
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<title>RecsWeb - {tk_html_escape(title)}</title>
-<link rel="icon" type="image/x-icon" href="https://ik.imagekit.io/o9fejv2tr/RecsWeb%20Icons/logo.png?updatedAt=1756760270932"> 
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width, initial-scale=1">
-<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
-<link rel="stylesheet" href="../../styles.css">
-<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css">
-<link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/lipis/flag-icons@7.3.2/css/flag-icons.min.css"/>
-<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;800&display=swap" rel="stylesheet">
-</head>
-<body class="d-flex flex-column min-vh-100">
-
-<div id="site-navbar"></div>
-
-<main class="flex-grow-1">
-<section class="overview-section py-4">
-<div class="container">
-    <h1 class="mb-3">{tk_html_escape(title)}</h1>
-
-    <div class="row g-4 align-items-center">
-    <div class="col-12 col-md-auto">
-        <img src="{tk_attr_escape(image)}"
-            class="img-thumbnail overview-img"
-            alt="image not found">
-    </div>
-
-    <div class="col">
-        <div class="d-flex flex-wrap gap-2 mb-3">
-        {cat_badges}
-        </div>
-
-        <div class="row row-cols-2 row-cols-sm-3 row-cols-md-4 g-3 mb-3">
-        <div class="col">
-            <div class="p-3 border rounded-3 bg-body">
-            <div class="small text-uppercase text-muted fw-semibold">Total Time</div>
-            <div class="fs-5">
-                <span class="text-warning">{minutes_text_full(total)}</span>
-            </div>
-            </div>
-        </div>
-        <div class="col">
-            <div class="p-3 border rounded-3 bg-body">
-            <div class="small text-uppercase text-muted fw-semibold">Difficulty</div>
-            <div class="fs-5">
-                <span class="text-warning">{difficulty}</span>
-            </div>
-            </div>
-        </div>
-        <div class="col">
-            <div class="p-3 border rounded-3 bg-body">
-            <div class="small text-uppercase text-muted fw-semibold">Originality</div>
-            <div class="fs-5">
-                <span class="text-warning">{stars(originality)}</span>
-            </div>
-            </div>
-        </div>
-        <div class="col">
-            <div class="p-3 border rounded-3 bg-body">
-            <div class="small text-uppercase text-muted fw-semibold">Taste</div>
-            <div class="fs-5">
-                <span class="text-warning">{stars(taste)}</span>
-            </div>
-            </div>
-        </div>
-        </div>
-
-        <div class="small text">
-        Source: <a href="{source_href}" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover">{source_text}</a>
-        </div>
-    </div>
-    </div>
-</div>
-</section>
-
-<section class="ingredients-section">
-<div class="overview-div">
-    <div class="container my-4">
-    <div class="border rounded-3 p-3 shadow-sm bg-white">
-        <div class="row row-cols-1 row-cols-md-3 text-center time-grid">
-
-        <div class="col my-3 time-item">
-            <div class="small text-uppercase text-muted mb-1">Active Time</div>
-            <div class="d-flex justify-content-center align-items-center gap-2">
-            <i class="fa-regular fa-clock"></i><span>{minutes_text_short(active)}</span>
-            </div>
-        </div>
-
-        <div class="col my-3 time-item">
-            <div class="small text-uppercase text-muted mb-1">Passive Time</div>
-            <div class="d-flex justify-content-center align-items-center gap-2">
-            <i class="fa-regular fa-clock"></i><span>{minutes_text_short(passive)}</span>
-            </div>
-        </div>
-
-        <div class="col my-3 time-item">
-            <div class="small text-uppercase text-muted mb-1">Total Time</div>
-            <div class="d-flex justify-content-center align-items-center gap-2">
-            <i class="fa-regular fa-clock"></i><span>{minutes_text_short(total)}</span>
-            </div>
-        </div>
-
-        </div>
-    </div>
-    </div>
-</div>
-
-<div class="ingredient-div">
-    <div class="container my-4">
-        <div class="row">
-            <div class="col-md-5">
-                <div class="border rounded-3 p-3 shadow-sm bg-white">
-                    <h2 class="h4 mb-3 fw-bold">Ingredients</h2>
-                    <ul class="list-group list-group-flush" id="ingredients">
-                        {ingredients_html}
-                    </ul>
-                </div>
-            </div>
-
-            <div class="col-md-7">
-                <div class="border rounded-3 p-3 shadow-sm bg-light h-100">
-                    <h2 class="h4 mb-3 fw-bold">Instructions</h2>
-                    <ol class="list-group list-group-numbered">
-                        {instructions_html}
-                    </ol>
-                </div>
-            </div>
-        </div>
-    </div>
-</div>
-</section>
-</main>
-
-<div id="site-footer"></div>
-<script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
-<script src="../../assets/constants.js"></script>
-<script src="../../assets/scripts.js"></script>
-</body>
-</html>"""
-    return html
+        opened.update(entry, rel_file, title, expected_version=expected_version)
+    finally:
+        if opened is not store:
+            opened.close()
 
 
 # --------------------- UI ---------------------
 
-class RecipeEditorApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
+class RecipeEditorApp(tk.Toplevel):
+    def __init__(self, master, store=None):
+        super().__init__(master)
+        # the launcher's already loaded store, if opened from main.py
+        self.store = store
+        close_own_store(self, store)
         self.title("Recipe HTML + JSON Editor")
         self.geometry("1200x850")
 
         self.project_root = Path(__file__).resolve().parent
         self.json_path = self.project_root / "recipes.json"
+        # ingredient names for the autocompletion of the name fields
+        self.ingredient_labels = load_ingredient_labels(self.json_path, self.store)
         self.html_path = None
         self.rel_file = ""
         self.loaded_json_entry_index = None
+        self.loaded_version = None
+        # file and title of the JSON entry as loaded; it may have been matched by title
+        self.loaded_file = ""
+        self.loaded_title = ""
 
         outer = ttk.Frame(self)
         outer.pack(fill=tk.BOTH, expand=True)
@@ -873,9 +394,12 @@ class RecipeEditorApp(tk.Tk):
             folder, filename = split_file_to_folder_filename(self.rel_file)
 
             html_data, instructions = parse_html_recipe(self.html_path)
-            entries = load_json_list(self.json_path)
-            idx, json_entry = find_matching_json_entry(entries, self.rel_file, html_data.get("title", ""))
+            store = self.store = open_store(self.json_path, self.store)
+            idx, json_entry = store.find(self.rel_file, html_data.get("title", ""))
             self.loaded_json_entry_index = idx
+            self.loaded_version = entry_version(json_entry) if json_entry else None
+            self.loaded_file = normalize_rel_path(json_entry.get("file", "")) if json_entry else ""
+            self.loaded_title = str(json_entry.get("title", "")).strip() if json_entry else ""
 
             merged = merge_recipe_data(html_data, json_entry, self.rel_file)
 
@@ -981,7 +505,7 @@ class RecipeEditorApp(tk.Tk):
         unit_e.insert(0, "" if unit == "" else str(unit))
         unit_e.pack(side=tk.LEFT, padx=(0, 6))
 
-        name_e = ttk.Entry(row, width=30)
+        name_e = suggestion_box(row, self.ingredient_labels, 30)
         name_e.insert(0, "" if name == "" else str(name))
         name_e.pack(side=tk.LEFT, padx=(0, 6))
 
@@ -1140,27 +664,43 @@ class RecipeEditorApp(tk.Tk):
 
         try:
             entry, instructions, folder, filename = self.collect_form_data()
+            self.store = open_store(self.json_path, self.store)
 
             new_html_path = self.project_root / "recipes" / folder / filename
 
-            if self.html_path.exists():
-                backup_file(self.html_path)
-
-            if self.json_path.exists():
-                backup_file(self.json_path)
-
-            html = generate_html(entry, instructions)
+            backup_recipes(
+                self.json_path, [self.rel_file, self.loaded_file, entry["file"]], f"bearbeitet: {entry['title']}",
+                store=self.store,
+            )
 
-            new_html_path.parent.mkdir(parents=True, exist_ok=True)
-            new_html_path.write_text(html, encoding="utf-8")
+            # JSON zuerst: schlägt fehl, wenn das Rezept inzwischen woanders geändert wurde
+            try:
+                save_json_entry(
+                    self.json_path, entry, self.loaded_file or self.rel_file, self.loaded_title,
+                    expected_version=self.loaded_version, store=self.store,
+                )
+            except ConflictError as e:
+                messagebox.showerror(
+                    "Konflikt",
+                    f"{e}.\n\nDas Rezept wurde in einem anderen Fenster bearbeitet. "
+                    "Bitte die HTML-Datei neu laden und die Änderungen erneut eintragen."
+                )
+                return
+            self.loaded_version = entry_version(entry)
+            self.loaded_file = entry["file"]
+            self.loaded_title = entry["title"]
+
+            html = render_page(entry, instructions)
+            write_text_atomic(new_html_path, html)
+            compress_file(new_html_path)
+            publish_instructions(self.json_path.parent, entry["file"], instructions)
 
             if self.html_path.resolve() != new_html_path.resolve():
                 # Alte Datei optional entfernen, damit kein Duplikat liegen bleibt
                 # Nur löschen, wenn sie noch existiert
                 if self.html_path.exists():
-                    self.html_path.unlink()
-
-            save_json_entry(self.json_path, entry)
+                    remove_file(self.html_path)
+                remove_instructions(self.json_path.parent, self.rel_file)
 
             self.html_path = new_html_path
             self.rel_file = entry["file"]
@@ -1176,5 +716,4 @@ class RecipeEditorApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    app = RecipeEditorApp()
-    app.mainloop()
\ No newline at end of file
+    run_standalone(RecipeEditorApp)
\ No newline at end of file
@@ -1,24 +1,37 @@
-import subprocess
-import sys
+import os
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from addRecipes import RecipeApp
+from deleteRecipes import DeleteRecipeApp
+from editRecipes import RecipeEditorApp
+from recipeStore import RecipeStore, open_store
+
 
 class RecipeToolLauncher(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Recipe Tools")
-        self.geometry("420x260")
+        self.geometry("420x310")
         self.resizable(False, False)
 
         self.base_dir = Path(__file__).resolve().parent
+        # addRecipes writes relative to the working directory
+        os.chdir(self.base_dir)
 
-        self.scripts = {
-            "Rezept hinzufügen": self.base_dir / "addRecipes.py",
-            "Rezept bearbeiten": self.base_dir / "editRecipes.py",
-            "Rezept löschen": self.base_dir / "deleteRecipes.py",
+        self.tools = {
+            "Rezept hinzufügen": RecipeApp,
+            "Rezept bearbeiten": RecipeEditorApp,
+            "Rezept löschen": DeleteRecipeApp,
         }
+        # open tool windows, one per tool
+        self.windows = {}
+
+        # recipes.json is parsed once, on first use; the tool windows share this store
+        # and only catch up on what changed since (RecipeStore.refresh)
+        self.json_path = self.base_dir / "recipes.json"
+        self.store = None
 
         self.build_ui()
 
@@ -40,21 +53,28 @@ class RecipeToolLauncher(tk.Tk):
         ttk.Button(
             wrapper,
             text="Rezept hinzufügen",
-            command=lambda: self.run_script("Rezept hinzufügen"),
+            command=lambda: self.open_tool("Rezept hinzufügen"),
             width=30,
         ).pack(pady=6)
 
         ttk.Button(
             wrapper,
             text="Rezept bearbeiten",
-            command=lambda: self.run_script("Rezept bearbeiten"),
+            command=lambda: self.open_tool("Rezept bearbeiten"),
             width=30,
         ).pack(pady=6)
 
         ttk.Button(
             wrapper,
             text="Rezept löschen",
-            command=lambda: self.run_script("Rezept löschen"),
+            command=lambda: self.open_tool("Rezept löschen"),
+            width=30,
+        ).pack(pady=6)
+
+        ttk.Button(
+            wrapper,
+            text="recipes.json aktualisieren",
+            command=self.compact_json,
             width=30,
         ).pack(pady=6)
 
@@ -67,24 +87,55 @@ class RecipeToolLauncher(tk.Tk):
             width=30,
         ).pack()
 
-    def run_script(self, label: str):
-        script_path = self.scripts[label]
-
-        if not script_path.exists():
-            messagebox.showerror(
-                "Datei nicht gefunden",
-                f"Das Unterprogramm wurde nicht gefunden:\n{script_path}"
-            )
+    def get_store(self) -> RecipeStore:
+        # asked again every time: recipes.sqlite created or removed since
+        # (recipeCli.py db-init / db-drop) switches between RecipeStore and RecipeDb
+        store = open_store(self.json_path, self.store)
+        if self.store is not None and store is not self.store:
+            # windows still holding the old one open their own (toolWindow.close_own_store)
+            self.store.close()
+        self.store = store
+        return self.store
+
+    def destroy(self):
+        if self.store is not None:
+            self.store.close()
+        super().destroy()
+
+    def open_tool(self, label: str):
+        window = self.windows.get(label)
+        if window is not None and window.winfo_exists():
+            window.deiconify()
+            window.lift()
+            window.focus_force()
             return
 
         try:
-            subprocess.Popen([sys.executable, str(script_path)], cwd=self.base_dir)
+            self.windows[label] = self.tools[label](self, store=self.get_store())
         except Exception as e:
             messagebox.showerror(
                 "Startfehler",
                 f"Das Unterprogramm konnte nicht gestartet werden:\n\n{e}"
             )
 
+    def compact_json(self):
+        json_path = self.json_path
+        try:
+            store = self.get_store()
+            with store.locked():
+                store.refresh()
+                pending = store.journal_len
+                store.compact()
+        except Exception as e:
+            messagebox.showerror("Fehler", f"recipes.json konnte nicht geschrieben werden:\n\n{e}")
+            return
+
+        messagebox.showinfo(
+            "Aktualisiert",
+            f"{pending} Änderung(en) aus dem Journal übernommen.\n"
+            f"{len(store.recipes())} Rezepte in {json_path.name}"
+        )
+
 
 if __name__ == "__main__":
     app = RecipeToolLauncher()
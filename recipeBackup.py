@@ -0,0 +1,316 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks (Windows); the tools still work, just uncoordinated
+    fcntl = None
+
+from atomicFile import write_atomic, write_json_atomic
+from recipePublish import canonical_entry
+from recipeCore import normalize_rel_path
+from recipeStore import RecipeStore, open_store
+
+
+# Next to recipes.json, git-ignored
+BACKUP_DIR = ".backups"
+OBJECT_DIR = "objects"
+GENERATION_DIR = "generations"
+LOCK_NAME = "backup.lock"
+
+# Number of generations kept
+GENERATIONS = 30
+# Every this many generations one is full (and old ones are pruned); the others are deltas
+FULL_EVERY = 10
+
+
+# --------------------- helpers ---------------------
+
+def blob_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def dump_entry(entry: dict) -> bytes:
+    return json.dumps(canonical_entry(entry), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def entry_key(entry: dict) -> str:
+    # entries are told apart by their page, as in RecipeStore.find
+    return normalize_rel_path(entry.get("file", ""))
+
+
+def merge_changes(pairs: list, pages: dict, changes: list, page_changes: dict) -> tuple[list, dict]:
+    """A full generation's entries and pages with the changes of a delta applied (None: removed)."""
+    position = {}
+    for i, (key, _h) in enumerate(pairs):
+        position.setdefault(key, i)
+    for key, h in changes:
+        if key in position:
+            pairs[position[key]] = [key, h]
+        elif h is not None:
+            position[key] = len(pairs)
+            pairs.append([key, h])
+    pages = dict(pages)
+    pages.update(page_changes)
+    return [p for p in pairs if p[1] is not None], {k: v for k, v in pages.items() if v is not None}
+
+
+# --------------------- store ---------------------
+
+class BackupStore:
+    """Content-addressed backups of the recipes.json entries and recipe pages.
+
+    Entries and pages are stored once per distinct content under
+    ``objects/`` (gzipped). A generation (``generations/<id>.json``) is
+    either full, listing the hash of every entry and page, or a delta on top
+    of the last full one with only the recipes changed since (``changes``,
+    None for removed ones). Deltas are cumulative, so restoring one needs its
+    base and itself. A save reads only the recipes it names (``pages``) and
+    the ones the store reports as changed since the previous generation;
+    every ``full_every`` generations the base and the changes are merged into
+    a new full one, and old generations and unreferenced blobs are pruned,
+    keeping the newest ``keep`` generations (and their bases).
+
+    snapshot() and prune() hold ``.backups/backup.lock``, so tools saving at
+    the same time neither reuse a generation id nor prune each other's blobs.
+    """
+
+    def __init__(self, root: Path, keep: int = GENERATIONS, full_every: int = FULL_EVERY):
+        self.root = Path(root)
+        self.dir = self.root / BACKUP_DIR
+        self.object_dir = self.dir / OBJECT_DIR
+        self.generation_dir = self.dir / GENERATION_DIR
+        self.lock_path = self.dir / LOCK_NAME
+        self.keep = keep
+        self.full_every = full_every
+        self.lock_fd = None
+        self.lock_depth = 0
+
+    # ---------- locking ----------
+    @contextmanager
+    def locked(self):
+        """Exclusive advisory lock across processes; re-entrant within one store."""
+        if self.lock_depth == 0 and fcntl is not None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self.lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(self.lock_fd)
+                self.lock_fd = None
+                raise
+        self.lock_depth += 1
+        try:
+            yield self
+        finally:
+            self.lock_depth -= 1
+            if self.lock_depth == 0 and self.lock_fd is not None:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+                os.close(self.lock_fd)
+                self.lock_fd = None
+
+    # ---------- blobs ----------
+    def object_path(self, h: str) -> Path:
+        return self.object_dir / h[:2] / h[2:]
+
+    def put(self, data: bytes, sync: bool = True) -> str:
+        h = blob_hash(data)
+        path = self.object_path(h)
+        if not path.exists():
+            write_atomic(path, gzip.compress(data, mtime=0), sync)
+        return h
+
+    def get(self, h: str) -> bytes:
+        return gzip.decompress(self.object_path(h).read_bytes())
+
+    def put_page(self, rel_file: str, sync: bool = True):
+        path = self.root / rel_file
+        return self.put(path.read_bytes(), sync) if rel_file and path.is_file() else None
+
+    # ---------- generations ----------
+    def generations(self) -> list[int]:
+        if not self.generation_dir.exists():
+            return []
+        ids = []
+        for path in self.generation_dir.glob("*.json"):
+            if path.stem.isdigit():
+                ids.append(int(path.stem))
+        return sorted(ids)
+
+    def generation_path(self, gen_id: int) -> Path:
+        return self.generation_dir / f"{gen_id:06d}.json"
+
+    def load_generation(self, gen_id: int) -> dict:
+        with self.generation_path(gen_id).open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def latest(self) -> dict | None:
+        ids = self.generations()
+        return self.load_generation(ids[-1]) if ids else None
+
+    def entry_pairs(self, gen: dict) -> list:
+        """[key, hash] of every entry of a full generation."""
+        entries = gen["entries"]
+        if entries and isinstance(entries[0], str):
+            # generations from before the deltas only list the hashes
+            return [[entry_key(json.loads(self.get(h))), h] for h in entries]
+        return [list(pair) for pair in entries]
+
+    def resolve(self, gen_id: int) -> tuple[list, dict]:
+        """([key, entry hash] in catalogue order, pages rel path -> hash) of a generation."""
+        gen = self.load_generation(gen_id)
+        if gen.get("base") is None:
+            return self.entry_pairs(gen), dict(gen["pages"])
+        pairs, pages = self.resolve(gen["base"])
+        return merge_changes(pairs, pages, gen["changes"], gen["pages"])
+
+    def resolve_pages(self, gen_id: int) -> dict:
+        gen = self.load_generation(gen_id)
+        pages = {} if gen.get("base") is None else self.resolve_pages(gen["base"])
+        pages.update(gen["pages"])
+        return {k: v for k, v in pages.items() if v is not None}
+
+    def snapshot(self, store, pages=(), reason: str = "") -> int:
+        """Records the recipes of store as a new generation; pages are the ones about to change.
+
+        Only the named recipes and the ones the store reports as changed
+        since the previous generation (store.changed_since) are read, with
+        store.find; every recipe only for the first generation or when the
+        store can no longer tell what changed. Returns the generation id (the
+        previous one if nothing changed).
+        """
+        with store.locked():
+            store.refresh()
+            with self.locked():
+                previous = self.latest()
+                wanted = {normalize_rel_path(p) for p in pages} - {""}
+                mark = store.change_mark()
+                changed = store.changed_since(previous.get("mark")) if previous else None
+                if changed is None:
+                    return self.write_fresh(store, previous, wanted, mark, reason)
+
+                if previous.get("base") is None:
+                    base_id, deltas, keys = previous["id"], 0, set()
+                else:
+                    base_id, deltas = previous["base"], previous["deltas"]
+                    keys = {key for key, _h in previous["changes"]}
+                # deltas are cumulative; what the previous save was about to change is read now
+                keys |= wanted | changed | set(previous.get("pending", []))
+
+                changes = []
+                for key in sorted(keys):
+                    _id, entry = store.find(key)
+                    changes.append([key, self.put(dump_entry(entry)) if entry else None])
+                page_hashes = {key: self.put_page(key) for key in sorted(keys)}
+                count = store.count()
+
+                if deltas + 1 >= self.full_every or len(keys) * 2 > count:
+                    return self.write_full(previous, base_id, changes, page_hashes, wanted, mark, reason)
+                if previous.get("base") == base_id and previous["changes"] == changes and previous["pages"] == page_hashes:
+                    return previous["id"]
+                return self.write_generation(previous["id"] + 1, reason, count, {
+                    "base": base_id,
+                    "deltas": deltas + 1,
+                    "changes": changes,
+                    "pages": page_hashes,
+                    "mark": mark,
+                })
+
+    def write_full(self, previous: dict, base_id: int, changes: list, page_hashes: dict, wanted: set, mark, reason: str) -> int:
+        # the base with the changes since: nothing has to be read or hashed again
+        pairs, pages = self.resolve(base_id)
+        pairs, pages = merge_changes(pairs, pages, changes, page_hashes)
+        return self.write_base(previous, pairs, pages, wanted, mark, reason)
+
+    def write_fresh(self, store, previous: dict | None, wanted: set, mark, reason: str) -> int:
+        # every entry; the blobs are synced once at the end instead of one by one
+        pairs = [[entry_key(e), self.put(dump_entry(e), sync=False)] for e in store.recipes()]
+
+        page_hashes = self.resolve_pages(previous["id"]) if previous else {}
+        # changed pages, and the ones of recipes that were never backed up (read once)
+        for rel_file in sorted(wanted | {key for key, _h in pairs if key not in page_hashes}):
+            h = self.put_page(rel_file, sync=False)
+            if h is None:
+                page_hashes.pop(rel_file, None)
+            else:
+                page_hashes[rel_file] = h
+        if hasattr(os, "sync"):
+            os.sync()
+        return self.write_base(previous, pairs, page_hashes, wanted, mark, reason)
+
+    def write_base(self, previous: dict | None, pairs: list, page_hashes: dict, wanted: set, mark, reason: str) -> int:
+        """Writes a full generation (and prunes) unless it is the same as the previous one."""
+        if (previous and previous.get("deltas") == 0 and previous["entries"] == pairs
+                and previous["pages"] == page_hashes and previous["pending"] == sorted(wanted)):
+            return previous["id"]
+        gen_id = self.write_generation(previous["id"] + 1 if previous else 1, reason, len(pairs), {
+            "base": None,
+            "deltas": 0,
+            "entries": pairs,
+            "pages": page_hashes,
+            # changed after this snapshot, so the next delta records them again
+            "pending": sorted(wanted),
+            "mark": mark,
+        })
+        self.prune()
+        return gen_id
+
+    def write_generation(self, gen_id: int, reason: str, count: int, content: dict) -> int:
+        gen = {"id": gen_id, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "reason": reason, "count": count}
+        gen.update(content)
+        write_json_atomic(self.generation_path(gen_id), gen, separators=(",", ":"))
+        return gen_id
+
+    def prune(self):
+        """Drops all but the newest keep generations (and their bases) and the blobs nothing refers to."""
+        with self.locked():
+            ids = self.generations()
+            kept = {gen_id: self.load_generation(gen_id) for gen_id in (ids[-self.keep:] if self.keep else ids)}
+            for base_id in {gen.get("base") for gen in kept.values()} - {None} - set(kept):
+                kept[base_id] = self.load_generation(base_id)
+            for gen_id in ids:
+                if gen_id not in kept:
+                    self.generation_path(gen_id).unlink()
+
+            referenced = set()
+            for gen in kept.values():
+                if gen.get("base") is None:
+                    entries = gen["entries"]
+                    referenced.update(h if isinstance(h, str) else h[1] for h in entries)
+                else:
+                    referenced.update(h for _key, h in gen["changes"] if h)
+                referenced.update(h for h in gen["pages"].values() if h)
+            if self.object_dir.exists():
+                for path in self.object_dir.glob("*/*"):
+                    if path.parent.name + path.name not in referenced:
+                        path.unlink()
+
+    # ---------- restoring ----------
+    def restore(self, gen_id: int, rel_file: str = "") -> tuple[list, dict]:
+        """Entries and pages (rel path -> bytes) of a generation, optionally only one recipe."""
+        pairs, page_hashes = self.resolve(gen_id)
+        rel_file = normalize_rel_path(rel_file)
+        entries = [json.loads(self.get(h)) for key, h in pairs if not rel_file or key == rel_file]
+
+        pages = {}
+        for entry in entries:
+            page = entry_key(entry)
+            if page in page_hashes:
+                pages[page] = self.get(page_hashes[page])
+        return entries, pages
+
+
+def backup_recipes(json_path: Path, pages=(), reason: str = "", store: RecipeStore | None = None) -> int:
+    """Snapshot of the current recipes (and the given pages) before a tool changes them."""
+    opened = open_store(json_path, store)
+    try:
+        return BackupStore(Path(json_path).parent).snapshot(opened, pages, reason)
+    finally:
+        if opened is not store:
+            opened.close()
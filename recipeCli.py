@@ -0,0 +1,1120 @@
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from recipePublish import (
+    canonical_entry,
+    compress,
+    compress_file,
+    compress_tree,
+    dump_json,
+    load_instructions,
+    pack_records,
+    prune_instructions,
+    publish_data,
+    publish_instructions,
+    remove_file,
+    remove_instructions,
+    unpack_records,
+)
+from atomicFile import write_atomic, write_json_atomic, write_text_atomic
+from recipeBackup import BackupStore
+from recipeCore import RECIPE_FOLDERS, clamp, normalize_rel_path, parse_amount, to_int
+from recipeParser import UnknownMarkup, extract_instructions, merge_recipe_data, parse_recipe_html
+from recipeServer import serve
+from recipeStore import JSON_INDENT, RecipeStore, db_path_for, entry_version, open_store
+from recipeTemplate import TEMPLATE_VERSION, get_category_badge, render_page
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+DEFAULT_JSON = PROJECT_ROOT / "recipes.json"
+MANIFEST_NAME = "recipes/.build-manifest.json"
+
+OPS = ("add", "update", "delete")
+
+# module -> window class measured by bench-startup
+STARTUP_TOOLS = {
+    "main": "RecipeToolLauncher",
+    "addRecipes": "RecipeApp",
+    "editRecipes": "RecipeEditorApp",
+    "deleteRecipes": "DeleteRecipeApp",
+}
+# fresh interpreter until the window is drawn
+STARTUP_TARGET_MS = 300
+
+# runs in a fresh interpreter: prints wall clock times after the import
+# and after the window was drawn ("-" without a display)
+STARTUP_PROBE = """
+import sys, time
+module, cls_name = sys.argv[1], sys.argv[2]
+tool = getattr(__import__(module), cls_name)
+imported = time.time()
+import tkinter as tk
+try:
+    if issubclass(tool, tk.Tk):
+        window = root = tool()
+    else:
+        root = tk.Tk()
+        root.withdraw()
+        window = tool(root)
+    window.update()
+except tk.TclError:
+    print(imported, "-")
+else:
+    print(imported, time.time())
+    root.destroy()
+"""
+
+
+class BatchError(Exception):
+    pass
+
+
+# --------------------- entries ---------------------
+
+def rel_file_from(raw: dict) -> str:
+    """'file' (recipes/<folder>/<name>.html) or 'folder' + 'filename'."""
+    rel_file = normalize_rel_path(raw.get("file", ""))
+    if not rel_file:
+        folder = str(raw.get("folder", "")).strip()
+        filename = str(raw.get("filename", "")).strip()
+        if not folder or not filename:
+            raise BatchError("'file' oder 'folder' + 'filename' fehlt")
+        rel_file = f"recipes/{folder}/{filename}"
+
+    if not rel_file.lower().endswith(".html"):
+        rel_file += ".html"
+
+    parts = rel_file.split("/")
+    if len(parts) != 3 or parts[0] != "recipes":
+        raise BatchError(f"ungültiger Pfad '{rel_file}' (erwartet recipes/<folder>/<name>.html)")
+    if parts[1] not in RECIPE_FOLDERS:
+        raise BatchError(f"unbekannter Ordner '{parts[1]}'")
+    return rel_file
+
+
+def build_entry(raw: dict) -> dict:
+    """Normalises a raw entry the same way the add/edit forms do."""
+    active = to_int(raw.get("activeTime", 0), 0)
+    passive = to_int(raw.get("passiveTime", 0), 0)
+    total = to_int(raw.get("totalTime", 0), 0) or active + passive
+
+    ingredients = []
+    for ing in raw.get("ingredients", []) or []:
+        if not isinstance(ing, dict):
+            continue
+        name = str(ing.get("name", "")).strip()
+        if not name:
+            continue
+        ing_obj = {"name": name}
+        amount = str(ing.get("amount", "")).strip()
+        if amount != "":
+            ing_obj["amount"] = parse_amount(amount)
+        unit = str(ing.get("unit", "")).strip()
+        if unit:
+            ing_obj["unit"] = unit
+        link = str(ing.get("link", "")).strip()
+        if link:
+            ing_obj["link"] = link
+        ingredients.append(ing_obj)
+
+    image = str(raw.get("image", "")).strip()
+
+    return {
+        "title": str(raw.get("title", "")).strip() or "Recipe",
+        "categories": [str(c).strip() for c in raw.get("categories", []) or [] if str(c).strip()],
+        "activeTime": active,
+        "passiveTime": passive,
+        "totalTime": total,
+        "servings": to_int(raw.get("servings", 2), 2),
+        "difficulty": str(raw.get("difficulty", "easy") or "easy").lower(),
+        "originality": clamp(raw.get("originality", 5), 0, 5),
+        "taste": clamp(raw.get("taste", 5), 0, 5),
+        "status": str(raw.get("status", "")).strip(),
+        "source": str(raw.get("source", "")).strip(),
+        "ingredients": ingredients,
+        "image": image if image else "N/A",
+        "file": rel_file_from(raw),
+    }
+
+
+def read_operations(path: Path) -> list:
+    """Reads a JSON Lines file of {"op": "add"|"update"|"delete", ...} objects."""
+    operations = []
+    errors = []
+    with path.open("r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                raw = json.loads(line)
+                if not isinstance(raw, dict) or raw.get("op") not in OPS:
+                    raise BatchError(f"'op' muss eines von {', '.join(OPS)} sein")
+                operations.append(parse_operation(raw))
+            except (ValueError, BatchError) as e:
+                errors.append(f"Zeile {line_no}: {e}")
+    if errors:
+        raise BatchError("\n".join(errors))
+    return operations
+
+
+def parse_operation(raw: dict) -> dict:
+    op = raw["op"]
+
+    if op == "delete":
+        rel_file = normalize_rel_path(raw.get("file", ""))
+        title = str(raw.get("title", "")).strip()
+        if not rel_file and not title:
+            raise BatchError("delete braucht 'file' oder 'title'")
+        return {"op": op, "file": rel_file, "title": title}
+
+    entry_raw = raw.get("entry")
+    if not isinstance(entry_raw, dict):
+        raise BatchError(f"{op} braucht ein 'entry'-Objekt")
+
+    operation = {"op": op, "entry": build_entry(entry_raw)}
+    if op == "update":
+        operation["file"] = normalize_rel_path(raw.get("file", "")) or operation["entry"]["file"]
+        operation["title"] = str(raw.get("title", "")).strip()
+
+    instructions = raw.get("instructions")
+    if instructions is not None:
+        if not isinstance(instructions, list):
+            raise BatchError("'instructions' muss eine Liste sein")
+        operation["instructions"] = [str(s).strip() for s in instructions if str(s).strip()]
+    return operation
+
+
+# --------------------- pages ---------------------
+
+def is_page_path(rel_file: str) -> bool:
+    parts = rel_file.split("/")
+    return len(parts) == 3 and parts[0] == "recipes" and rel_file.endswith(".html") and ".." not in parts
+
+
+def page_instructions(root: Path, rel_file: str) -> list:
+    """Steps of a page: from the HTML, else the published copy under data/instructions."""
+    page = root / rel_file
+    try:
+        steps = extract_instructions(page.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        steps = []
+    # a missing page (or one the parser gets nothing from) must not lose its steps
+    return steps or load_instructions(root, rel_file)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def json_hash(value) -> str:
+    return content_hash(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+def page_inputs(entry: dict) -> dict:
+    """Hashes of everything a page depends on apart from its instructions."""
+    categories = entry.get("categories", []) or []
+    return {
+        "entry": json_hash(entry),
+        "template": TEMPLATE_VERSION,
+        # only the badge classes this page actually uses
+        "badges": json_hash([[c, get_category_badge(c)] for c in categories]),
+    }
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    pages = data.get("pages") if isinstance(data, dict) else None
+    return pages if isinstance(pages, dict) else {}
+
+
+def save_manifest(path: Path, pages: dict):
+    write_json_atomic(path, {"version": 1, "pages": pages}, indent=2, sort_keys=True)
+
+
+def rebuild_page(root: Path, entry: dict, record: dict | None = None) -> tuple[str, str, dict | None]:
+    """Re-renders one page and returns (rel_file, status, manifest record).
+
+    If the manifest record shows the same entry/template/badge inputs and the
+    page on disk is still exactly the file we wrote (size + mtime), nothing is
+    read or rendered. Otherwise the page is rendered and only rewritten if its
+    content changes.
+    """
+    rel_file = normalize_rel_path(entry.get("file", ""))
+    if not is_page_path(rel_file):
+        return rel_file, "skipped", None
+
+    page = root / rel_file
+    inputs = page_inputs(entry)
+    try:
+        st = page.stat()
+    except FileNotFoundError:
+        st = None
+
+    if (
+        record
+        and st is not None
+        and all(record.get(k) == v for k, v in inputs.items())
+        and record.get("size") == st.st_size
+        and record.get("mtime_ns") == st.st_mtime_ns
+    ):
+        return rel_file, "unchanged", record
+
+    old = page.read_bytes() if st is not None else None
+    # a missing page gets the stored steps back instead of none
+    instructions = page_instructions(root, rel_file)
+    new = render_page(entry, instructions).encode("utf-8")
+    if instructions:
+        publish_instructions(root, rel_file, instructions)
+
+    status = "unchanged"
+    if old is None or content_hash(old) != content_hash(new):
+        write_atomic(page, new)
+        compress_file(page, new)
+        status = "created" if old is None else "written"
+
+    st = page.stat()
+    record = dict(inputs)
+    record.update({
+        "instructions": json_hash(instructions),
+        "output": content_hash(new),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    })
+    return rel_file, status, record
+
+
+def rebuild_task(root: Path, task: tuple) -> tuple[str, str, dict | None]:
+    entry, record = task
+    return rebuild_page(root, entry, record)
+
+
+def list_pages(root: Path) -> list[str]:
+    """Relative paths of all recipe pages (editor .bak copies excluded)."""
+    return sorted(
+        p.relative_to(root).as_posix()
+        for p in (root / "recipes").glob("*/*.html")
+        if ".bak" not in p.name
+    )
+
+
+def parse_page(root: Path, rel_file: str) -> tuple[str, dict | None, str]:
+    """Returns (rel_file, parsed data, error message)."""
+    try:
+        html = (root / rel_file).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return rel_file, None, str(e)
+
+    try:
+        data, _instructions = parse_recipe_html(html)
+    except UnknownMarkup:
+        try:
+            from bs4 import BeautifulSoup  # noqa: F401
+        except ImportError:
+            return rel_file, None, "unbekanntes Markup (für den Fallback beautifulsoup4 installieren)"
+        from editRecipes import parse_html_recipe_soup
+        data, _instructions = parse_html_recipe_soup(html)
+    return rel_file, data, ""
+
+
+def diff_fields(old: dict, new: dict) -> list[str]:
+    return [k for k in new if old.get(k) != new[k]]
+
+
+def describe_change(old, new) -> str:
+    if isinstance(old, list) and isinstance(new, list):
+        only_old = [x for x in old if x not in new]
+        only_new = [x for x in new if x not in old]
+        if not only_old and not only_new:
+            return "gleiche Werte, andere Reihenfolge"
+        return f"nur JSON={only_old!r} nur HTML={only_new!r}"
+    return f"JSON={old!r} HTML={new!r}"
+
+
+# --------------------- commands ---------------------
+
+def cmd_apply(args) -> int:
+    json_path = Path(args.json)
+    root = json_path.resolve().parent
+
+    try:
+        operations = read_operations(Path(args.ops))
+    except (OSError, BatchError) as e:
+        print(f"Fehler in {args.ops}:\n{e}", file=sys.stderr)
+        return 1
+
+    store = open_store(json_path, compact_threshold=0)
+
+    # one lock for resolving and applying, so no other tool writes in between
+    with store.locked():
+        store.refresh()
+
+        # resolve the pages to touch before the store changes underneath us;
+        # every added/updated page is rendered again, with the steps of the
+        # operation or else the ones it had so far (renamed: of the old page)
+        removed_pages = []
+        steps = {}
+        # what the earlier operations of the batch did (None: deleted or moved away)
+        batch_files = {}
+        batch_titles = {}
+
+        def find(rel_file: str, title: str):
+            rel_file = normalize_rel_path(rel_file)
+            entry = batch_files[rel_file] if rel_file in batch_files else store.find(rel_file)[1]
+            if entry is None and title:
+                entry = batch_titles[title] if title in batch_titles else store.find("", title)[1]
+                if entry is not None and batch_files.get(normalize_rel_path(entry.get("file", "")), entry) is None:
+                    entry = None
+            return entry
+
+        for operation in operations:
+            old_file = ""
+            if operation["op"] != "add":
+                existing = find(operation["file"], operation["title"])
+                if existing:
+                    old_file = normalize_rel_path(existing.get("file", ""))
+                    if operation["op"] == "delete" or old_file != operation["entry"]["file"]:
+                        removed_pages.append(old_file)
+                    batch_files[old_file] = None
+                    batch_titles[str(existing.get("title", "")).strip()] = None
+            if operation["op"] == "delete":
+                continue
+            new_file = operation["entry"]["file"]
+            batch_files[new_file] = operation["entry"]
+            batch_titles[str(operation["entry"].get("title", "")).strip()] = operation["entry"]
+            if "instructions" in operation:
+                steps[new_file] = operation["instructions"]
+            else:
+                source = old_file or new_file
+                steps[new_file] = steps[source] if source in steps else page_instructions(root, source)
+
+        records = [{k: v for k, v in op.items() if k != "instructions"} for op in operations]
+        BackupStore(root).snapshot(store, removed_pages + list(steps), f"apply {Path(args.ops).name}")
+        store.apply_batch(records)
+
+    written = 0
+    deleted = 0
+    if not args.json_only:
+        # new pages first, so a rename never leaves the recipe without one
+        for rel_file, instructions in steps.items():
+            _idx, entry = store.find(rel_file)
+            if not entry or not is_page_path(rel_file):
+                # deleted again later in the batch
+                continue
+            page = root / rel_file
+            write_text_atomic(page, render_page(entry, instructions))
+            compress_file(page)
+            publish_instructions(root, rel_file, instructions)
+            written += 1
+
+        kept = {normalize_rel_path(e.get("file", "")) for e in store.recipes()}
+        for rel_file in removed_pages:
+            page = root / rel_file
+            if rel_file not in kept and page.exists():
+                remove_file(page)
+                remove_instructions(root, rel_file)
+                deleted += 1
+
+    counts = {op: sum(1 for o in operations if o["op"] == op) for op in OPS}
+    print(
+        f"{len(operations)} Operationen ({counts['add']} add, {counts['update']} update, "
+        f"{counts['delete']} delete) -> {json_path}: {len(store.recipes())} Rezepte; "
+        f"{written} HTML-Seiten geschrieben, {deleted} gelöscht"
+    )
+    return 0
+
+
+def cmd_rebuild(args) -> int:
+    json_path = Path(args.json)
+    root = json_path.resolve().parent
+    manifest_path = root / MANIFEST_NAME
+    entries = open_store(json_path, compact_threshold=0).recipes()
+    manifest = {} if args.force else load_manifest(manifest_path)
+
+    tasks = [(e, manifest.get(normalize_rel_path(e.get("file", "")))) for e in entries]
+
+    started = time.perf_counter()
+    jobs = args.jobs or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(partial(rebuild_task, root), tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    pages = {}
+    for rel_file, status, record in results:
+        counts[status] = counts.get(status, 0) + 1
+        if status == "skipped":
+            print(f"übersprungen (ungültiger file-Pfad): {rel_file!r}", file=sys.stderr)
+        elif args.verbose and status != "unchanged":
+            print(f"{status}: {rel_file}")
+        if record is not None:
+            pages[rel_file] = record
+
+    # entries that disappeared from recipes.json drop out of the manifest
+    save_manifest(manifest_path, pages)
+
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"{len(entries)} Seiten in {elapsed:.2f}s mit {jobs} Prozessen: {summary or 'nichts zu tun'}")
+    return 0
+
+
+def cmd_reconcile(args) -> int:
+    json_path = Path(args.json)
+    root = json_path.resolve().parent
+    store = open_store(json_path, compact_threshold=0)
+    entries = {}
+    for entry in store.recipes():
+        entries.setdefault(normalize_rel_path(entry.get("file", "")), entry)
+
+    pages = list_pages(root)
+    started = time.perf_counter()
+    jobs = args.jobs or os.cpu_count() or 1
+    chunksize = max(1, len(pages) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        parsed = list(pool.map(partial(parse_page, root), pages, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    on_disk = set(pages)
+    missing = sorted(f for f in entries if f not in on_disk)
+    orphaned = []
+    mismatched = []
+    failed = []
+    fixes = []
+
+    for rel_file, data, error in parsed:
+        if data is None:
+            failed.append((rel_file, error))
+            continue
+        entry = entries.get(rel_file)
+        merged = merge_recipe_data(data, entry, rel_file)
+        if entry is None:
+            orphaned.append(rel_file)
+            fixes.append({"op": "add", "entry": merged})
+            continue
+        fields = diff_fields(entry, merged)
+        if fields:
+            mismatched.append((rel_file, fields, entry, merged))
+            fixes.append({"op": "update", "file": rel_file, "title": "", "entry": merged})
+
+    for rel_file in missing:
+        print(f"fehlt (keine HTML-Seite): {rel_file}")
+    for rel_file in orphaned:
+        print(f"verwaist (kein JSON-Eintrag): {rel_file}")
+    for rel_file, fields, entry, merged in mismatched:
+        print(f"abweichend: {rel_file}")
+        for k in fields:
+            print(f"    {k}: {describe_change(entry.get(k), merged[k])}")
+    for rel_file, error in failed:
+        print(f"nicht lesbar: {rel_file}: {error}", file=sys.stderr)
+
+    rate = len(pages) / elapsed if elapsed else float("inf")
+    print(
+        f"{len(pages)} Seiten in {elapsed:.2f}s ({rate:.0f} Seiten/s, {jobs} Prozesse): "
+        f"{len(missing)} fehlend, {len(orphaned)} verwaist, {len(mismatched)} abweichend, {len(failed)} nicht lesbar"
+    )
+
+    if args.fix and fixes:
+        # the HTML page wins, like loading and saving it in the editor; entries saved by
+        # another tool while the pages were parsed are left alone (entry_version(None) == "")
+        skipped = []
+        with store.locked():
+            store.refresh()
+            current = []
+            for fix in fixes:
+                rel_file = normalize_rel_path(fix["entry"]["file"])
+                if entry_version(store.find(rel_file)[1]) == entry_version(entries.get(rel_file)):
+                    current.append(fix)
+                else:
+                    skipped.append(rel_file)
+            if current:
+                BackupStore(root).snapshot(store, [f["entry"]["file"] for f in current], "reconcile --fix")
+                store.apply_batch(current)
+        for rel_file in skipped:
+            print(f"übersprungen (inzwischen geändert): {rel_file}")
+        print(f"{len(current)} JSON-Einträge aus HTML übernommen -> {json_path}")
+        return 0
+
+    return 1 if (missing or orphaned or mismatched or failed) else 0
+
+
+def cmd_bench_render(args) -> int:
+    json_path = Path(args.json)
+    root = json_path.resolve().parent
+    entries = [e for e in open_store(json_path, compact_threshold=0).recipes() if is_page_path(e.get("file", ""))]
+    if not entries:
+        print("keine Rezepte gefunden", file=sys.stderr)
+        return 1
+
+    pages = []
+    for entry in entries:
+        page = root / entry["file"]
+        instructions = extract_instructions(page.read_text(encoding="utf-8")) if page.exists() else []
+        pages.append((entry, instructions))
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        rendered = [render_page(entry, instructions) for entry, instructions in pages]
+    render_time = (time.perf_counter() - started) / (args.rounds * len(pages))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        for i, html in enumerate(rendered):
+            (Path(tmp) / f"{i}.html").write_text(html, encoding="utf-8")
+        write_time = (time.perf_counter() - started) / len(rendered)
+
+    print(f"{len(pages)} Seiten x {args.rounds} Runden")
+    print(f"rendern:   {render_time * 1e6:8.1f} µs/Seite")
+    print(f"schreiben: {write_time * 1e6:8.1f} µs/Seite")
+    return 0
+
+
+def cmd_bench_parse(args) -> int:
+    root = Path(args.json).resolve().parent
+    pages = [p.read_text(encoding="utf-8") for p in sorted((root / "recipes").glob("*/*.html"))]
+    if not pages:
+        print("keine Rezeptseiten gefunden", file=sys.stderr)
+        return 1
+
+    unknown = 0
+    started = time.perf_counter()
+    for html in pages:
+        try:
+            parse_recipe_html(html)
+        except UnknownMarkup:
+            unknown += 1
+    fast_time = (time.perf_counter() - started) / len(pages)
+    print(f"{len(pages)} Seiten, {unknown} mit unbekanntem Markup")
+    print(f"HTMLParser:    {fast_time * 1e3:6.2f} ms/Seite")
+
+    try:
+        from bs4 import BeautifulSoup  # noqa: F401
+    except ImportError:
+        return 0
+    from editRecipes import parse_html_recipe_soup
+
+    started = time.perf_counter()
+    for html in pages:
+        parse_html_recipe_soup(html)
+    soup_time = (time.perf_counter() - started) / len(pages)
+    print(f"BeautifulSoup: {soup_time * 1e3:6.2f} ms/Seite ({soup_time / fast_time:.1f}x)")
+    return 0
+
+
+def cmd_bench_json(args) -> int:
+    entries = [canonical_entry(e) for e in open_store(Path(args.json), compact_threshold=0).recipes()]
+    if not entries:
+        print("keine Rezepte gefunden", file=sys.stderr)
+        return 1
+
+    packed = pack_records(entries)
+    if unpack_records(json.loads(dump_json(packed))) != entries:
+        print("gepackte Daten weichen vom Original ab", file=sys.stderr)
+        return 1
+
+    variants = [
+        ("eingerückt (recipes.json)", json.dumps(entries, ensure_ascii=False, indent=JSON_INDENT).encode("utf-8"), False),
+        ("minifiziert", dump_json(entries), False),
+        ("minifiziert + gepackt", dump_json(packed), True),
+    ]
+
+    print(f"{len(entries)} Rezepte, {args.rounds} Runden")
+    print(f"{'':28}{'Bytes':>9}{'gzip':>9}{'brotli':>9}{'parse ms':>10}{'entpacken ms':>14}")
+    for label, data, is_packed in variants:
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            loaded = json.loads(data)
+        parse_time = (time.perf_counter() - started) / args.rounds
+
+        unpack_time = 0.0
+        if is_packed:
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                unpack_records(loaded)
+            unpack_time = (time.perf_counter() - started) / args.rounds
+
+        br = compress(data, ".br")
+        br_size = f"{len(br):9d}" if br is not None else f"{'-':>9}"
+        print(
+            f"{label:28}{len(data):9d}{len(compress(data, '.gz')):9d}{br_size}"
+            f"{parse_time * 1e3:10.2f}{unpack_time * 1e3:14.2f}"
+        )
+    return 0
+
+
+def import_times(stderr: str) -> list[tuple[int, str]]:
+    """(self µs, module) from the -X importtime report, slowest first."""
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[0].strip().isdigit():
+            times.append((int(parts[0]), parts[2].strip()))
+    return sorted(times, reverse=True)
+
+
+def measure_startup(module: str, cls_name: str) -> tuple[float, float | None, list]:
+    """Milliseconds from process start to imported / window drawn, and the import times."""
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_PROBE, module, cls_name],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "kein Ergebnis")
+    imported, drawn = result.stdout.split()[-2:]
+    shown = (float(drawn) - started) * 1e3 if drawn != "-" else None
+    return (float(imported) - started) * 1e3, shown, import_times(result.stderr)
+
+
+def cmd_bench_startup(args) -> int:
+    print(f"Kaltstart bis das Fenster steht, bester von {args.rounds} Läufen, Ziel {args.target} ms")
+    print(f"{'':16}{'Import ms':>11}{'Fenster ms':>12}  langsamste Imports (eigene Zeit)")
+    over = 0
+    for module, cls_name in STARTUP_TOOLS.items():
+        best = None
+        for _ in range(args.rounds):
+            try:
+                run = measure_startup(module, cls_name)
+            except RuntimeError as e:
+                print(f"{module:16}Fehler: {e}")
+                return 1
+            if best is None or (run[1] or run[0]) < (best[1] or best[0]):
+                best = run
+        imported_ms, shown_ms, times = best
+        slowest = ", ".join(f"{name} {us / 1e3:.1f}" for us, name in times[:args.top])
+        shown = f"{shown_ms:12.1f}" if shown_ms is not None else f"{'-':>12}"
+        print(f"{module:16}{imported_ms:11.1f}{shown}  {slowest}")
+        if (shown_ms if shown_ms is not None else imported_ms) > args.target:
+            over += 1
+
+    if over:
+        print(f"{over} Werkzeug(e) über dem Ziel von {args.target} ms")
+        return 1
+    return 0
+
+
+def cmd_publish(args) -> int:
+    json_path = Path(args.json)
+    store = open_store(json_path, compact_threshold=0)
+    root = json_path.resolve().parent
+    stats = publish_data(root, store.recipes(), pack=args.packed)
+
+    # instructions live in the pages; the stored copy of a page that is
+    # missing right now is kept, only recipes that are gone lose theirs
+    rel_files = []
+    for entry in store.recipes():
+        rel_file = normalize_rel_path(entry.get("file", ""))
+        if not is_page_path(rel_file):
+            continue
+        rel_files.append(rel_file)
+        if not (root / rel_file).exists():
+            continue
+        steps = page_instructions(root, rel_file)
+        stats["written" if publish_instructions(root, rel_file, steps) else "unchanged"] += 1
+    stats["removed"] += prune_instructions(root, rel_files)
+
+    # .gz/.br next to pages, assets and data that changed outside the tools
+    for key, count in compress_tree(root).items():
+        stats[key] += count
+
+    print(f"data/: {stats['written']} geschrieben, {stats['unchanged']} unverändert, {stats['removed']} entfernt")
+    return 0
+
+
+def cmd_backups(args) -> int:
+    backups = BackupStore(Path(args.json).resolve().parent)
+    ids = backups.generations()
+    if not ids:
+        print("keine Sicherungen vorhanden")
+        return 0
+    for gen_id in ids:
+        gen = backups.load_generation(gen_id)
+        count = gen.get("count", len(gen.get("entries", [])))
+        kind = "voll " if gen.get("base") is None else "Delta"
+        print(f"{gen_id:6d}  {gen['time']}  {kind}  {count:4d} Rezepte  {gen['reason']}")
+    return 0
+
+
+def cmd_restore(args) -> int:
+    json_path = Path(args.json)
+    root = json_path.resolve().parent
+    backups = BackupStore(root)
+    if args.generation not in backups.generations():
+        print(f"Sicherung {args.generation} gibt es nicht (recipeCli.py backups)", file=sys.stderr)
+        return 1
+
+    entries, pages = backups.restore(args.generation, args.file)
+    if args.file and not entries:
+        print(f"{args.file} ist in Sicherung {args.generation} nicht enthalten", file=sys.stderr)
+        return 1
+
+    store = open_store(json_path, compact_threshold=0)
+    with store.locked():
+        store.refresh()
+        current = {normalize_rel_path(e.get("file", "")) for e in store.recipes()}
+        restored = {normalize_rel_path(e.get("file", "")) for e in entries}
+        # pages of recipes the restore removes (whole catalogue only)
+        dropped = sorted(current - restored) if not args.file else []
+
+        # the state before the restore is itself a generation, so it can be undone
+        before = backups.snapshot(store, sorted(current | restored), f"vor restore {args.generation}")
+
+        if args.file:
+            store.update(entries[0], args.file)
+        else:
+            store.reset(entries)
+
+    if not args.json_only:
+        for rel_file, data in pages.items():
+            write_atomic(root / rel_file, data)
+            compress_file(root / rel_file, data)
+            publish_instructions(root, rel_file, extract_instructions(data.decode("utf-8")))
+        for rel_file in dropped:
+            if is_page_path(rel_file) and (root / rel_file).exists():
+                remove_file(root / rel_file)
+                remove_instructions(root, rel_file)
+
+    print(
+        f"Sicherung {args.generation} wiederhergestellt: {len(entries)} Rezepte, "
+        f"{0 if args.json_only else len(pages)} HTML-Seiten, {0 if args.json_only else len(dropped)} entfernt "
+        f"(rückgängig: recipeCli.py restore {before})"
+    )
+    return 0
+
+
+def cmd_serve(args) -> int:
+    serve(Path(args.json).resolve().parent, args.port, args.bind, quiet=args.quiet)
+    return 0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def load_client(port: int, paths: list, deadline: float, revalidate: bool) -> dict:
+    """One browser-like client: requests paths in turn until deadline.
+
+    With revalidate it sends the validators of its first answer for each path
+    (If-None-Match / If-Modified-Since), like a reload with a warm cache.
+    """
+    result = {"requests": 0, "bytes": 0, "not_modified": 0, "errors": 0, "latencies": []}
+    validators = {}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    i = 0
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {"Accept-Encoding": "br, gzip"}
+        if revalidate:
+            headers.update(validators.get(path, {}))
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (OSError, http.client.HTTPException):
+            result["errors"] += 1
+            conn.close()
+            continue
+        result["latencies"].append(time.perf_counter() - started)
+        result["requests"] += 1
+        result["bytes"] += len(body)
+        if resp.status == 304:
+            result["not_modified"] += 1
+        elif resp.status != 200:
+            result["errors"] += 1
+        elif path not in validators:
+            found = {"If-None-Match": resp.getheader("ETag"), "If-Modified-Since": resp.getheader("Last-Modified")}
+            validators[path] = {k: v for k, v in found.items() if v}
+        if resp.will_close:
+            conn.close()
+    conn.close()
+    return result
+
+
+def cmd_bench_serve(args) -> int:
+    root = Path(args.json).resolve().parent
+    paths = ["/", "/" + Path(args.json).resolve().name, "/styles.css"]
+    paths += [f"/{p.relative_to(root).as_posix()}" for p in sorted(root.glob("partials/*.html"))]
+    paths += [f"/{p.relative_to(root).as_posix()}" for p in sorted(root.glob("assets/*.js"))]
+    paths = [p for p in paths if p == "/" or (root / p.lstrip("/")).is_file()]
+
+    # python -m http.server is threaded too (ThreadingHTTPServer, HTTP/1.0, no validators)
+    servers = (
+        ("http.server", lambda port: [
+            sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1", "--directory", str(root),
+        ]),
+        ("recipeServer", lambda port: [
+            sys.executable, str(PROJECT_ROOT / "recipeCli.py"), "--json", args.json, "serve", "-p", str(port), "--quiet",
+        ]),
+    )
+    print(f"{len(paths)} Dateien, {args.clients} Clients, {args.seconds} s je Lauf")
+    print(f"{'':28}{'Anfr./s':>10}{'MB/s':>8}{'p50 ms':>8}{'p99 ms':>8}{'304':>7}{'Fehler':>8}")
+    for label, command in servers:
+        port = free_port()
+        proc = subprocess.Popen(command(port), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_for_port(port):
+                print(f"{label}: Server startet nicht", file=sys.stderr)
+                return 1
+            for revalidate in (False, True):
+                deadline = time.monotonic() + args.seconds
+                with ThreadPoolExecutor(args.clients) as pool:
+                    results = list(pool.map(lambda _i: load_client(port, paths, deadline, revalidate), range(args.clients)))
+                latencies = sorted(t for r in results for t in r["latencies"]) or [0.0]
+                requests = sum(r["requests"] for r in results)
+                name = f"{label} ({'neu laden' if revalidate else 'leerer Cache'})"
+                print(
+                    f"{name:28}{requests / args.seconds:10.0f}"
+                    f"{sum(r['bytes'] for r in results) / args.seconds / 1e6:8.1f}"
+                    f"{latencies[len(latencies) // 2] * 1e3:8.2f}"
+                    f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3:8.2f}"
+                    f"{sum(r['not_modified'] for r in results):7d}"
+                    f"{sum(r['errors'] for r in results):8d}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait()
+    return 0
+
+
+def cmd_compact(args) -> int:
+    store = open_store(Path(args.json), compact_threshold=0)
+    pending = store.journal_len
+    store.compact()
+    print(f"{args.json}: {len(store.recipes())} Rezepte, {pending} Journal-Einträge übernommen")
+    return 0
+
+
+def cmd_find(args) -> int:
+    if not args.category and not args.ingredient:
+        print("--category und/oder --ingredient angeben", file=sys.stderr)
+        return 1
+
+    store = open_store(Path(args.json), compact_threshold=0)
+    # with recipes.sqlite these go through the category and ingredient indexes
+    found = None
+    for lookup, value in ((store.with_category, args.category), (store.with_ingredient, args.ingredient)):
+        if value:
+            matches = lookup(value)
+            if found is not None:
+                files = {normalize_rel_path(e.get("file", "")) for e in matches}
+                matches = [e for e in found if normalize_rel_path(e.get("file", "")) in files]
+            found = matches
+    store.close()
+
+    for entry in found:
+        print(f"{entry.get('file', '')}  {entry.get('title', '')}")
+    print(f"{len(found)} Rezepte")
+    return 0
+
+
+def cmd_db_init(args) -> int:
+    from recipeDb import create_database
+
+    json_path = Path(args.json)
+    db_path = db_path_for(json_path)
+    if db_path.exists() and not args.force:
+        print(f"{db_path} gibt es schon (--force baut sie aus recipes.json neu auf)", file=sys.stderr)
+        return 1
+
+    store = RecipeStore(json_path, compact_threshold=0)
+    with store.locked():
+        # fold the journal in first, the database starts from recipes.json
+        store.compact()
+        create_database(db_path, store.recipes())
+    print(f"{db_path}: {len(store.recipes())} Rezepte; die Werkzeuge speichern ab jetzt dort")
+    return 0
+
+
+def cmd_db_drop(args) -> int:
+    from recipeDb import RecipeDb
+
+    json_path = Path(args.json)
+    db_path = db_path_for(json_path)
+    if not db_path.exists():
+        print(f"{db_path} gibt es nicht", file=sys.stderr)
+        return 1
+
+    db = RecipeDb(json_path, compact_threshold=0)
+    db.compact()
+    count = len(db.recipes())
+    db.close()
+    for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        if path.exists():
+            path.unlink()
+    print(f"{json_path}: {count} Rezepte exportiert, {db_path.name} entfernt")
+    return 0
+
+
+def cmd_bench_db(args) -> int:
+    from recipeDb import RecipeDb, create_database
+
+    base = [canonical_entry(e) for e in open_store(Path(args.json), compact_threshold=0).recipes()]
+    if not base:
+        print("keine Rezepte gefunden", file=sys.stderr)
+        return 1
+
+    # a larger catalogue made of copies with distinct files/titles
+    entries = []
+    for i in range(args.size):
+        entry = dict(base[i % len(base)])
+        entry["file"] = f"recipes/bench/{i}-{Path(entry.get('file', '')).name}"
+        entry["title"] = f"{entry.get('title', '')} {i}"
+        entries.append(entry)
+    sample = entries[::max(1, len(entries) // args.rounds)][:args.rounds]
+
+    print(f"{len(entries)} Rezepte, {len(sample)} Suchen/Änderungen")
+    print(f"{'':14}{'öffnen ms':>11}{'suchen µs':>11}{'ändern ms':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "recipes.json"
+        write_json_atomic(json_path, entries, indent=JSON_INDENT)
+        create_database(db_path_for(json_path), entries)
+
+        for label, store_class in (("JSON+Journal", RecipeStore), ("SQLite", RecipeDb)):
+            if store_class is RecipeStore:
+                # the persisted index is written on the first load
+                RecipeStore(json_path, compact_threshold=0)
+            started = time.perf_counter()
+            store = store_class(json_path, compact_threshold=0)
+            open_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for entry in sample:
+                store.find(entry["file"])
+            find_time = (time.perf_counter() - started) / len(sample)
+
+            started = time.perf_counter()
+            for entry in sample:
+                store.update(dict(entry, taste=3), entry["file"])
+            update_time = (time.perf_counter() - started) / len(sample)
+
+            print(f"{label:14}{open_time * 1e3:11.1f}{find_time * 1e6:11.1f}{update_time * 1e3:11.2f}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="RecsWeb – Rezeptverwaltung ohne GUI")
+    parser.add_argument("--json", default=str(DEFAULT_JSON), help="Pfad zu recipes.json")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("apply", help="add/update/delete-Operationen aus einer JSON-Lines-Datei anwenden")
+    p.add_argument("ops", help="JSON-Lines-Datei, eine Operation pro Zeile")
+    p.add_argument("--json-only", action="store_true", help="nur recipes.json ändern, keine HTML-Seiten")
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser("rebuild", help="alle Rezeptseiten aus recipes.json neu erzeugen")
+    p.add_argument("-j", "--jobs", type=int, default=0, help="Anzahl Prozesse (Standard: CPU-Kerne)")
+    p.add_argument("--force", action="store_true", help="Build-Manifest ignorieren und jede Seite prüfen")
+    p.add_argument("-v", "--verbose", action="store_true", help="geänderte Seiten auflisten")
+    p.set_defaults(func=cmd_rebuild)
+
+    p = sub.add_parser("reconcile", help="recipes.json mit den HTML-Seiten abgleichen")
+    p.add_argument("-j", "--jobs", type=int, default=0, help="Anzahl Prozesse (Standard: CPU-Kerne)")
+    p.add_argument("--fix", action="store_true", help="verwaiste/abweichende Einträge aus dem HTML übernehmen")
+    p.set_defaults(func=cmd_reconcile)
+
+    p = sub.add_parser("bench-render", help="Renderzeit pro Seite messen")
+    p.add_argument("-n", "--rounds", type=int, default=50, help="Anzahl Durchläufe (Standard: 50)")
+    p.set_defaults(func=cmd_bench_render)
+
+    p = sub.add_parser("bench-parse", help="Parsezeit pro Rezeptseite messen")
+    p.set_defaults(func=cmd_bench_parse)
+
+    p = sub.add_parser("compact", help="Journal in recipes.json übernehmen")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("bench-json", help="Größe und Parsezeit von eingerücktem, minifiziertem und gepacktem JSON")
+    p.add_argument("-n", "--rounds", type=int, default=200, help="Anzahl Durchläufe (Standard: 200)")
+    p.set_defaults(func=cmd_bench_json)
+
+    p = sub.add_parser("bench-startup", help="Startzeit der Werkzeuge messen (python -X importtime)")
+    p.add_argument("-n", "--rounds", type=int, default=3, help="Anzahl Läufe je Werkzeug (Standard: 3)")
+    p.add_argument("--top", type=int, default=4, help="so viele langsamste Imports anzeigen (Standard: 4)")
+    p.add_argument(
+        "--target", type=float, default=STARTUP_TARGET_MS,
+        help=f"Ziel in ms, Exit-Code 1 wenn überschritten (Standard: {STARTUP_TARGET_MS})",
+    )
+    p.set_defaults(func=cmd_bench_startup)
+
+    p = sub.add_parser("publish", help="Daten für die Website unter data/ und .gz/.br-Dateien neu erzeugen")
+    p.add_argument("--packed", action="store_true", help="Rezeptlisten mit Schema-Kopf packen (bis zum nächsten compact)")
+    p.set_defaults(func=cmd_publish)
+
+    p = sub.add_parser("backups", help="Sicherungen auflisten")
+    p.set_defaults(func=cmd_backups)
+
+    p = sub.add_parser("restore", help="Stand einer Sicherung wiederherstellen")
+    p.add_argument("generation", type=int, help="Nummer der Sicherung (siehe backups)")
+    p.add_argument("--file", default="", help="nur dieses Rezept, z. B. recipes/drinks/ThaiIcedTea.html")
+    p.add_argument("--json-only", action="store_true", help="nur recipes.json, keine HTML-Seiten")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("find", help="Rezepte mit einer Kategorie und/oder Zutat auflisten")
+    p.add_argument("--category", default="", help="Kategorie oder Land, z. B. dessert")
+    p.add_argument("--ingredient", default="", help="Zutat, z. B. tomato (findet auch \"Tomatoes (peeled)\")")
+    p.set_defaults(func=cmd_find)
+
+    p = sub.add_parser("db-init", help="SQLite-Datenbank aus recipes.json anlegen und ab jetzt verwenden")
+    p.add_argument("--force", action="store_true", help="bestehende Datenbank aus recipes.json neu aufbauen")
+    p.set_defaults(func=cmd_db_init)
+
+    p = sub.add_parser("db-drop", help="recipes.json aus der Datenbank exportieren und die Datenbank entfernen")
+    p.set_defaults(func=cmd_db_drop)
+
+    p = sub.add_parser("bench-db", help="Öffnen/Suchen/Ändern: recipes.json mit Journal gegen SQLite")
+    p.add_argument("--size", type=int, default=20000, help="Anzahl Rezepte (Standard: 20000)")
+    p.add_argument("-n", "--rounds", type=int, default=100, help="Anzahl Suchen/Änderungen (Standard: 100)")
+    p.set_defaults(func=cmd_bench_db)
+
+    p = sub.add_parser("serve", help="lokaler Webserver mit Cache, ETags, Ranges und vorkomprimierten .br/.gz-Dateien")
+    p.add_argument("-p", "--port", type=int, default=8000, help="Port (Standard: 8000)")
+    p.add_argument("--bind", default="127.0.0.1", help="Adresse (Standard: 127.0.0.1)")
+    p.add_argument("--quiet", action="store_true", help="keine Zeile pro Anfrage ausgeben")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("bench-serve", help="Last-Test: serve gegen python -m http.server")
+    p.add_argument("-c", "--clients", type=int, default=8, help="gleichzeitige Clients (Standard: 8)")
+    p.add_argument("-s", "--seconds", type=float, default=3.0, help="Dauer je Lauf in Sekunden (Standard: 3)")
+    p.set_defaults(func=cmd_bench_serve)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import re
+import unicodedata
+from pathlib import Path
+
+
+# Allowed recipe folders (selectable); "basics" is where the editor puts pages without a folder
+RECIPE_FOLDERS = [
+    "appetizers",
+    "basics",
+    "beef",
+    "breadAndBakedDishes",
+    "cakesAndPastries",
+    "chicken",
+    "dressings-dips-sauces",
+    "drinks",
+    "egg",
+    "fish",
+    "component",
+    "noodle",
+    "otherDesserts",
+    "pork",
+    "potatoe",
+    "rice",
+    "sandwiches",
+    "snacks",
+    "soups",
+    "streetfood",
+    "vegetables",
+]
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+FRACTIONS = {
+    "½": 0.5,
+    "¼": 0.25,
+    "¾": 0.75,
+    "⅓": 1 / 3,
+    "⅔": 2 / 3,
+    "⅕": 0.2,
+    "⅖": 0.4,
+    "⅗": 0.6,
+    "⅘": 0.8,
+    "⅙": 1 / 6,
+    "⅚": 5 / 6,
+    "⅛": 0.125,
+    "⅜": 0.375,
+    "⅝": 0.625,
+    "⅞": 0.875,
+}
+
+
+# --------------------- numbers ---------------------
+
+def to_int(val, default=0):
+    try:
+        return int(str(val).strip())
+    except Exception:
+        return default
+
+
+def clamp(n, lo=0, hi=5):
+    try:
+        n = int(n)
+    except Exception:
+        return lo
+    return max(lo, min(hi, n))
+
+
+def fraction(text: str):
+    # "1/2" -> 0.5; None if it is not one
+    n, _sep, d = text.partition("/")
+    try:
+        return int(n.strip()) / (int(d.strip()) or 1)
+    except ValueError:
+        return None
+
+
+# Accepts comma decimals and fractions like 1/2, 2 1/2, and unicode ½, ¼, ¾, etc.
+def parse_amount(val):
+    s = str(val).strip()
+    if not s:
+        return ""
+    if s in FRACTIONS:
+        return FRACTIONS[s]
+
+    if "/" in s:
+        if " " not in s:
+            # Simple fraction like "1/2"
+            f = fraction(s)
+            if f is not None:
+                return f
+        else:
+            # Mixed number like "2 1/2"
+            parts = s.split()
+            if len(parts) == 2 and "/" in parts[1]:
+                try:
+                    whole = int(parts[0])
+                except ValueError:
+                    whole = None
+                f = fraction(parts[1]) if whole is not None else None
+                if f is not None:
+                    return whole + f
+
+    # Decimal with comma or point
+    try:
+        f = float(s.replace(",", "."))
+    except ValueError:
+        return s  # keep original text if not parseable
+    return int(f) if f.is_integer() else f
+
+
+# --------------------- bitsets ---------------------
+
+def bitset(docs, size: int) -> int:
+    """Bits of the doc ids (bit i = recipe i, byte i // 8 little-endian) as one int."""
+    buf = bytearray((size + 7) // 8)
+    for doc in docs:
+        buf[doc >> 3] |= 1 << (doc & 7)
+    return int.from_bytes(buf, "little")
+
+
+def bit_docs(bits: int) -> list:
+    """Doc ids of the set bits, ascending."""
+    docs = []
+    for i, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+        base = i * 8
+        while byte:
+            low = byte & -byte
+            docs.append(base + low.bit_length() - 1)
+            byte ^= low
+    return docs
+
+
+# --------------------- text ---------------------
+
+def normalize_text(text) -> str:
+    # same as normalizeSearchText() in assets/scripts.js: lower case, accents stripped
+    text = unicodedata.normalize("NFD", str(text).lower())
+    return "".join(ch for ch in text if not "\u0300" <= ch <= "\u036f").strip()
+
+
+def tokenize(text) -> list:
+    return TOKEN_RE.findall(normalize_text(text))
+
+
+# --------------------- paths ---------------------
+
+def normalize_rel_path(path: str) -> str:
+    return str(path).replace("\\", "/").lstrip("./")
+
+
+def derive_rel_file(project_root: Path, html_path: Path) -> str:
+    try:
+        return normalize_rel_path(html_path.resolve().relative_to(project_root.resolve()).as_posix())
+    except Exception:
+        parts = list(html_path.parts)
+        if "recipes" in parts:
+            idx = parts.index("recipes")
+            return normalize_rel_path(Path(*parts[idx:]).as_posix())
+        return normalize_rel_path(html_path.name)
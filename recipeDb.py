@@ -0,0 +1,388 @@
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from atomicFile import write_json_atomic
+from recipeCore import normalize_rel_path
+from recipeIngredients import canonical_ingredient
+from recipePublish import canonical_entry, compress_file, publish_data
+from recipeStore import (
+    COMPACT_THRESHOLD,
+    ConflictError,
+    JSON_INDENT,
+    db_path_for,
+    entry_version,
+    migrate_entry,
+)
+
+
+SCHEMA_VERSION = 3
+# Rows of the change log kept after an export (changed_since() looks back this far)
+CHANGE_LOG = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recipes_position ON recipes (position);
+CREATE INDEX IF NOT EXISTS recipes_file ON recipes (file);
+CREATE INDEX IF NOT EXISTS recipes_title ON recipes (title);
+
+CREATE TABLE IF NOT EXISTS ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_norm TEXT NOT NULL,
+    amount,
+    unit TEXT,
+    link TEXT
+);
+CREATE INDEX IF NOT EXISTS ingredients_recipe ON ingredients (recipe_id);
+CREATE INDEX IF NOT EXISTS ingredients_name ON ingredients (name_norm);
+
+CREATE TABLE IF NOT EXISTS categories (
+    recipe_id INTEGER NOT NULL REFERENCES recipes (id) ON DELETE CASCADE,
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS categories_recipe ON categories (recipe_id);
+CREATE INDEX IF NOT EXISTS categories_category ON categories (category);
+
+-- files of changed recipes, for changed_since(); NULL: all of them (reset)
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    file TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+# --------------------- helpers ---------------------
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    # isolation_level=None: transactions are opened explicitly in RecipeDb.locked()
+    conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    # FULL: every commit is on disk, like an fsync'ed journal append
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', ?)", (SCHEMA_VERSION,))
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('pending', 0)")
+    (version,) = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if version < SCHEMA_VERSION:
+        # version 2 had no ingredient and category tables: fill them from the entries
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM ingredients")
+        conn.execute("DELETE FROM categories")
+        for recipe_id, data in conn.execute("SELECT id, data FROM recipes").fetchall():
+            index_entry(conn, recipe_id, json.loads(data))
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'version'", (SCHEMA_VERSION,))
+        conn.execute("COMMIT")
+    return conn
+
+
+def ingredient_amount(value):
+    # numbers and text as they are, anything else as JSON text
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def insert_entry(conn: sqlite3.Connection, position: int, entry: dict) -> int:
+    cur = conn.execute(
+        "INSERT INTO recipes (position, file, title, data) VALUES (?, ?, ?, ?)",
+        (
+            position,
+            normalize_rel_path(entry.get("file", "")),
+            str(entry.get("title", "")).strip(),
+            json.dumps(entry, ensure_ascii=False),
+        ),
+    )
+    recipe_id = cur.lastrowid
+    index_entry(conn, recipe_id, entry)
+    return recipe_id
+
+
+def index_entry(conn: sqlite3.Connection, recipe_id: int, entry: dict):
+    ingredients = entry.get("ingredients")
+    if isinstance(ingredients, list):
+        conn.executemany(
+            "INSERT INTO ingredients (recipe_id, position, name, name_norm, amount, unit, link) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    recipe_id, i, str(ing.get("name", "")), canonical_ingredient(ing.get("name", "")),
+                    ingredient_amount(ing.get("amount")), ing.get("unit"), ing.get("link"),
+                )
+                for i, ing in enumerate(ingredients) if isinstance(ing, dict)
+            ],
+        )
+    categories = entry.get("categories")
+    if isinstance(categories, list):
+        conn.executemany(
+            "INSERT INTO categories (recipe_id, category) VALUES (?, ?)",
+            [(recipe_id, str(c)) for c in categories],
+        )
+
+
+def create_database(db_path: Path, entries: list):
+    """Builds a database from entries next to db_path and moves it in place in one step."""
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    for path in (tmp, Path(str(tmp) + "-wal"), Path(str(tmp) + "-shm")):
+        if path.exists():
+            path.unlink()
+
+    conn = connect(tmp)
+    try:
+        conn.execute("BEGIN")
+        for position, entry in enumerate(e for e in entries if isinstance(e, dict)):
+            insert_entry(conn, position, migrate_entry(entry))
+        conn.execute("COMMIT")
+        # fold the WAL back in, so the single file can be renamed
+        conn.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn.close()
+    os.replace(tmp, db_path)
+
+
+# --------------------- store ---------------------
+
+class RecipeDb:
+    """SQLite alternative to RecipeStore, used when recipes.sqlite exists.
+
+    The database is the catalogue; recipes.json (and the website data) is an
+    export of it, rewritten after ``compact_threshold`` changes or by
+    compact(). Lookups by file, title, category and ingredient use the
+    indexes instead of loading every entry, and every write is one
+    transaction, so tools in several processes never lose each other's
+    changes. The interface is the one of RecipeStore.
+    """
+
+    def __init__(self, json_path: Path, compact_threshold: int = COMPACT_THRESHOLD):
+        self.json_path = Path(json_path)
+        self.db_path = db_path_for(self.json_path)
+        # where changes are written until the next export (shown by the tools)
+        self.location = self.db_path
+        self.compact_threshold = compact_threshold
+        self.conn = connect(self.db_path)
+        self.lock_depth = 0
+        self.closed = False
+
+    def close(self):
+        self.conn.close()
+        self.closed = True
+
+    # ---------- locking ----------
+    @contextmanager
+    def locked(self):
+        """A write transaction; re-entrant, committed when the outermost block ends."""
+        if self.lock_depth == 0:
+            self.conn.execute("BEGIN IMMEDIATE")
+        self.lock_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.lock_depth -= 1
+            if self.lock_depth == 0:
+                self.conn.execute("ROLLBACK")
+            raise
+        self.lock_depth -= 1
+        if self.lock_depth == 0:
+            self.conn.execute("COMMIT")
+
+    # ---------- reading ----------
+    def refresh(self):
+        # every query reads the current database
+        pass
+
+    @property
+    def journal_len(self) -> int:
+        """Changes not exported to recipes.json yet."""
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'pending'").fetchone()[0]
+
+    def find(self, rel_file: str, title: str = ""):
+        row = self.conn.execute(
+            "SELECT id, data FROM recipes WHERE file = ? ORDER BY position LIMIT 1",
+            (normalize_rel_path(rel_file),),
+        ).fetchone()
+
+        title_norm = str(title).strip()
+        if row is None and title_norm:
+            row = self.conn.execute(
+                "SELECT id, data FROM recipes WHERE title = ? ORDER BY position LIMIT 1",
+                (title_norm,),
+            ).fetchone()
+
+        if row is None:
+            return None, None
+        return row[0], json.loads(row[1])
+
+    def recipes(self) -> list:
+        return [json.loads(data) for (data,) in self.conn.execute("SELECT data FROM recipes ORDER BY position")]
+
+    def with_category(self, category: str) -> list:
+        return [json.loads(data) for (data,) in self.conn.execute(
+            "SELECT data FROM recipes WHERE id IN (SELECT recipe_id FROM categories WHERE category = ?) "
+            "ORDER BY position",
+            (category,),
+        )]
+
+    def with_ingredient(self, name: str) -> list:
+        """Recipes using an ingredient, by its canonical name ("Tomatoes (peeled)" finds "tomato")."""
+        return [json.loads(data) for (data,) in self.conn.execute(
+            "SELECT data FROM recipes WHERE id IN (SELECT recipe_id FROM ingredients WHERE name_norm = ?) "
+            "ORDER BY position",
+            (canonical_ingredient(name),),
+        )]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    # ---------- changes ----------
+    def change_mark(self) -> dict:
+        """Where the catalogue is now, for changed_since()."""
+        row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+        return {"seq": row[0] if row else 0}
+
+    def changed_since(self, mark) -> set | None:
+        """Files of the recipes changed since change_mark() returned mark.
+
+        None if that can no longer be told: the log was trimmed past it, or
+        the catalogue was replaced by reset().
+        """
+        seq = mark.get("seq") if isinstance(mark, dict) else None
+        if not isinstance(seq, int) or seq > self.change_mark()["seq"]:
+            return None
+        (oldest,) = self.conn.execute("SELECT MIN(seq) FROM changes").fetchone()
+        if oldest is not None and oldest > seq + 1:
+            return None
+        files = [file for (file,) in self.conn.execute("SELECT file FROM changes WHERE seq > ?", (seq,))]
+        return None if None in files else set(files)
+
+    def log_change(self, recipe_id: int):
+        self.conn.execute("INSERT INTO changes (file) SELECT file FROM recipes WHERE id = ?", (recipe_id,))
+
+    # ---------- applying ----------
+    def insert(self, entry: dict):
+        (position,) = self.conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM recipes").fetchone()
+        self.log_change(insert_entry(self.conn, position, entry))
+
+    def replace(self, recipe_id: int, entry: dict):
+        self.log_change(recipe_id)
+        self.conn.execute(
+            "UPDATE recipes SET file = ?, title = ?, data = ? WHERE id = ?",
+            (
+                normalize_rel_path(entry.get("file", "")),
+                str(entry.get("title", "")).strip(),
+                json.dumps(entry, ensure_ascii=False),
+                recipe_id,
+            ),
+        )
+        self.conn.execute("DELETE FROM ingredients WHERE recipe_id = ?", (recipe_id,))
+        self.conn.execute("DELETE FROM categories WHERE recipe_id = ?", (recipe_id,))
+        index_entry(self.conn, recipe_id, entry)
+        self.log_change(recipe_id)
+
+    def apply(self, record: dict):
+        # same rules as RecipeStore.apply
+        op = record.get("op")
+        entry = record.get("entry")
+
+        if op == "add" and isinstance(entry, dict):
+            recipe_id, _existing = self.find(entry.get("file", ""))
+            if recipe_id is None:
+                self.insert(migrate_entry(entry))
+            else:
+                self.replace(recipe_id, migrate_entry(entry))
+
+        elif op == "update" and isinstance(entry, dict):
+            recipe_id, _existing = self.find(record.get("file", ""), record.get("title", ""))
+            if recipe_id is None:
+                recipe_id, _existing = self.find(entry.get("file", ""), entry.get("title", ""))
+            if recipe_id is None:
+                self.insert(migrate_entry(entry))
+            else:
+                self.replace(recipe_id, migrate_entry(entry))
+
+        elif op == "delete":
+            recipe_id, _existing = self.find(record.get("file", ""), record.get("title", ""))
+            if recipe_id is not None:
+                self.log_change(recipe_id)
+                self.conn.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
+
+    def check_version(self, record: dict, expected_version: str):
+        _id, current = self.find(record.get("file", ""), record.get("title", ""))
+        if current is None:
+            raise ConflictError(f"{record.get('file') or record.get('title')} wurde inzwischen gelöscht")
+        if entry_version(current) != expected_version:
+            raise ConflictError(f"{record.get('file') or record.get('title')} wurde inzwischen geändert")
+
+    def append(self, record: dict, expected_version: str | None = None):
+        with self.locked():
+            if expected_version is not None:
+                self.check_version(record, expected_version)
+            self.apply(record)
+            self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'pending'")
+
+            if self.compact_threshold and self.journal_len >= self.compact_threshold:
+                self.write_snapshot()
+
+    # ---------- writing ----------
+    def add(self, entry: dict):
+        self.append({"op": "add", "entry": entry})
+
+    def update(self, entry: dict, rel_file: str = "", title: str = "", expected_version: str | None = None):
+        self.append({
+            "op": "update",
+            "file": normalize_rel_path(rel_file or entry.get("file", "")),
+            "title": str(title or entry.get("title", "")).strip(),
+            "entry": entry,
+        }, expected_version)
+
+    def delete(self, rel_file: str, title: str = "", expected_version: str | None = None):
+        self.append({
+            "op": "delete",
+            "file": normalize_rel_path(rel_file),
+            "title": str(title).strip(),
+        }, expected_version)
+
+    def apply_batch(self, records: list):
+        """Apply many records in one transaction and export recipes.json once."""
+        with self.locked():
+            for record in records:
+                self.apply(record)
+            self.write_snapshot()
+
+    def reset(self, entries: list):
+        """Replace the whole catalogue (restoring a backup) and export recipes.json."""
+        with self.locked():
+            self.conn.execute("DELETE FROM recipes")
+            self.conn.execute("INSERT INTO changes (file) VALUES (NULL)")
+            for position, entry in enumerate(e for e in entries if isinstance(e, dict)):
+                insert_entry(self.conn, position, migrate_entry(entry))
+            self.write_snapshot()
+
+    def compact(self):
+        """Export the database to recipes.json and the website data."""
+        with self.locked():
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        # caller holds the transaction: if the export fails, the changes are rolled back
+        # with it instead of sitting in the database without ever reaching recipes.json
+        entries = self.recipes()
+        write_json_atomic(self.json_path, [canonical_entry(e) for e in entries], indent=JSON_INDENT)
+        compress_file(self.json_path)
+        self.conn.execute("UPDATE meta SET value = 0 WHERE key = 'pending'")
+        self.conn.execute("DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?", (CHANGE_LOG,))
+        publish_data(self.json_path.parent, entries)
@@ -0,0 +1,186 @@
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+from recipeCore import TOKEN_RE, normalize_text
+
+
+INGREDIENTS_VERSION = 1
+
+# "(...)" notes, innermost first so nested ones go too
+NOTE_RE = re.compile(r"\([^()]*\)")
+# "oil for frying", "flour when cutting the biscuits"
+PURPOSE_RE = re.compile(r"\s(?:for|when)\s.*$")
+
+IRREGULAR = {"leaves": "leaf", "leave": "leaf"}
+
+
+# --------------------- names ---------------------
+
+def singular(word: str) -> str:
+    # rough English plural -> singular; good enough to merge "tomato" and "tomatoes"
+    if word in IRREGULAR:
+        return IRREGULAR[word]
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def word_forms(word: str) -> set:
+    """The word and its singular forms, for matching.
+
+    The singular alone is not enough: "cookies" -> "cooky" would no longer
+    start with "cookie", and "pies" -> "py" not with "pie".
+    """
+    forms = {word, singular(word)}
+    if len(word) > 3 and word.endswith("ies"):
+        forms.add(word[:-1])
+    return forms
+
+
+def strip_notes(text: str) -> str:
+    while True:
+        stripped = NOTE_RE.sub(" ", text)
+        if stripped == text:
+            break
+        text = stripped
+    # an unclosed "(" still starts a note
+    return text.split("(", 1)[0]
+
+
+def canonical_ingredient(name) -> str:
+    """Dictionary key of an ingredient name.
+
+    Lower case without accents, notes in parentheses and "for ..." /
+    "when ..." purposes dropped, hyphens treated as spaces and the last word
+    made singular: "Tomatoes (peeled)" and "tomato" are both "tomato".
+    Groups the spellings of the ingredient dictionary.
+    """
+    words = ingredient_words(name)
+    if words:
+        words[-1] = singular(words[-1])
+    return " ".join(words)
+
+
+def ingredient_words(name) -> list[str]:
+    """Words of an ingredient name as written: normalised, without notes and purposes.
+
+    Same as ingredientWords() in assets/scripts.js.
+    """
+    return TOKEN_RE.findall(PURPOSE_RE.sub("", strip_notes(normalize_text(name))))
+
+
+def ingredient_label(name) -> str:
+    # how the name is shown in suggestions: as written, without the notes
+    return " ".join(strip_notes(str(name)).split()).strip(" ,.;:")
+
+
+def ingredient_matches(term_words: list, name_words: list) -> bool:
+    """Filter rule: every word of the term starts a word of the ingredient name.
+
+    Both are ingredient_words(); a word counts in any of its word_forms().
+    """
+    names = {form for w in name_words for form in word_forms(w)}
+    return all(any(n.startswith(t) for t in word_forms(term) for n in names) for term in term_words)
+
+
+# --------------------- dictionary ---------------------
+
+def collect_ingredients(entries: list) -> dict:
+    """canonical name -> {"docs": [positions], "names": Counter of names as written}."""
+    found = {}
+    for doc, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        for ing in entry.get("ingredients", []) or []:
+            if not isinstance(ing, dict):
+                continue
+            raw = str(ing.get("name", "")).strip()
+            key = canonical_ingredient(raw)
+            if not key:
+                continue
+            item = found.setdefault(key, {"docs": [], "names": Counter()})
+            if not item["docs"] or item["docs"][-1] != doc:
+                item["docs"].append(doc)
+            item["names"][raw] += 1
+    return found
+
+
+def build_ingredient_dictionary(entries: list) -> dict:
+    """The published ingredient dictionary (data/ingredients.json).
+
+    One item per canonical name with the label to suggest (the most used
+    spelling without notes), every spelling seen and the number of recipes.
+    """
+    items = []
+    for key, item in sorted(collect_ingredients(entries).items()):
+        labels = Counter()
+        for raw, n in item["names"].items():
+            label = ingredient_label(raw)
+            if label:
+                labels[label] += n
+        label = min(labels, key=lambda lb: (-labels[lb], len(lb), lb.casefold())) if labels else key
+        items.append({
+            "name": key,
+            "label": label,
+            "aliases": sorted(item["names"], key=str.casefold),
+            "recipes": len(item["docs"]),
+        })
+    return {"version": INGREDIENTS_VERSION, "count": len(items), "ingredients": items}
+
+
+def build_ingredient_index(entries: list) -> tuple[list, list, list]:
+    """(names, docs per name, [word, name ids] sorted by word) for the search index.
+
+    A filter term then is a range lookup per word (all words starting with
+    it) instead of a scan over every ingredient of every recipe. The words
+    are the word_forms() of every spelling, so a term matches them as in
+    ingredient_matches().
+    """
+    found = sorted(collect_ingredients(entries).items())
+    names = [key for key, _item in found]
+    docs = [item["docs"] for _key, item in found]
+
+    words = {}
+    for name_id, (key, item) in enumerate(found):
+        forms = {form for raw in item["names"] for w in ingredient_words(raw) for form in word_forms(w)}
+        for word in forms | set(key.split()):
+            words.setdefault(word, []).append(name_id)
+    return names, docs, [[word, ids] for word, ids in sorted(words.items())]
+
+
+def load_ingredient_labels(json_path: Path, store=None) -> list[str]:
+    """Suggestions for the ingredient fields, most used first.
+
+    Read from the published dictionary; if there is none yet, built from
+    the recipes in store (or recipes.json).
+    """
+    # imported here: recipePublish imports this module
+    from recipePublish import DATA_DIR, INGREDIENTS_NAME, load_data_manifest
+
+    data_dir = Path(json_path).parent / DATA_DIR
+    name = load_data_manifest(data_dir).get(INGREDIENTS_NAME)
+    dictionary = None
+    if name:
+        try:
+            with (data_dir / name).open("r", encoding="utf-8") as f:
+                dictionary = json.load(f)
+        except (OSError, ValueError):
+            dictionary = None
+
+    if not isinstance(dictionary, dict) or dictionary.get("version") != INGREDIENTS_VERSION:
+        from recipeStore import open_store
+        opened = open_store(json_path, store, compact_threshold=0)
+        dictionary = build_ingredient_dictionary(opened.recipes())
+        if opened is not store:
+            opened.close()
+
+    items = sorted(dictionary["ingredients"], key=lambda it: (-it["recipes"], it["label"].casefold()))
+    return [it["label"] for it in items]
@@ -0,0 +1,373 @@
+from html import unescape
+from html.parser import HTMLParser
+
+from recipeCore import parse_amount, to_int
+
+
+INTERNAL_DIFF = {"easy": "easy", "medium": "medium", "hard": "hard"}
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+class UnknownMarkup(Exception):
+    """The page does not look like one written by render_page."""
+
+
+# --------------------- helpers ---------------------
+
+def count_stars(text):
+    return str(text).count("★")
+
+
+def parse_minutes_from_text(text):
+    text = str(text).strip()
+    digits = ""
+    for ch in text:
+        if ch.isdigit():
+            digits += ch
+        elif digits:
+            break
+    return to_int(digits, 0)
+
+
+def joined_text(parts: list) -> str:
+    # same as BeautifulSoup's get_text(" ", strip=True)
+    return " ".join(p.strip() for p in parts if p.strip())
+
+
+# --------------------- instructions only ---------------------
+
+class InstructionsParser(HTMLParser):
+    """Collects the text of every <li> in ol.list-group-numbered."""
+
+    def __init__(self):
+        super().__init__()
+        self.in_list = False
+        self.current = None
+        self.steps = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "ol" and "list-group-numbered" in (dict(attrs).get("class") or "").split():
+            self.in_list = True
+        elif tag == "li" and self.in_list:
+            self.current = []
+
+    def handle_endtag(self, tag):
+        if tag == "li" and self.current is not None:
+            text = joined_text(self.current)
+            if text:
+                self.steps.append(text)
+            self.current = None
+        elif tag == "ol":
+            self.in_list = False
+
+    def handle_data(self, data):
+        if self.current is not None:
+            self.current.append(data)
+
+
+def extract_instructions(html: str) -> list[str]:
+    parser = InstructionsParser()
+    parser.feed(html)
+    parser.close()
+    return parser.steps
+
+
+# --------------------- full recipe page ---------------------
+
+class RecipePageParser(HTMLParser):
+    """Single pass over a recipe page, collecting everything parse_html_recipe needs.
+
+    Each open element is a frame on a stack; frames that need their text
+    ("captures") receive every data chunk until they are closed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []
+        self.captures = []
+        self.open_tags = {}
+        self.open_roles = {}
+
+        self.sections = set()
+        self.title = None
+        self.image = None
+        self.categories = []
+        self.source = ""
+        self.source_found = False
+        self.cards = {}
+        self.pending_label = None
+        self.times = {}
+        self.ingredients = []
+        self.instructions = []
+        self.found_ingredients_list = False
+        self.found_instructions_list = False
+
+    # ---------- context ----------
+    def inside(self, role: str) -> bool:
+        return self.open_roles.get(role, 0) > 0
+
+    def nearest(self, role: str):
+        if not self.inside(role):
+            return None
+        for frame in reversed(self.stack):
+            if frame["role"] == role:
+                return frame
+        return None
+
+    def capture(self, frame: dict):
+        frame["text"] = []
+        self.captures.append(frame)
+
+    # ---------- events ----------
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        cls = set(attrs.get("class", "").split())
+        frame = {"tag": tag, "cls": cls, "attrs": attrs, "role": None, "text": None}
+        parent = self.stack[-1] if self.stack else None
+
+        if tag == "section" and "overview-section" in cls:
+            frame["role"] = "overview"
+            self.sections.add("overview")
+        elif tag == "section" and "ingredients-section" in cls:
+            frame["role"] = "ingredients"
+            self.sections.add("ingredients")
+        elif self.inside("overview"):
+            self.start_overview(tag, cls, attrs, frame)
+        elif self.inside("ingredients"):
+            self.start_ingredients(tag, cls, attrs, frame, parent)
+
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(frame)
+        self.open_tags[tag] = self.open_tags.get(tag, 0) + 1
+        if frame["role"] is not None:
+            self.open_roles[frame["role"]] = self.open_roles.get(frame["role"], 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if not self.open_tags.get(tag):
+            return
+        while self.stack:
+            frame = self.stack.pop()
+            self.open_tags[frame["tag"]] -= 1
+            if frame["text"] is not None:
+                self.captures.remove(frame)
+            if frame["role"] is not None:
+                self.open_roles[frame["role"]] -= 1
+                self.end_frame(frame)
+            if frame["tag"] == tag:
+                break
+
+    def handle_data(self, data):
+        for frame in self.captures:
+            frame["text"].append(data)
+
+    # ---------- overview ----------
+    def start_overview(self, tag, cls, attrs, frame):
+        if tag == "h1" and self.title is None:
+            frame["role"] = "title"
+            self.capture(frame)
+        elif tag == "img" and "overview-img" in cls and self.image is None:
+            self.image = attrs.get("src", "").strip()
+        elif "badge" in cls:
+            frame["role"] = "badge"
+            self.capture(frame)
+        elif "text-muted" in cls:
+            frame["role"] = "card-label"
+            self.capture(frame)
+        elif tag == "span" and self.pending_label is not None:
+            frame["role"] = "card-value"
+            self.capture(frame)
+        elif tag == "a" and "href" in attrs and not self.source_found:
+            href = attrs["href"].strip()
+            if href.startswith("http://") or href.startswith("https://"):
+                self.source = href
+                self.source_found = True
+            else:
+                frame["role"] = "source-link"
+                self.capture(frame)
+
+    # ---------- ingredients section ----------
+    def start_ingredients(self, tag, cls, attrs, frame, parent):
+        time_item = self.nearest("time-item")
+        ing_li = self.nearest("ing-li")
+
+        if tag == "div" and "time-item" in cls:
+            frame["role"] = "time-item"
+            frame["label"] = frame["value"] = None
+        elif time_item is not None:
+            if "text-muted" in cls and time_item["label"] is None:
+                frame["role"] = "time-label"
+                self.capture(frame)
+            elif tag == "span" and time_item["value"] is None:
+                frame["role"] = "time-value"
+                self.capture(frame)
+        elif tag == "ul" and attrs.get("id") == "ingredients":
+            frame["role"] = "ing-list"
+            self.found_ingredients_list = True
+        elif tag == "li" and parent is not None and parent["role"] == "ing-list":
+            frame["role"] = "ing-li"
+            frame["amount"] = frame["unit"] = frame["ingredient"] = None
+            frame["link"] = ""
+            self.capture(frame)
+        elif ing_li is not None:
+            if "amount" in cls and ing_li["amount"] is None:
+                frame["role"] = "amount"
+                ing_li["amount"] = attrs.get("data-basis", "").strip()
+                self.capture(frame)
+            elif "unit" in cls and ing_li["unit"] is None:
+                frame["role"] = "unit"
+                ing_li["unit"] = attrs.get("data-basis", "").strip()
+                self.capture(frame)
+            elif "ingredient" in cls and ing_li["ingredient"] is None:
+                frame["role"] = "ingredient"
+                ing_li["ingredient"] = ""
+                if tag == "a":
+                    ing_li["link"] = attrs.get("href", "").strip()
+                self.capture(frame)
+            elif tag == "a" and "href" in attrs and not ing_li["link"] and self.inside("ingredient"):
+                ing_li["link"] = attrs["href"].strip()
+        elif tag == "ol" and "list-group-numbered" in cls:
+            frame["role"] = "steps"
+            self.found_instructions_list = True
+        elif tag == "li" and parent is not None and parent["role"] == "steps":
+            frame["role"] = "step"
+            self.capture(frame)
+
+    # ---------- closing ----------
+    def end_frame(self, frame):
+        role = frame["role"]
+        text = joined_text(frame["text"]) if frame["text"] is not None else ""
+
+        if role == "title":
+            self.title = text
+        elif role == "badge":
+            if text:
+                self.categories.append(text)
+        elif role == "card-label":
+            self.pending_label = text.lower()
+        elif role == "card-value":
+            self.cards.setdefault(self.pending_label, text)
+            self.pending_label = None
+        elif role == "source-link":
+            if text.startswith("http://") or text.startswith("https://"):
+                self.source = text
+                self.source_found = True
+        elif role == "time-item":
+            if frame["label"] is not None and frame["value"] is not None:
+                self.times[frame["label"]] = frame["value"]
+        elif role == "time-label":
+            self.nearest("time-item")["label"] = text.lower()
+        elif role == "time-value":
+            self.nearest("time-item")["value"] = text
+        elif role == "amount":
+            li = self.nearest("ing-li")
+            li["amount"] = li["amount"] or text
+        elif role == "unit":
+            li = self.nearest("ing-li")
+            li["unit"] = li["unit"] or text
+        elif role == "ingredient":
+            self.nearest("ing-li")["ingredient"] = text
+        elif role == "ing-li":
+            self.end_ingredient(frame, text)
+        elif role == "step":
+            text = unescape(text).strip()
+            if text:
+                self.instructions.append(text)
+
+    def end_ingredient(self, li, text):
+        if li["ingredient"] is None:
+            text = unescape(text)
+            if text:
+                self.ingredients.append({"name": text})
+            return
+
+        ingredient = {"name": unescape(li["ingredient"]).strip()}
+        if li["amount"] is not None:
+            parsed = parse_amount(li["amount"])
+            if parsed != "":
+                ingredient["amount"] = parsed
+        if li["unit"]:
+            ingredient["unit"] = unescape(li["unit"])
+        if li["link"]:
+            ingredient["link"] = li["link"]
+        self.ingredients.append(ingredient)
+
+
+def parse_recipe_html(html: str) -> tuple[dict, list[str]]:
+    """Fast path for parse_html_recipe; raises UnknownMarkup for pages it does not recognise."""
+    parser = RecipePageParser()
+    parser.feed(html)
+    parser.close()
+
+    if (
+        parser.sections != {"overview", "ingredients"}
+        or parser.title is None
+        or not parser.found_ingredients_list
+        or not parser.found_instructions_list
+    ):
+        raise UnknownMarkup("recipe page structure not recognised")
+
+    active = parse_minutes_from_text(parser.times.get("active time", 0))
+    passive = parse_minutes_from_text(parser.times.get("passive time", 0))
+    total = parse_minutes_from_text(parser.times.get("total time", 0))
+    originality = count_stars(parser.cards.get("originality", ""))
+    taste = count_stars(parser.cards.get("taste", ""))
+
+    data = {
+        "title": parser.title or "Recipe",
+        "categories": parser.categories,
+        "activeTime": active,
+        "passiveTime": passive,
+        "totalTime": total if total else active + passive,
+        "difficulty": INTERNAL_DIFF.get(parser.cards.get("difficulty", "").strip().lower(), "easy"),
+        "originality": originality if originality else 5,
+        "taste": taste if taste else 5,
+        "source": parser.source,
+        "ingredients": parser.ingredients,
+        "image": parser.image or "",
+    }
+    return data, parser.instructions
+
+
+# --------------------- merging ---------------------
+
+def merge_recipe_data(html_data: dict, json_entry: dict | None, rel_file: str) -> dict:
+    base = {
+        "title": "Recipe",
+        "categories": [],
+        "activeTime": 0,
+        "passiveTime": 0,
+        "totalTime": 0,
+        "servings": 2,
+        "difficulty": "easy",
+        "originality": 5,
+        "taste": 5,
+        "status": "",
+        "source": "",
+        "ingredients": [],
+        "image": "",
+        "file": rel_file,
+    }
+
+    if json_entry:
+        for k, v in json_entry.items():
+            base[k] = v
+
+    for k, v in html_data.items():
+        if k == "ingredients":
+            base[k] = v
+        elif v not in ("", [], None):
+            base[k] = v
+
+    base["file"] = rel_file
+
+    if not base.get("totalTime"):
+        base["totalTime"] = to_int(base.get("activeTime", 0)) + to_int(base.get("passiveTime", 0))
+
+    return base
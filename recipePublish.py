@@ -0,0 +1,486 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from atomicFile import write_atomic
+from recipeCore import bitset, normalize_text, tokenize
+from recipeIngredients import build_ingredient_dictionary, build_ingredient_index
+from recipeTemplate import get_category_badge
+
+try:
+    import brotli
+except ImportError:
+    # optional; without it only .gz siblings are written
+    brotli = None
+
+
+# Published data for the website, next to recipes.json
+DATA_DIR = "data"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+RECIPES_NAME = "recipes.json"
+SUMMARY_NAME = "summary.json"
+SHARD_DIR = "categories"
+INSTRUCTIONS_DIR = "instructions"
+SEARCH_INDEX_NAME = "search-index.json"
+SEARCH_INDEX_VERSION = 3
+INGREDIENTS_NAME = "ingredients.json"
+FACETS_NAME = "facets.json"
+FACETS_VERSION = 1
+# categories with this badge (recipeTemplate.CATEGORIE_BADGE) are countries
+COUNTRY_BADGE = "bg-country"
+FACET_GROUPS = ("category", "country", "difficulty", "status")
+
+HASH_LEN = 10
+
+# Precompressed siblings (<file>.gz / <file>.br) for static file servers
+COMPRESS_SUFFIXES = {".html", ".json", ".js", ".css", ".svg", ".txt"}
+COMPRESS_MIN_SIZE = 512
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+SITE_GLOBS = ("*.html", "*.css", "recipes.json", "assets/*", "partials/*", "recipes/**/*.html", "data/**/*.json")
+
+# Key order of a recipe as addRecipes writes it; keeps output (and hashes) stable
+RECIPE_FIELDS = (
+    "title",
+    "categories",
+    "activeTime",
+    "passiveTime",
+    "totalTime",
+    "servings",
+    "difficulty",
+    "originality",
+    "taste",
+    "status",
+    "source",
+    "ingredients",
+    "image",
+    "file",
+)
+INGREDIENT_FIELDS = ("name", "amount", "unit", "link")
+PACKED_VERSION = 1
+
+# What the recipe cards, the navbar search and search.html render
+SUMMARY_FIELDS = (
+    "title",
+    "file",
+    "image",
+    "categories",
+    "difficulty",
+    "activeTime",
+    "passiveTime",
+    "totalTime",
+)
+
+
+# --------------------- helpers ---------------------
+
+def category_key(category) -> str:
+    # same as toKey() in assets/scripts.js
+    return str(category).strip().lower()
+
+
+def category_slug(category) -> str:
+    # same as categorySlug() in assets/constants.js
+    return re.sub(r"[^a-z0-9]+", "-", category_key(category)).strip("-") or "uncategorized"
+
+
+def dump_json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, data)
+    compress_file(path, data)
+    return True
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    # summary.json -> summary.<hash>.json
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha1(data).hexdigest()[:HASH_LEN]}{suffix}"
+
+
+def load_data_manifest(data_dir: Path) -> dict:
+    try:
+        with (data_dir / MANIFEST_NAME).open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    files = manifest.get("files") if isinstance(manifest, dict) else None
+    return files if isinstance(files, dict) else {}
+
+
+def summarize(entry: dict) -> dict:
+    return {k: entry[k] for k in SUMMARY_FIELDS if k in entry}
+
+
+# --------------------- key order / packing ---------------------
+
+def field_order(records, fields) -> list:
+    # known fields in their usual order, anything else sorted behind them
+    present = set()
+    for r in records:
+        present.update(r)
+    return [f for f in fields if f in present] + sorted(present.difference(fields))
+
+
+def ordered(record: dict, fields) -> dict:
+    return {k: record[k] for k in field_order([record], fields)}
+
+
+def canonical_entry(entry: dict) -> dict:
+    """The entry with a fixed key order, also inside its ingredients."""
+    entry = ordered(entry, RECIPE_FIELDS)
+    if isinstance(entry.get("ingredients"), list):
+        entry["ingredients"] = [
+            ordered(ing, INGREDIENT_FIELDS) if isinstance(ing, dict) else ing
+            for ing in entry["ingredients"]
+        ]
+    return entry
+
+
+def pack_records(records: list) -> dict:
+    """Columnar form with a schema header instead of repeating every key:
+
+        {"packed": 1, "fields": [...], "ingredientFields": [...], "rows": [[...], ...]}
+
+    Missing values become null (so a null value is dropped on unpacking).
+    Ingredients are packed the same way. unpackRecords() in assets/scripts.js
+    and unpack_records() below reverse it.
+    """
+    fields = field_order(records, RECIPE_FIELDS)
+    ingredients = [
+        ing for r in records
+        for ing in (r.get("ingredients") if isinstance(r.get("ingredients"), list) else [])
+        if isinstance(ing, dict)
+    ]
+    ingredient_fields = field_order(ingredients, INGREDIENT_FIELDS)
+
+    def row(record: dict, names: list) -> list:
+        return [record.get(name) for name in names]
+
+    rows = []
+    for r in records:
+        values = row(r, fields)
+        if isinstance(r.get("ingredients"), list):
+            values[fields.index("ingredients")] = [
+                row(ing, ingredient_fields) if isinstance(ing, dict) else ing
+                for ing in r["ingredients"]
+            ]
+        rows.append(values)
+
+    packed = {"packed": PACKED_VERSION, "fields": fields}
+    if ingredient_fields:
+        packed["ingredientFields"] = ingredient_fields
+    packed["rows"] = rows
+    return packed
+
+
+def unpack_records(data) -> list:
+    if not isinstance(data, dict) or "rows" not in data:
+        return data
+
+    def record(values: list, names: list) -> dict:
+        return {name: v for name, v in zip(names, values) if v is not None}
+
+    records = []
+    for values in data["rows"]:
+        r = record(values, data["fields"])
+        if isinstance(r.get("ingredients"), list):
+            r["ingredients"] = [
+                record(ing, data.get("ingredientFields", [])) if isinstance(ing, list) else ing
+                for ing in r["ingredients"]
+            ]
+        records.append(r)
+    return records
+
+
+def encode_records(records: list, pack: bool) -> bytes:
+    return dump_json(pack_records(records) if pack else records)
+
+
+# --------------------- compression ---------------------
+
+def compress(data: bytes, ext: str):
+    if ext == ".gz":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if ext == ".br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def sibling_path(path: Path, ext: str) -> Path:
+    return path.with_name(path.name + ext)
+
+
+def is_fresh(path: Path, sibling: Path) -> bool:
+    # siblings carry the mtime of their source, see compress_file
+    try:
+        return sibling.stat().st_mtime_ns == path.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def compress_file(path: Path, data: bytes | None = None) -> int:
+    """Writes <path>.gz and <path>.br (if brotli is installed) next to path.
+
+    Siblings that would not be smaller than the file are removed instead.
+    Returns the number of siblings written.
+    """
+    path = Path(path)
+    if path.suffix not in COMPRESS_SUFFIXES:
+        return 0
+    if data is None:
+        data = path.read_bytes()
+    st = path.stat()
+
+    written = 0
+    for _encoding, ext in ENCODINGS:
+        sibling = sibling_path(path, ext)
+        packed = compress(data, ext) if len(data) >= COMPRESS_MIN_SIZE else None
+        if packed is None or len(packed) >= len(data):
+            sibling.unlink(missing_ok=True)
+            continue
+        write_atomic(sibling, packed)
+        os.utime(sibling, ns=(st.st_atime_ns, st.st_mtime_ns))
+        written += 1
+    return written
+
+
+def remove_file(path: Path):
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    for _encoding, ext in ENCODINGS:
+        sibling_path(path, ext).unlink(missing_ok=True)
+
+
+def compress_tree(root: Path) -> dict:
+    """(Re)compresses every site file whose siblings are missing or stale and
+    removes siblings whose file is gone."""
+    root = Path(root)
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+    wanted_exts = [ext for _encoding, ext in ENCODINGS if ext == ".gz" or brotli is not None]
+    for pattern in SITE_GLOBS:
+        for path in root.glob(pattern):
+            if not path.is_file() or path.suffix not in COMPRESS_SUFFIXES:
+                continue
+            if path.stat().st_size < COMPRESS_MIN_SIZE or all(
+                is_fresh(path, sibling_path(path, ext)) for ext in wanted_exts
+            ):
+                stats["unchanged"] += 1
+            else:
+                stats["written"] += compress_file(path)
+
+    for _encoding, ext in ENCODINGS:
+        for pattern in SITE_GLOBS:
+            for sibling in root.glob(pattern + ext):
+                if not sibling.with_suffix("").exists():
+                    sibling.unlink()
+                    stats["removed"] += 1
+
+    return stats
+
+
+# --------------------- publishing ---------------------
+
+def instructions_path(root: Path, rel_file: str) -> Path:
+    # recipes/<folder>/<name>.html -> data/instructions/recipes/<folder>/<name>.json
+    return Path(root) / DATA_DIR / INSTRUCTIONS_DIR / Path(rel_file).with_suffix(".json")
+
+
+def publish_instructions(root: Path, rel_file: str, instructions: list) -> bool:
+    """Writes the steps of one page for recipeScaler.html; False if nothing changed."""
+    return write_if_changed(instructions_path(root, rel_file), dump_json(list(instructions)))
+
+
+def load_instructions(root: Path, rel_file: str) -> list:
+    """The published steps of one page; [] if there are none."""
+    try:
+        with instructions_path(root, rel_file).open("r", encoding="utf-8") as f:
+            steps = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return [str(s) for s in steps] if isinstance(steps, list) else []
+
+
+def remove_instructions(root: Path, rel_file: str) -> bool:
+    path = instructions_path(root, rel_file)
+    if not path.exists():
+        return False
+    remove_file(path)
+    return True
+
+
+def prune_instructions(root: Path, rel_files) -> int:
+    """Removes instruction files of pages that are no longer in rel_files."""
+    base = Path(root) / DATA_DIR / INSTRUCTIONS_DIR
+    if not base.exists():
+        return 0
+    keep = {instructions_path(root, f) for f in rel_files}
+    removed = 0
+    for path in base.rglob("*.json"):
+        if path not in keep:
+            remove_file(path)
+            removed += 1
+    return removed
+
+
+def build_shards(summary: list) -> dict:
+    shards = {}
+    for item in summary:
+        slugs = []
+        for c in item.get("categories", []) or []:
+            slug = category_slug(c)
+            if slug not in slugs:
+                slugs.append(slug)
+        for slug in slugs:
+            shards.setdefault(slug, []).append(item)
+    return shards
+
+
+def add_posting(postings: dict, key: str, doc: int):
+    docs = postings.setdefault(key, [])
+    # docs are visited in order, so every list stays sorted and unique
+    if not docs or docs[-1] != doc:
+        docs.append(doc)
+
+
+def build_search_index(entries: list) -> dict:
+    """Inverted index over the recipes, doc ids are positions in summary.json.
+
+    ``titleTokens`` maps normalised title words to docs, ``titles`` keeps the
+    normalised titles to confirm substring matches. ``ingredientNames`` are
+    the canonical ingredient names (recipeIngredients), ``ingredients`` the
+    docs of each name and ``ingredientWords`` the sorted [word, name ids]
+    pairs a filter term is looked up in. ``categories`` maps the raw
+    category values.
+    """
+    titles = []
+    title_tokens = {}
+    categories = {}
+
+    for doc, entry in enumerate(entries):
+        titles.append(normalize_text(entry.get("title", "")))
+        for token in tokenize(entry.get("title", "")):
+            add_posting(title_tokens, token, doc)
+        for c in entry.get("categories", []) or []:
+            add_posting(categories, str(c), doc)
+
+    names, docs, words = build_ingredient_index(entries)
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "count": len(entries),
+        "titles": titles,
+        "titleTokens": title_tokens,
+        "ingredientNames": names,
+        "ingredients": docs,
+        "ingredientWords": words,
+        "categories": categories,
+    }
+
+
+def build_facet_index(entries: list) -> dict:
+    """One bitset per category, country, difficulty and status value.
+
+    Bit i of a set (byte i // 8, bit i % 8, base64 encoded) stands for doc
+    i, like the doc ids of the search index; every set has the same length.
+    ``count`` is the number of recipes with the value, so the filter page
+    gets its facet counts and matches from ANDs and popcounts.
+    """
+    docs = {group: {} for group in FACET_GROUPS}
+    for doc, entry in enumerate(entries):
+        categories = entry.get("categories")
+        for c in dict.fromkeys(categories) if isinstance(categories, list) else ():
+            if isinstance(c, str) and c:
+                group = "country" if get_category_badge(c) == COUNTRY_BADGE else "category"
+                docs[group].setdefault(c, []).append(doc)
+        for group in ("difficulty", "status"):
+            value = str(entry.get(group) or "").strip()
+            if value:
+                docs[group].setdefault(value, []).append(doc)
+
+    size = (len(entries) + 7) // 8
+    facets = {}
+    for group, values in docs.items():
+        facets[group] = {
+            value: {
+                "count": len(found),
+                "bits": base64.b64encode(bitset(found, len(entries)).to_bytes(size, "little")).decode("ascii"),
+            }
+            for value, found in sorted(values.items())
+        }
+    return {"version": FACETS_VERSION, "count": len(entries), "facets": facets}
+
+
+def publish_data(root: Path, entries: list, pack: bool = False) -> dict:
+    """Writes the website data under data/ with content-hashed file names.
+
+    recipes.json, summary.json, search-index.json, ingredients.json (the
+    ingredient dictionary), facets.json (see build_facet_index) and one
+    categories/<slug>.json per category are written as
+    ``<name>.<hash>.json``; data/manifest.json maps the plain names to the
+    current files and is replaced last, so the site never sees a manifest
+    pointing at files that are not there yet. Files of the previous
+    manifest are kept for pages that loaded it just before; anything older
+    is removed. Returns counts of written/unchanged/removed files.
+
+    The record lists are minified with a fixed key order; with pack=True
+    they are also packed with a schema header (see pack_records). Packing
+    saves ~40 % raw but only ~6 % once gzipped, and unpacking costs more
+    than it saves in parsing (recipeCli.py bench-json), so it is off by
+    default.
+    """
+    data_dir = Path(root) / DATA_DIR
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+    entries = [canonical_entry(e) for e in entries if isinstance(e, dict)]
+    summary = [summarize(e) for e in entries]
+    outputs = {
+        RECIPES_NAME: encode_records(entries, pack),
+        SUMMARY_NAME: encode_records(summary, pack),
+        SEARCH_INDEX_NAME: dump_json(build_search_index(entries)),
+        INGREDIENTS_NAME: dump_json(build_ingredient_dictionary(entries)),
+        FACETS_NAME: dump_json(build_facet_index(entries)),
+    }
+    for slug, items in build_shards(summary).items():
+        outputs[f"{SHARD_DIR}/{slug}.json"] = encode_records(items, pack)
+
+    files = {}
+    for name, data in sorted(outputs.items()):
+        files[name] = hashed_name(name, data)
+        path = data_dir / files[name]
+        if path.exists():
+            # same name, same content
+            stats["unchanged"] += 1
+        else:
+            write_atomic(path, data)
+            compress_file(path, data)
+            stats["written"] += 1
+
+    previous = load_data_manifest(data_dir)
+    manifest = dump_json({"version": MANIFEST_VERSION, "files": files})
+    if write_if_changed(data_dir / MANIFEST_NAME, manifest):
+        stats["written"] += 1
+    else:
+        stats["unchanged"] += 1
+
+    keep = {data_dir / MANIFEST_NAME}
+    keep.update(data_dir / f for f in files.values())
+    keep.update(data_dir / f for f in previous.values() if isinstance(f, str))
+    for path in list(data_dir.glob("*.json")) + list((data_dir / SHARD_DIR).glob("*.json")):
+        if path not in keep:
+            remove_file(path)
+            stats["removed"] += 1
+
+    return stats
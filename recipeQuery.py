@@ -0,0 +1,277 @@
+import json
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from recipeCore import bit_docs, bitset, normalize_text
+from recipeIngredients import build_ingredient_index, ingredient_words, word_forms
+from recipePublish import DATA_DIR, MANIFEST_NAME, RECIPE_FIELDS, RECIPES_NAME, load_data_manifest, unpack_records
+
+
+# filter.html field -> recipe field; minimums only for the ratings
+RANGE_FIELDS = {
+    "active": "activeTime",
+    "passive": "passiveTime",
+    "total": "totalTime",
+    "originality": "originality",
+    "taste": "taste",
+}
+# what the result cards of filter.html show (everything but the ingredients)
+RESULT_FIELDS = tuple(f for f in RECIPE_FIELDS if f != "ingredients")
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+# --------------------- helpers ---------------------
+
+def js_number(value) -> float:
+    """Number(value ?? 0) as recipeMatches() computes it; NaN if it is no number."""
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def to_number(value):
+    # toNumber() of filter.html: None for "" and anything that is not a finite number
+    if value is None or str(value).strip() == "":
+        return None
+    n = js_number(value)
+    return n if math.isfinite(n) else None
+
+
+# --------------------- index ---------------------
+
+class RecipeQueryIndex:
+    """The filter of filter.html (recipeMatches) over an in-memory catalogue.
+
+    Doc ids are positions in the published recipes.json, as in the search
+    index. Time and rating filters are two binary searches in a sorted array
+    per field, difficulty/status/category values are one bitset each
+    (Python ints), ingredient terms go through the word index of
+    recipeIngredients. Only the name filter still looks at titles, and only
+    at the recipes left after everything else.
+    """
+
+    def __init__(self, entries: list, version: str = ""):
+        # entries: recipe dicts
+        self.entries = entries
+        self.version = version
+        self.size = len(entries)
+        self.all = (1 << self.size) - 1
+
+        self.titles = []
+        difficulty = {}
+        status = {}
+        categories = {}
+        values = {field: [] for field in RANGE_FIELDS.values()}
+        for doc, entry in enumerate(entries):
+            self.titles.append(normalize_text(entry.get("title") or ""))
+            difficulty.setdefault(str(entry.get("difficulty") or "").strip(), []).append(doc)
+            status.setdefault(str(entry.get("status") or "").strip(), []).append(doc)
+            cats = entry.get("categories")
+            for c in set(cats) if isinstance(cats, list) else ():
+                if isinstance(c, str):
+                    categories.setdefault(c, []).append(doc)
+            for field, found in values.items():
+                found.append((js_number(entry.get(field)), doc))
+
+        self.difficulty = {k: bitset(docs, self.size) for k, docs in difficulty.items()}
+        self.status = {k: bitset(docs, self.size) for k, docs in status.items()}
+        self.categories = {k: bitset(docs, self.size) for k, docs in categories.items()}
+
+        # field -> (sorted values, their docs, bits of the docs without a number)
+        self.ranges = {}
+        for field, found in values.items():
+            numbers = sorted((v, doc) for v, doc in found if not math.isnan(v))
+            nan_docs = [doc for v, doc in found if math.isnan(v)]
+            self.ranges[field] = ([v for v, _doc in numbers], [doc for _v, doc in numbers], bitset(nan_docs, self.size))
+
+        self.ingredient_names, self.ingredient_docs, words = build_ingredient_index(entries)
+        self.ingredient_words = [word for word, _ids in words]
+        self.ingredient_ids = [ids for _word, ids in words]
+
+        # renderResults() sorts by title
+        order = sorted(range(self.size), key=lambda doc: (self.titles[doc], str(entries[doc].get("title") or "")))
+        self.rank = [0] * self.size
+        for rank, doc in enumerate(order):
+            self.rank[doc] = rank
+
+    # ---------- single filters ----------
+    def range_bits(self, field: str, lo=None, hi=None) -> int:
+        # NaN fails both comparisons in inRange(), so those recipes always pass
+        values, docs, nan_bits = self.ranges[field]
+        start = bisect_left(values, lo) if lo is not None else 0
+        end = bisect_right(values, hi) if hi is not None else len(values)
+        if start == 0 and end == len(values):
+            return self.all
+        return bitset(docs[start:end], self.size) | nan_bits
+
+    def any_of(self, bitsets: dict, keys) -> int:
+        bits = 0
+        for key in keys:
+            bits |= bitsets.get(key, 0)
+        return bits
+
+    def names_with_prefix(self, prefix: str) -> set:
+        # same as ingredientNamesWithPrefix() in assets/scripts.js
+        ids = set()
+        i = bisect_left(self.ingredient_words, prefix)
+        while i < len(self.ingredient_words) and self.ingredient_words[i].startswith(prefix):
+            ids.update(self.ingredient_ids[i])
+            i += 1
+        return ids
+
+    def ingredient_bits(self, term: str):
+        """Recipes with an ingredient matching term; None if the term is empty after normalising."""
+        words = ingredient_words(term)
+        if not words:
+            return None
+        names = None
+        for word in words:
+            found = set()
+            for form in word_forms(word):
+                found |= self.names_with_prefix(form)
+            names = found if names is None else names & found
+            if not names:
+                return 0
+        return bitset((doc for name_id in names for doc in self.ingredient_docs[name_id]), self.size)
+
+    # ---------- queries ----------
+    def match(self, filters: dict) -> list:
+        """Doc ids matching filters (the object collectFilters() of filter.html builds), in title order."""
+        bits = self.all
+        for prefix, field in RANGE_FIELDS.items():
+            lo = filters.get(f"{prefix}Min")
+            hi = filters.get(f"{prefix}Max")
+            if lo is not None or hi is not None:
+                bits &= self.range_bits(field, lo, hi)
+
+        if filters.get("difficulty"):
+            bits &= self.difficulty.get(filters["difficulty"], 0)
+        if filters.get("status"):
+            bits &= self.status.get(filters["status"], 0)
+        # any of the checked categories, any of the checked countries
+        for group in ("categories", "countries"):
+            if filters.get(group):
+                bits &= self.any_of(self.categories, filters[group])
+        # every ingredient term
+        for term in filters.get("ingredients", []):
+            if not bits:
+                break
+            found = self.ingredient_bits(term)
+            if found is not None:
+                bits &= found
+
+        docs = bit_docs(bits)
+        if filters.get("name"):
+            needle = normalize_text(filters["name"])
+            docs = [doc for doc in docs if needle in self.titles[doc]]
+        docs.sort(key=self.rank.__getitem__)
+        return docs
+
+    def query(self, filters: dict, offset: int = 0, limit: int = PAGE_SIZE) -> dict:
+        docs = self.match(filters)
+        page = docs[offset:offset + limit]
+        return {
+            "version": self.version,
+            "total": len(docs),
+            "offset": offset,
+            "limit": limit,
+            "results": [
+                {"doc": doc, **{k: self.entries[doc][k] for k in RESULT_FIELDS if k in self.entries[doc]}}
+                for doc in page
+            ],
+        }
+
+
+def parse_filters(params: dict) -> dict:
+    """Filters from query parameters named like the ones filter.html reads from its URL.
+
+    params maps names to lists of values (urllib.parse.parse_qs).
+    """
+    def value(name: str) -> str:
+        values = params.get(name) or [""]
+        return values[0].strip()
+
+    def values(name: str) -> list:
+        return [v.strip() for v in params.get(name, []) if v.strip()]
+
+    filters = {
+        "name": value("name"),
+        "difficulty": value("difficulty"),
+        "status": value("status"),
+        "ingredients": values("ingredient"),
+        "categories": values("category"),
+        "countries": values("country"),
+    }
+    for prefix in RANGE_FIELDS:
+        for bound in ("Min", "Max"):
+            filters[f"{prefix}{bound}"] = to_number(value(f"{prefix}{bound}"))
+    return filters
+
+
+def parse_paging(params: dict) -> tuple[int, int]:
+    """(offset, limit); ValueError if they are no numbers."""
+    offset = int((params.get("offset") or ["0"])[0])
+    limit = int((params.get("limit") or [str(PAGE_SIZE)])[0])
+    return max(0, offset), max(0, min(limit, MAX_PAGE_SIZE))
+
+
+# --------------------- catalogue ---------------------
+
+class QueryCatalogue:
+    """The query index of the recipes the site currently publishes.
+
+    Follows data/manifest.json (falls back to recipes.json if nothing is
+    published) and rebuilds the index when that points at another file.
+    Thread-safe.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.lock = threading.Lock()
+        self.key = None
+        self.index = None
+
+    def source(self) -> Path:
+        name = load_data_manifest(self.root / DATA_DIR).get(RECIPES_NAME)
+        return self.root / DATA_DIR / name if name else self.root / RECIPES_NAME
+
+    def current(self) -> RecipeQueryIndex:
+        manifest = self.root / DATA_DIR / MANIFEST_NAME
+        path = self.source()
+        try:
+            st = path.stat()
+            key = (str(path), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            key = (str(path), None, None)
+        try:
+            key += (manifest.stat().st_mtime_ns,)
+        except FileNotFoundError:
+            pass
+
+        with self.lock:
+            if key != self.key:
+                try:
+                    with path.open("r", encoding="utf-8") as f:
+                        entries = unpack_records(json.load(f))
+                except (OSError, ValueError):
+                    entries = []
+                if not isinstance(entries, list):
+                    entries = []
+                entries = [e for e in entries if isinstance(e, dict)]
+                self.index = RecipeQueryIndex(entries, version=f"{key[1] or 0:x}-{key[2] or 0:x}")
+                self.key = key
+            return self.index
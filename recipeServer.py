@@ -0,0 +1,351 @@
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from recipePublish import (
+    COMPRESS_MIN_SIZE,
+    COMPRESS_SUFFIXES,
+    DATA_DIR,
+    ENCODINGS,
+    HASH_LEN,
+    compress,
+    dump_json,
+    is_fresh,
+    sibling_path,
+)
+from recipeQuery import QueryCatalogue, parse_filters, parse_paging
+
+
+# Files up to CACHE_MAX_FILE bytes are kept in memory, CACHE_MAX_BYTES in total
+CACHE_MAX_FILE = 256 * 1024
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Bodies from this size on go out with sendfile() instead of read + write
+SENDFILE_MIN_SIZE = 64 * 1024
+
+# data/<name>.<hash>.json never changes (recipePublish.hashed_name)
+IMMUTABLE_RE = re.compile(rf"^/{DATA_DIR}/.+\.[0-9a-f]{{{HASH_LEN}}}\.json$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# everything else may be cached, but is revalidated (ETag / If-Modified-Since) on every use
+REVALIDATE = "no-cache"
+
+# filter.html's query parameters plus offset/limit -> {"total", "results", ...} (recipeQuery.py)
+QUERY_PATH = "/api/recipes"
+
+
+# --------------------- helpers ---------------------
+
+def accepted_encodings(header: str) -> set:
+    """Content codings from an Accept-Encoding header, without the ones sent with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        name, _sep, params = part.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _sep, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name)
+    return accepted
+
+
+def make_etag(st: os.stat_result, encoding: str = "") -> str:
+    # changes whenever the file is replaced (the tools always write a new file)
+    tag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+def not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """(start, end exclusive) of a single "bytes=" range; None to ignore the header.
+
+    Raises ValueError if the range lies outside the file (416).
+    """
+    unit, _sep, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # other units and multipart ranges: send the whole file
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # "-n": the last n bytes
+            n = int(last)
+            if n <= 0:
+                raise ValueError("empty suffix range")
+            return max(0, size - n), size
+        start = int(first)
+        end = int(last) + 1 if last else size
+    except ValueError:
+        if first.strip().isdigit() or last.strip().isdigit():
+            raise
+        return None
+    if start >= size or end <= start:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size)
+
+
+class FileCache:
+    """Contents of small files, checked against mtime and size on every use.
+
+    Thread-safe; the least recently used files are dropped once more than
+    max_bytes are cached.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, max_file: int = CACHE_MAX_FILE):
+        self.max_bytes = max_bytes
+        self.max_file = max_file
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, path: Path, f, st: os.stat_result) -> bytes | None:
+        """Contents of the open file f (stat st), from memory if unchanged; None if too large."""
+        if st.st_size > self.max_file:
+            return None
+        key = str(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self.lock:
+            item = self.items.get(key)
+            if item is not None and item[0] == signature:
+                self.items.move_to_end(key)
+                return item[1]
+
+        data = f.read()
+        if len(data) != st.st_size:
+            # changed while reading
+            return data
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.items[key] = (signature, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _key, (_sig, dropped) = self.items.popitem(last=False)
+                self.size -= len(dropped)
+        return data
+
+
+class FileRange:
+    """An open file and the part of it that is sent (see SiteHandler.copyfile)."""
+
+    def __init__(self, f, offset: int, count: int):
+        self.f = f
+        self.offset = offset
+        self.count = count
+
+    def close(self):
+        self.f.close()
+
+
+# --------------------- handler ---------------------
+
+class SiteHandler(SimpleHTTPRequestHandler):
+    """``python -m http.server`` for the site, plus what a browser can use:
+
+    - keep-alive (HTTP/1.1),
+    - <file>.br / <file>.gz (written by recipePublish.compress_file) when the
+      client accepts it and the sibling is still current,
+    - ETag / Last-Modified and 304 answers, Cache-Control (content-hashed
+      data files are immutable, everything else is revalidated),
+    - single byte ranges,
+    - small files from an in-memory cache, large ones via sendfile(),
+    - the recipe filter as a JSON query at QUERY_PATH (with a catalogue).
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes; with keep-alive Nagle would hold the body back ~40 ms
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, cache: FileCache | None = None, catalogue: QueryCatalogue | None = None, **kwargs):
+        # set before super().__init__, which already handles the request
+        self.cache = cache
+        self.catalogue = catalogue
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if self.catalogue is not None and url.path == QUERY_PATH:
+            self.send_query(url.query)
+        else:
+            super().do_GET()
+
+    def send_query(self, query: str):
+        params = parse_qs(query)
+        try:
+            offset, limit = parse_paging(params)
+        except ValueError:
+            self.send_json(HTTPStatus.BAD_REQUEST, dump_json({"error": "offset und limit müssen Zahlen sein"}))
+            return
+
+        index = self.catalogue.current()
+        # same catalogue and same question, same answer
+        etag = f'"{index.version}-{hashlib.sha1(query.encode("utf-8")).hexdigest()[:HASH_LEN]}"'
+        if "If-None-Match" in self.headers and etag_matches(self.headers["If-None-Match"], etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_headers({"ETag": etag, "Cache-Control": REVALIDATE})
+            return
+        body = dump_json(index.query(parse_filters(params), offset, limit))
+        self.send_json(HTTPStatus.OK, body, etag)
+
+    def send_json(self, status: HTTPStatus, body: bytes, etag: str = ""):
+        headers = {"Content-Type": "application/json", "Cache-Control": REVALIDATE, "Vary": "Accept-Encoding"}
+        if etag:
+            headers["ETag"] = etag
+        if len(body) >= COMPRESS_MIN_SIZE and "gzip" in accepted_encodings(self.headers.get("Accept-Encoding", "")):
+            body = compress(body, ".gz")
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+        self.send_response(status)
+        self.send_headers(headers)
+        self.wfile.write(body)
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        url_path = unquote(urlsplit(self.path).path)
+        if path.is_dir():
+            if not url_path.endswith("/") or not (path / "index.html").is_file():
+                # redirect to "dir/" or directory listing
+                return super().send_head()
+            path = path / "index.html"
+            url_path += "index.html"
+        elif url_path.endswith("/") or not path.is_file():
+            return super().send_head()
+
+        if "Range" not in self.headers:
+            accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+            for encoding, ext in ENCODINGS:
+                sibling = sibling_path(path, ext)
+                if encoding in accepted and is_fresh(path, sibling):
+                    return self.send_file(path, url_path, sibling, encoding)
+        return self.send_file(path, url_path, path, "")
+
+    def send_file(self, path: Path, url_path: str, source: Path, encoding: str):
+        try:
+            f = source.open("rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            st = os.fstat(f.fileno())
+            etag = make_etag(st, encoding)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": self.date_time_string(st.st_mtime),
+                "Cache-Control": IMMUTABLE if IMMUTABLE_RE.match(url_path) else REVALIDATE,
+            }
+            if path.suffix in COMPRESS_SUFFIXES:
+                headers["Vary"] = "Accept-Encoding"
+
+            if self.is_not_modified(etag, st.st_mtime):
+                f.close()
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_headers(headers)
+                return None
+
+            status = HTTPStatus.OK
+            start, end = 0, st.st_size
+            if not encoding and "Range" in self.headers and self.range_applies(etag, headers["Last-Modified"]):
+                try:
+                    wanted = parse_range(self.headers["Range"], st.st_size)
+                except ValueError:
+                    f.close()
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_headers({"Content-Range": f"bytes */{st.st_size}", "Content-Length": "0"})
+                    return None
+                if wanted is not None:
+                    status = HTTPStatus.PARTIAL_CONTENT
+                    start, end = wanted
+                    headers["Content-Range"] = f"bytes {start}-{end - 1}/{st.st_size}"
+
+            data = self.cache.get(source, f, st) if self.cache is not None else None
+            if data is not None:
+                f.close()
+                body = io.BytesIO(data[start:end])
+            else:
+                body = FileRange(f, start, end - start)
+        except BaseException:
+            f.close()
+            raise
+
+        self.send_response(status)
+        headers["Content-Type"] = self.guess_type(str(path))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if not encoding:
+            headers["Accept-Ranges"] = "bytes"
+        headers["Content-Length"] = str(end - start)
+        self.send_headers(headers)
+        return body
+
+    def send_headers(self, headers: dict):
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def is_not_modified(self, etag: str, mtime: float) -> bool:
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)
+        if "If-None-Match" in self.headers:
+            return etag_matches(self.headers["If-None-Match"], etag)
+        if "If-Modified-Since" in self.headers:
+            return not_modified_since(self.headers["If-Modified-Since"], mtime)
+        return False
+
+    def range_applies(self, etag: str, last_modified: str) -> bool:
+        # If-Range: only send the part if the file is still the one the client has
+        if_range = self.headers.get("If-Range")
+        return if_range is None or if_range.strip() in (etag, last_modified)
+
+    def copyfile(self, source, outputfile):
+        if not isinstance(source, FileRange):
+            super().copyfile(source, outputfile)
+        elif source.count >= SENDFILE_MIN_SIZE:
+            # socket.sendfile uses os.sendfile where there is one and falls back to send()
+            self.connection.sendfile(source.f, source.offset, source.count)
+        else:
+            source.f.seek(source.offset)
+            outputfile.write(source.f.read(source.count))
+
+
+def serve(root: Path, port: int = 8000, bind: str = "127.0.0.1", quiet: bool = False):
+    handler_class = SiteHandler
+    if quiet:
+        handler_class = type("QuietSiteHandler", (SiteHandler,), {"log_message": lambda self, *args: None})
+    handler = partial(handler_class, directory=str(root), cache=FileCache(), catalogue=QueryCatalogue(root))
+    with ThreadingHTTPServer((bind, port), handler) as httpd:
+        print(f"http://{bind}:{port}/  ({root})", flush=True)
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,515 @@
+import hashlib
+import json
+import os
+from bisect import insort
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks (Windows); the tools still work, just uncoordinated
+    fcntl = None
+
+from atomicFile import write_json_atomic
+from recipeCore import normalize_rel_path
+from recipeIngredients import canonical_ingredient
+from recipePublish import canonical_entry, compress_file, publish_data
+
+
+# Number of journal records after which the snapshot is rewritten automatically
+COMPACT_THRESHOLD = 50
+# Indentation of recipes.json as it is tracked in git, so a compaction only shows real changes
+JSON_INDENT = 4
+
+INDEX_VERSION = 1
+
+
+class ConflictError(Exception):
+    """The entry was changed or removed by someone else since it was read."""
+
+
+# --------------------- helpers ---------------------
+
+def journal_path_for(json_path: Path) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + ".journal.jsonl")
+
+
+def index_path_for(json_path: Path) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + ".index.json")
+
+
+def db_path_for(json_path: Path) -> Path:
+    # if this file exists, recipeDb.RecipeDb is used instead of RecipeStore
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + ".sqlite")
+
+
+def lock_path_for(json_path: Path) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + ".lock")
+
+
+def entry_version(entry) -> str:
+    """Content hash of an entry; what a tool read is compared with this before it writes."""
+    if not isinstance(entry, dict):
+        return ""
+    data = json.dumps(entry, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+def file_signature(path: Path) -> dict:
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def migrate_entry(entry):
+    # migrate fields: reproducibility -> originality; make file relative
+    if isinstance(entry, dict):
+        if "reproducibility" in entry and "originality" not in entry:
+            entry["originality"] = entry.pop("reproducibility")
+        if isinstance(entry.get("file"), str) and entry["file"].startswith("/"):
+            entry["file"] = entry["file"][1:]
+    return entry
+
+
+def load_json_list(json_path: Path) -> list:
+    if not json_path.exists():
+        return []
+    try:
+        with json_path.open("r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        return loaded if isinstance(loaded, list) else []
+    except Exception:
+        return []
+
+
+# --------------------- store ---------------------
+
+class RecipeStore:
+    """recipes.json snapshot plus an append-only journal of changes.
+
+    Every add/update/delete is appended as one JSON line to
+    ``recipes.journal.jsonl`` instead of rewriting the whole catalogue.
+    ``compact()`` folds the journal back into ``recipes.json`` (the file the
+    website reads), regenerates the published data under ``data/`` and is
+    triggered automatically every ``compact_threshold`` records.
+
+    Writers (append/compact/apply_batch) hold an advisory lock on
+    ``recipes.lock`` and first catch up with records other processes appended
+    in the meantime, so parallel tools never lose each other's changes.
+    update/delete accept the ``entry_version`` a tool read; if the entry has
+    changed since, ConflictError is raised instead of overwriting it.
+
+    Lookups go through two hash indexes (normalised file -> positions,
+    title -> positions). Deleted entries leave a ``None`` hole so positions
+    stay stable until the next compaction. The index of the snapshot is
+    persisted as ``recipes.index.json`` and reused while recipes.json is
+    unchanged.
+    """
+
+    def __init__(self, json_path: Path, compact_threshold: int = COMPACT_THRESHOLD):
+        self.json_path = Path(json_path)
+        self.journal_path = journal_path_for(self.json_path)
+        # where changes are written until the next compaction (shown by the tools)
+        self.location = self.journal_path
+        self.index_path = index_path_for(self.json_path)
+        self.lock_path = lock_path_for(self.json_path)
+        self.compact_threshold = compact_threshold
+        self.entries = []
+        self.by_file = {}
+        self.by_title = {}
+        self.journal_len = 0
+        self.journal_offset = 0
+        self.snapshot = {}
+        self.lock_fd = None
+        self.lock_depth = 0
+        self.closed = False
+        # files changed since the snapshot (None: unknown, after reset()), and the ones
+        # folded into it by the last compaction; for changed_since()
+        self.changed = set()
+        self.folded = None
+        with self.locked():
+            self.load()
+
+    def close(self):
+        # nothing held open between calls; there for the interface of RecipeDb
+        self.closed = True
+
+    # ---------- locking ----------
+    @contextmanager
+    def locked(self):
+        """Exclusive advisory lock across processes; re-entrant within one store."""
+        if self.lock_depth == 0 and fcntl is not None:
+            self.lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(self.lock_fd)
+                self.lock_fd = None
+                raise
+        self.lock_depth += 1
+        try:
+            yield self
+        finally:
+            self.lock_depth -= 1
+            if self.lock_depth == 0 and self.lock_fd is not None:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+                os.close(self.lock_fd)
+                self.lock_fd = None
+
+    # ---------- reading ----------
+    def load(self):
+        self.snapshot = file_signature(self.json_path)
+        self.entries = [migrate_entry(e) for e in load_json_list(self.json_path)]
+        self.changed = set()
+        self.folded = None
+        if not self.load_index():
+            self.rebuild_index()
+            self.save_index()
+
+        self.journal_len = 0
+        self.journal_offset = 0
+        self.catch_up()
+
+    def refresh(self):
+        """Pick up what other processes wrote since load(); call with the lock held."""
+        if file_signature(self.json_path) != self.snapshot:
+            # someone compacted: start over from the new snapshot
+            self.load()
+            return
+        try:
+            size = self.journal_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self.journal_offset:
+            self.load()
+        elif size > self.journal_offset:
+            self.catch_up()
+
+    def catch_up(self):
+        records, self.journal_offset = self.read_journal(self.journal_offset)
+        for record in records:
+            self.apply(record)
+            self.journal_len += 1
+
+    def read_journal(self, offset: int = 0) -> tuple[list, int]:
+        """Records from byte offset on, and the offset after the last complete line."""
+        try:
+            with self.journal_path.open("rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        records = []
+        end = offset
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                # a crash while appending can leave a truncated last line
+                break
+            end += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records, end
+
+    def find(self, rel_file: str, title: str = ""):
+        positions = self.by_file.get(normalize_rel_path(rel_file))
+        if positions:
+            return positions[0], self.entries[positions[0]]
+
+        title_norm = str(title).strip()
+        if title_norm:
+            positions = self.by_title.get(title_norm)
+            if positions:
+                return positions[0], self.entries[positions[0]]
+
+        return None, None
+
+    # ---------- index ----------
+    def index_keys(self, idx: int):
+        entry = self.entries[idx]
+        if not isinstance(entry, dict):
+            return None, None
+        return normalize_rel_path(entry.get("file", "")), str(entry.get("title", "")).strip()
+
+    def index_entry(self, idx: int):
+        file_key, title_key = self.index_keys(idx)
+        if file_key is None:
+            return
+        # positions stay sorted so the first entry wins, like the old linear scan
+        insort(self.by_file.setdefault(file_key, []), idx)
+        if title_key:
+            insort(self.by_title.setdefault(title_key, []), idx)
+
+    def unindex_entry(self, idx: int):
+        file_key, title_key = self.index_keys(idx)
+        if file_key is None:
+            return
+        for index, key in ((self.by_file, file_key), (self.by_title, title_key)):
+            positions = index.get(key)
+            if positions and idx in positions:
+                positions.remove(idx)
+                if not positions:
+                    del index[key]
+
+    def rebuild_index(self):
+        self.by_file = {}
+        self.by_title = {}
+        for idx in range(len(self.entries)):
+            self.index_entry(idx)
+
+    def load_index(self) -> bool:
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return False
+        if data.get("snapshot") != file_signature(self.json_path) or data.get("count") != len(self.entries):
+            return False
+        files = data.get("files")
+        titles = data.get("titles")
+        if not isinstance(files, dict) or not isinstance(titles, dict):
+            return False
+        self.by_file = files
+        self.by_title = titles
+        folded = data.get("folded")
+        self.folded = folded if isinstance(folded, dict) else None
+        return True
+
+    def save_index(self):
+        if not self.json_path.exists():
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "snapshot": file_signature(self.json_path),
+            "count": len(self.entries),
+            "files": self.by_file,
+            "titles": self.by_title,
+            "folded": self.folded,
+        }
+        try:
+            write_json_atomic(self.index_path, data, separators=(",", ":"))
+        except OSError:
+            # the index is only a cache; it is rebuilt on the next load
+            pass
+
+    def recipes(self) -> list:
+        return [e for e in self.entries if isinstance(e, dict)]
+
+    def with_category(self, category: str) -> list:
+        return [e for e in self.recipes() if category in (e.get("categories") or [])]
+
+    def with_ingredient(self, name: str) -> list:
+        """Recipes using an ingredient, by its canonical name ("Tomatoes (peeled)" finds "tomato")."""
+        key = canonical_ingredient(name)
+        return [
+            e for e in self.recipes()
+            if any(isinstance(ing, dict) and canonical_ingredient(ing.get("name", "")) == key
+                   for ing in e.get("ingredients") or [])
+        ]
+
+    def count(self) -> int:
+        return sum(1 for e in self.entries if isinstance(e, dict))
+
+    # ---------- changes ----------
+    def change_mark(self) -> dict:
+        """Where the catalogue is now, for changed_since(); call with the lock held after refresh()."""
+        return {"snapshot": self.snapshot}
+
+    def changed_since(self, mark) -> set | None:
+        """Files of the recipes changed since change_mark() returned mark (maybe a few more).
+
+        None if that can no longer be told: recipes.json was compacted twice
+        since, edited by hand or replaced by reset().
+        """
+        if not isinstance(mark, dict) or self.changed is None:
+            return None
+        if mark.get("snapshot") == self.snapshot:
+            return set(self.changed)
+        folded = self.folded
+        if folded and folded.get("files") is not None and mark.get("snapshot") == folded.get("snapshot"):
+            return set(folded["files"]) | self.changed
+        return None
+
+    def touch(self, idx: int):
+        file_key, _title_key = self.index_keys(idx)
+        if self.changed is not None and file_key is not None:
+            self.changed.add(file_key)
+
+    def replace(self, idx: int, entry: dict):
+        self.touch(idx)
+        self.unindex_entry(idx)
+        self.entries[idx] = entry
+        self.index_entry(idx)
+        self.touch(idx)
+
+    def insert(self, entry: dict):
+        self.entries.append(entry)
+        self.index_entry(len(self.entries) - 1)
+        self.touch(len(self.entries) - 1)
+
+    # ---------- applying ----------
+    def apply(self, record: dict):
+        op = record.get("op")
+        entry = record.get("entry")
+
+        if op == "add" and isinstance(entry, dict):
+            # upsert by file, so replaying a journal after an interrupted
+            # compaction never duplicates recipes
+            idx, _existing = self.find(entry.get("file", ""))
+            if idx is None:
+                self.insert(migrate_entry(entry))
+            else:
+                self.replace(idx, migrate_entry(entry))
+
+        elif op == "update" and isinstance(entry, dict):
+            idx, _existing = self.find(record.get("file", ""), record.get("title", ""))
+            if idx is None:
+                idx, _existing = self.find(entry.get("file", ""), entry.get("title", ""))
+            if idx is None:
+                self.insert(migrate_entry(entry))
+            else:
+                self.replace(idx, migrate_entry(entry))
+
+        elif op == "delete":
+            idx, _existing = self.find(record.get("file", ""), record.get("title", ""))
+            if idx is not None:
+                self.touch(idx)
+                self.unindex_entry(idx)
+                self.entries[idx] = None
+
+    def check_version(self, record: dict, expected_version: str):
+        _idx, current = self.find(record.get("file", ""), record.get("title", ""))
+        if current is None:
+            raise ConflictError(f"{record.get('file') or record.get('title')} wurde inzwischen gelöscht")
+        if entry_version(current) != expected_version:
+            raise ConflictError(f"{record.get('file') or record.get('title')} wurde inzwischen geändert")
+
+    def append(self, record: dict, expected_version: str | None = None):
+        with self.locked():
+            self.refresh()
+            if expected_version is not None:
+                self.check_version(record, expected_version)
+
+            self.apply(record)
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            with self.journal_path.open("ab") as f:
+                if f.tell() > self.journal_offset:
+                    # finish a truncated line left by a crash, it is skipped on reading
+                    line = b"\n" + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                self.journal_offset = f.tell()
+            self.journal_len += 1
+
+            if self.compact_threshold and self.journal_len >= self.compact_threshold:
+                self.compact()
+
+    # ---------- writing ----------
+    def add(self, entry: dict):
+        self.append({"op": "add", "entry": entry})
+
+    def update(self, entry: dict, rel_file: str = "", title: str = "", expected_version: str | None = None):
+        """Replace the entry matching rel_file/title (defaults to the entry's own file/title).
+
+        With expected_version, raises ConflictError if that entry no longer
+        has this entry_version().
+        """
+        self.append({
+            "op": "update",
+            "file": normalize_rel_path(rel_file or entry.get("file", "")),
+            "title": str(title or entry.get("title", "")).strip(),
+            "entry": entry,
+        }, expected_version)
+
+    def delete(self, rel_file: str, title: str = "", expected_version: str | None = None):
+        self.append({
+            "op": "delete",
+            "file": normalize_rel_path(rel_file),
+            "title": str(title).strip(),
+        }, expected_version)
+
+    def apply_batch(self, records: list):
+        """Apply many records in memory and write recipes.json once."""
+        with self.locked():
+            self.refresh()
+            for record in records:
+                self.apply(record)
+            self.write_snapshot()
+
+    def reset(self, entries: list):
+        """Replace the whole catalogue (restoring a backup) and write recipes.json."""
+        with self.locked():
+            self.entries = [migrate_entry(e) for e in entries]
+            self.changed = None
+            self.write_snapshot()
+
+    def compact(self):
+        """Write the current state to recipes.json and clear the journal.
+
+        recipes.json is replaced atomically, so the journal is only removed
+        once the new file is complete; a crash before that just replays the
+        journal on the next load.
+        """
+        with self.locked():
+            self.refresh()
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        # caller holds the lock
+        self.entries = [e for e in self.entries if e is not None]
+        # pretty and key-stable: this is the file that shows up in diffs
+        entries = [canonical_entry(e) if isinstance(e, dict) else e for e in self.entries]
+        write_json_atomic(self.json_path, entries, indent=JSON_INDENT)
+        compress_file(self.json_path)
+        self.folded = {"snapshot": self.snapshot, "files": sorted(self.changed) if self.changed is not None else None}
+        self.snapshot = file_signature(self.json_path)
+        self.changed = set()
+
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.journal_len = 0
+        self.journal_offset = 0
+
+        self.rebuild_index()
+        self.save_index()
+
+        # summary + category shards the website loads instead of the full recipes.json
+        publish_data(self.json_path.parent, self.entries)
+
+
+
+def open_store(
+    json_path: Path, shared: RecipeStore | None = None, compact_threshold: int = COMPACT_THRESHOLD
+) -> RecipeStore:
+    """The store for json_path: RecipeDb if the SQLite database exists, else RecipeStore.
+
+    If shared (e.g. the launcher's) is already that store and not closed, it
+    is brought up to date with what other processes wrote and returned
+    instead of loading a new one.
+    """
+    json_path = Path(json_path)
+    if db_path_for(json_path).exists():
+        from recipeDb import RecipeDb
+        store_class = RecipeDb
+    else:
+        store_class = RecipeStore
+
+    if type(shared) is store_class and not shared.closed and shared.json_path.resolve() == json_path.resolve():
+        with shared.locked():
+            shared.refresh()
+        return shared
+    return store_class(json_path, compact_threshold)
@@ -0,0 +1,363 @@
+import hashlib
+import inspect
+import re
+import sys
+
+from recipeCore import clamp, to_int
+
+# Hash of this module's source (template, row markup, labels, helpers) and the number
+# helpers it uses: any change to how a page is rendered makes `recipeCli.py rebuild`
+# re-render every page
+TEMPLATE_VERSION = hashlib.sha1("\0".join((
+    inspect.getsource(sys.modules[__name__]), inspect.getsource(clamp), inspect.getsource(to_int),
+)).encode("utf-8")).hexdigest()[:12]
+
+# Convert difficulty to English label for HTML
+ENGLISH_DIFF = {"easy": "Easy", "medium": "Medium", "hard": "Hard"}
+
+# Defining the categories' badge colors
+CATEGORIE_BADGE = {
+    "pork": "bg-meat",
+    "chicken": "bg-meat",
+    "beef": "bg-meat",
+    "fish": "bg-primary",
+    "seafood": "bg-primary",
+    "vegan": "bg-vegetarian",
+    "vegetarian": "bg-vegetarian",
+    "vegetables": "bg-success",
+    "salad": "bg-success",
+    "noodles": "bg-grain",
+    "pasta": "bg-grain",
+    "rice": "bg-grain",
+    "potato": "bg-grain",
+    "breads": "bg-bakedDishes",
+    "sandwiches": "bg-bakedDishes",
+    "bakedDishes": "bg-bakedDishes",
+    "egg": "bg-egg",
+    "streetfood": "bg-streetfood",
+    "basics": "bg-secondary",
+    "component": "bg-secondary",
+    "drinks": "bg-secondary",
+    "appetizer": "bg-appetizer",
+    "fingerfood": "bg-fingerfood",
+    "cake": "bg-dessert",
+    "pastry": "bg-dessert",
+    "biscuit": "bg-dessert",
+    "otherDesserts": "bg-dessert",
+    "dessert": "bg-dessert",
+    "snacks": "bg-snacks",
+    "sauce": "bg-sauce",
+    "dressing": "bg-sauce",
+    "stew": "bg-stew",
+    "curry": "bg-curry",
+    "soup": "bg-soup",
+    "America": "bg-country",
+    "Austria": "bg-country",
+    "Bosnia": "bg-country",
+    "Great Britain": "bg-country",
+    "China": "bg-country",
+    "Mongolia": "bg-country",
+    "Portugal": "bg-country",
+    "Germany": "bg-country",
+    "France": "bg-country",
+    "Greece": "bg-country",
+    "India": "bg-country",
+    "Italy": "bg-country",
+    "Japan": "bg-country",
+    "Hungary": "bg-country",
+    "Lebanon": "bg-country",
+    "Korea": "bg-country",
+    "Mexico": "bg-country",
+    "Spain": "bg-country",
+    "Thailand": "bg-country",
+    "Turkey": "bg-country",
+    "Vietnam": "bg-country",
+}
+
+SLOT_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+# --------------------- helpers ---------------------
+
+def html_escape(text) -> str:
+    # a chain of str.replace is faster than html.escape/str.translate for short strings
+    return (
+        str(text)
+        .replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#39;")
+    )
+
+
+def get_category_badge(category: str) -> str:
+    """Returns badge-color based on the category-string"""
+    return CATEGORIE_BADGE.get(category, "bg-secondary")
+
+
+# Star string for HTML (default 5 stars if value missing)
+def stars(n):
+    n = clamp(n if n is not None else 5, 0, 5)
+    return ("★ " * n + "☆ " * (5 - n)).strip()
+
+
+def minutes_text_full(n):
+    n = to_int(n, 0)
+    return f"{n} minutes" if n != 1 else "1 minute"
+
+
+def minutes_text_short(n):
+    n = to_int(n, 0)
+    return f"{n} min." if n != 1 else "1 min."
+
+
+# --------------------- template ---------------------
+
+class CompiledTemplate:
+    """A template with {{name}} slots, parsed once.
+
+    The static text between slots is kept as ready-made chunks; rendering
+    only drops the slot values into a preallocated list and joins it once.
+    """
+
+    def __init__(self, text: str):
+        pieces = SLOT_RE.split(text)
+        self.chunks = pieces[0::2]
+        self.slots = pieces[1::2]
+        self.parts = [None] * len(pieces)
+        self.parts[0::2] = self.chunks
+
+    def render(self, values: dict) -> str:
+        parts = self.parts[:]
+        parts[1::2] = [values[name] for name in self.slots]
+        return "".join(parts)
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<title>RecsWeb - {{title}}</title>
+<link rel="icon" type="image/x-icon" href="https://ik.imagekit.io/o9fejv2tr/RecsWeb%20Icons/logo.png?updatedAt=1756760270932"> 
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
+<link rel="stylesheet" href="../../styles.css">
+<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.2/css/all.min.css">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/lipis/flag-icons@7.3.2/css/flag-icons.min.css"/>
+<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;800&display=swap" rel="stylesheet">
+</head>
+<body class="d-flex flex-column min-vh-100">
+
+<div id="site-navbar"></div>
+
+<main class="flex-grow-1">
+<section class="overview-section py-4">
+<div class="container">
+	<h1 class="mb-3">{{title}}</h1>
+
+	<div class="row g-4 align-items-center">
+	<div class="col-12 col-md-auto">
+		<img src="{{image}}"
+			class="img-thumbnail overview-img"
+			alt="image not found">
+	</div>
+
+	<div class="col">
+		<div class="d-flex flex-wrap gap-2 mb-3">
+		{{categories}}
+		</div>
+
+		<div class="row row-cols-2 row-cols-sm-3 row-cols-md-4 g-3 mb-3">
+		<div class="col">
+			<div class="p-3 border rounded-3 bg-body">
+			<div class="small text-uppercase text-muted fw-semibold">Total Time</div>
+			<div class="fs-5">
+				<span class="text-warning">{{total_full}}</span>
+			</div>
+			</div>
+		</div>
+		<div class="col">
+			<div class="p-3 border rounded-3 bg-body">
+			<div class="small text-uppercase text-muted fw-semibold">Difficulty</div>
+			<div class="fs-5">
+				<span class="text-warning">{{difficulty}}</span>
+			</div>
+			</div>
+		</div>
+		<div class="col">
+			<div class="p-3 border rounded-3 bg-body">
+			<div class="small text-uppercase text-muted fw-semibold">Originality</div>
+			<div class="fs-5">
+				<span class="text-warning">{{originality}}</span>
+			</div>
+			</div>
+		</div>
+		<div class="col">
+			<div class="p-3 border rounded-3 bg-body">
+			<div class="small text-uppercase text-muted fw-semibold">Taste</div>
+			<div class="fs-5">
+				<span class="text-warning">{{taste}}</span>
+			</div>
+			</div>
+		</div>
+		</div>
+
+		<div class="small text">
+		Source: <a href="{{source_href}}" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover">{{source_text}}</a>
+		</div>
+	</div>
+	</div>
+</div>
+</section>
+
+<section class="ingredients-section">
+<div class="overview-div">
+	<div class="container my-4">
+	<div class="border rounded-3 p-3 shadow-sm bg-white">
+		<div class="row row-cols-1 row-cols-md-3 text-center time-grid">
+
+		<div class="col my-3 time-item">
+			<div class="small text-uppercase text-muted mb-1">Active Time</div>
+			<div class="d-flex justify-content-center align-items-center gap-2">
+			<i class="fa-regular fa-clock"></i><span>{{active_short}}</span>
+			</div>
+		</div>
+
+		<div class="col my-3 time-item">
+			<div class="small text-uppercase text-muted mb-1">Passive Time</div>
+			<div class="d-flex justify-content-center align-items-center gap-2">
+			<i class="fa-regular fa-clock"></i><span>{{passive_short}}</span>
+			</div>
+		</div>
+
+		<div class="col my-3 time-item">
+			<div class="small text-uppercase text-muted mb-1">Total Time</div>
+			<div class="d-flex justify-content-center align-items-center gap-2">
+			<i class="fa-regular fa-clock"></i><span>{{total_short}}</span>
+			</div>
+		</div>
+
+		</div>
+	</div>
+	</div>
+</div>
+
+<div class="ingredient-div">
+	<div class="container my-4">
+		<div class="row">
+			<div class="col-md-5">
+				<div class="border rounded-3 p-3 shadow-sm bg-white">
+					<h2 class="h4 mb-3 fw-bold">Ingredients</h2>
+					<ul class="list-group list-group-flush" id="ingredients">
+						{{ingredients}}
+					</ul>
+				</div>
+			</div>
+
+			<div class="col-md-7">
+				<div class="border rounded-3 p-3 shadow-sm bg-light h-100">
+					<h2 class="h4 mb-3 fw-bold">Instructions</h2>
+					<ol class="list-group list-group-numbered">
+						{{instructions}}
+					</ol>
+				</div>
+			</div>
+		</div>
+	</div>
+</div>
+</section>
+</main>
+
+<div id="site-footer"></div>
+<script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
+<script src="../../assets/constants.js"></script>
+<script src="../../assets/scripts.js"></script>
+</body>
+
+</html>"""
+
+PAGE = CompiledTemplate(PAGE_TEMPLATE)
+
+LI_START = '<li class="list-group-item d-flex align-items-center gap-2">'
+LI_END = "</li>\n\t\t\t\t"
+STEP_START = '<li class="list-group-item">'
+STEP_END = "</li>\n\t\t\t\t\t\t\t"
+BADGE_LINK = '<a href="../../recipeFilter.html#'
+BADGE_CLASS = '" class="link-light link-underline-opacity-0 link-underline-opacity-75-hover"><span class="badge text-'
+AMOUNT_START = '   <span class="amount" '
+UNIT_START = '<span class="unit" data-basis="'
+LINK_START = '   <a href="'
+LINK_CLASS = '" class="ingredient flex-fill">'
+NAME_START = '   <span class="ingredient flex-fill">'
+
+
+# --------------------- rendering ---------------------
+
+def render_categories(out: list, categories: list):
+    for c in categories:
+        label = html_escape(c)
+        out += (BADGE_LINK, label, BADGE_CLASS, get_category_badge(c), '">', label, "</span></a>")
+
+
+def render_ingredients(out: list, ingredients: list):
+    for ing in ingredients:
+        name = html_escape(ing.get("name", "")).strip()
+        link = str(ing.get("link", "")).strip()
+        amount = ing.get("amount", "")
+        has_amount = ("amount" in ing) and str(amount).strip() != ""
+
+        out.append(LI_START)
+        if has_amount:
+            amount_attr = f'data-basis="{html_escape(amount)}"' if amount != "" else ""
+            out += (AMOUNT_START, amount_attr, ">", html_escape(amount), "</span>")
+            unit = html_escape(ing.get("unit", ""))
+            if unit != "":
+                out += (UNIT_START, unit, '">', unit, "</span>")
+        if link:
+            out += (LINK_START, html_escape(link), LINK_CLASS, name, "</a>")
+        else:
+            out += (NAME_START, name, "</span>")
+        out.append(LI_END)
+
+
+def render_instructions(out: list, instructions: list):
+    for step in instructions:
+        step = html_escape(step)
+        if step:
+            out += (STEP_START, step, STEP_END)
+
+
+def render_page(data: dict, instructions: list[str]) -> str:
+    title = html_escape(data.get("title", "Recipe"))
+    active = to_int(data.get("activeTime", 0))
+    passive = to_int(data.get("passiveTime", 0))
+    total = to_int(data.get("totalTime", active + passive))
+    source_raw = str(data.get("source", "")).strip()
+    source_href = "#"
+    if source_raw.lower().startswith(("http://", "https://")):
+        source_href = html_escape(source_raw)
+
+    categories = []
+    render_categories(categories, data.get("categories", []))
+    ingredients = []
+    render_ingredients(ingredients, data.get("ingredients", []))
+    steps = []
+    render_instructions(steps, instructions)
+
+    return PAGE.render({
+        "title": title,
+        "image": html_escape(data.get("image", "") or "../../img/img_food/placeholder.jpg"),
+        "categories": "".join(categories),
+        "total_full": minutes_text_full(total),
+        "difficulty": ENGLISH_DIFF.get(str(data.get("difficulty", "easy")).lower(), "Easy"),
+        "originality": stars(clamp(data.get("originality", 5), 0, 5)),
+        "taste": stars(clamp(data.get("taste", 5), 0, 5)),
+        "source_href": source_href,
+        "source_text": html_escape(source_raw) if source_raw else "–",
+        "active_short": minutes_text_short(active),
+        "passive_short": minutes_text_short(passive),
+        "total_short": minutes_text_short(total),
+        "ingredients": "".join(ingredients),
+        "instructions": "".join(steps),
+    })
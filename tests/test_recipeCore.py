@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+
+from recipeCore import clamp, derive_rel_file, fraction, normalize_rel_path, parse_amount, to_int
+
+
+# --------------------- numbers ---------------------
+
+@pytest.mark.parametrize("val, expected", [
+    ("1/2", 0.5),
+    (" 3/4 ", 0.75),
+    ("2 1/2", 2.5),
+    ("10 3/4", 10.75),
+    ("½", 0.5),
+    ("¾", 0.75),
+    ("⅓", 1 / 3),
+    ("1,5", 1.5),
+    ("0.25", 0.25),
+    ("2", 2),
+    ("2,0", 2),
+    (3, 3),
+    (1.5, 1.5),
+])
+def test_parse_amount(val, expected):
+    assert parse_amount(val) == pytest.approx(expected)
+
+
+def test_parse_amount_whole_numbers_are_ints():
+    assert isinstance(parse_amount("2"), int)
+    assert isinstance(parse_amount("2,0"), int)
+
+
+@pytest.mark.parametrize("val", ["etwas", "1 Prise", "a/b", "x 1/2", "1/2/3 4", "1-2"])
+def test_parse_amount_keeps_unparseable_text(val):
+    assert parse_amount(val) == val
+
+
+@pytest.mark.parametrize("val", ["", "   "])
+def test_parse_amount_empty(val):
+    assert parse_amount(val) == ""
+
+
+def test_fraction():
+    assert fraction("1/2") == 0.5
+    assert fraction(" 3 / 8 ") == 0.375
+    # no division by zero: a zero denominator counts as 1
+    assert fraction("3/0") == 3
+    assert fraction("a/2") is None
+    assert fraction("1/b") is None
+    assert fraction("1.5/2") is None
+
+
+@pytest.mark.parametrize("val, expected", [
+    ("5", 5),
+    (" 7 ", 7),
+    (4, 4),
+    ("-2", -2),
+    ("", 0),
+    (None, 0),
+    ("abc", 0),
+    ("1.5", 0),
+])
+def test_to_int(val, expected):
+    assert to_int(val) == expected
+
+
+def test_to_int_default():
+    assert to_int("abc", default=None) is None
+    assert to_int("", default=3) == 3
+
+
+@pytest.mark.parametrize("val, expected", [
+    (3, 3),
+    ("4", 4),
+    (-1, 0),
+    (9, 5),
+    ("abc", 0),
+    (None, 0),
+])
+def test_clamp(val, expected):
+    assert clamp(val) == expected
+
+
+def test_clamp_bounds():
+    assert clamp(0, lo=1, hi=10) == 1
+    assert clamp(11, lo=1, hi=10) == 10
+    assert clamp("x", lo=1, hi=10) == 1
+
+
+# --------------------- paths ---------------------
+
+@pytest.mark.parametrize("path, expected", [
+    ("recipes/soups/Borscht.html", "recipes/soups/Borscht.html"),
+    ("recipes\\soups\\Borscht.html", "recipes/soups/Borscht.html"),
+    ("./recipes/soups/Borscht.html", "recipes/soups/Borscht.html"),
+    (".\\recipes\\soups\\Borscht.html", "recipes/soups/Borscht.html"),
+    ("/recipes/soups/Borscht.html", "recipes/soups/Borscht.html"),
+    ("", ""),
+])
+def test_normalize_rel_path(path, expected):
+    assert normalize_rel_path(path) == expected
+
+
+def test_derive_rel_file_inside_project(tmp_path):
+    page = tmp_path / "recipes" / "soups" / "Borscht.html"
+    assert derive_rel_file(tmp_path, page) == "recipes/soups/Borscht.html"
+
+
+def test_derive_rel_file_relative_parts(tmp_path):
+    page = tmp_path / "recipes" / "soups" / ".." / "drinks" / "Lassi.html"
+    assert derive_rel_file(tmp_path, page) == "recipes/drinks/Lassi.html"
+
+
+def test_derive_rel_file_outside_project(tmp_path):
+    # falls back to the part from "recipes" on, or the bare file name
+    other = tmp_path / "elsewhere" / "recipes" / "fish" / "Trout.html"
+    assert derive_rel_file(tmp_path / "site", other) == "recipes/fish/Trout.html"
+    assert derive_rel_file(tmp_path / "site", Path(tmp_path / "Loose.html")) == "Loose.html"
@@ -0,0 +1,67 @@
+import pytest
+
+from recipeIngredients import canonical_ingredient, ingredient_matches, ingredient_words, word_forms
+from recipeQuery import RecipeQueryIndex
+
+
+def matches(term: str, name: str) -> bool:
+    return ingredient_matches(ingredient_words(term), ingredient_words(name))
+
+
+# --------------------- names ---------------------
+
+def test_ingredient_words():
+    assert ingredient_words("Tomatoes (peeled)") == ["tomatoes"]
+    assert ingredient_words("oil for frying") == ["oil"]
+    assert ingredient_words("Crème fraîche") == ["creme", "fraiche"]
+
+
+def test_canonical_ingredient():
+    assert canonical_ingredient("Tomatoes (peeled)") == canonical_ingredient("tomato") == "tomato"
+    assert canonical_ingredient("pandan leaves") == "pandan leaf"
+
+
+def test_word_forms():
+    assert word_forms("cookies") == {"cookies", "cooky", "cookie"}
+    assert word_forms("pies") == {"pies", "py", "pie"}
+    assert word_forms("tomatoes") == {"tomatoes", "tomato"}
+
+
+# --------------------- matching ---------------------
+
+@pytest.mark.parametrize("term, name", [
+    ("cookie", "butter cookies"),
+    ("cookies", "butter cookies"),
+    ("butter cook", "butter cookies"),
+    ("pie", "pies"),
+    ("pies", "apple pie"),
+    ("chili", "chilies"),
+    ("chili", "chili flakes"),
+    ("berries", "berry jam"),
+    ("tomato", "Tomatoes (peeled)"),
+    ("tomatoes", "tomato"),
+])
+def test_ingredient_matches(term, name):
+    assert matches(term, name)
+
+
+@pytest.mark.parametrize("term, name", [
+    ("cookie", "butter"),
+    ("py", "apple"),
+    ("chili oil", "chilies"),
+])
+def test_ingredient_does_not_match(term, name):
+    assert not matches(term, name)
+
+
+def test_query_index_uses_the_same_rule():
+    entries = [
+        {"title": "Matcha Cheesecake", "ingredients": [{"name": "butter cookies"}]},
+        {"title": "Pie", "ingredients": [{"name": "pies"}]},
+        {"title": "Stew", "ingredients": [{"name": "chilies"}, {"name": "Tomatoes (peeled)"}]},
+    ]
+    index = RecipeQueryIndex(entries)
+    assert index.match({"ingredients": ["cookie"]}) == [0]
+    assert index.match({"ingredients": ["pie"]}) == [1]
+    assert index.match({"ingredients": ["chili", "tomato"]}) == [2]
+    assert index.match({"ingredients": ["cookies", "pie"]}) == []
@@ -0,0 +1,47 @@
+import tkinter as tk
+from tkinter import ttk
+
+from recipeIngredients import ingredient_matches, ingredient_words
+
+
+def run_standalone(tool_cls):
+    """Runs a tool window as its own program (python addRecipes.py).
+
+    The tools are Toplevel windows so main.py can open them inside its own
+    process; started directly they get a hidden root that ends with them.
+    """
+    root = tk.Tk()
+    root.withdraw()
+    app = tool_cls(root)
+    app.bind("<Destroy>", lambda e: root.quit() if e.widget is app else None, add="+")
+    root.mainloop()
+    root.destroy()
+
+
+def close_own_store(window, shared):
+    """Closes window.store when the window goes, unless it is the launcher's shared one.
+
+    The tools keep the store they opened (started directly, or after
+    recipes.sqlite appeared or went) in window.store.
+    """
+    def on_destroy(event):
+        if event.widget is window and window.store is not None and window.store is not shared:
+            window.store.close()
+
+    window.bind("<Destroy>", on_destroy, add="+")
+
+
+def suggestion_box(parent, suggestions: list[str], width: int) -> ttk.Combobox:
+    """An entry whose drop-down offers the suggestions matching what was typed
+    (same rule as the ingredient filter of the website)."""
+    box = ttk.Combobox(parent, width=width, values=suggestions)
+    keys = [ingredient_words(s) for s in suggestions]
+
+    def narrow(event):
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        typed = ingredient_words(box.get())
+        box["values"] = [s for s, k in zip(suggestions, keys) if ingredient_matches(typed, k)] if typed else suggestions
+
+    box.bind("<KeyRelease>", narrow)
+    return box